@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import timeit
+
+from c3 import crc
+
+
+def crc16_per_byte(data: bytes) -> int:
+    """The original CRC-16 calculation, running the divisor loop for every byte."""
+    builder = crc.Crc16Builder()
+    for byte in data:
+        builder.add_byte(byte)
+    return builder.crc
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--size", type=int, default=4096, help="Size of the buffer in bytes"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=200, help="Number of CRC calculations"
+    )
+    args = parser.parse_args()
+
+    data = os.urandom(args.size)
+    assert crc16_per_byte(data) == crc.crc16_buffer(data)
+
+    candidates = {
+        "Crc16Builder.add_byte": lambda: crc16_per_byte(data),
+        "crc16_buffer (bytes)": lambda: crc.crc16_buffer(data),
+        "crc16_buffer (memoryview)": lambda: crc.crc16_buffer(memoryview(data)),
+        "Crc16.update (4 chunks)": lambda: crc.Crc16()
+        .update(data[: args.size // 4])
+        .update(data[args.size // 4 : args.size // 2])
+        .update(data[args.size // 2 :])
+        .crc,
+    }
+
+    print(f"CRC-16 over {args.size} bytes, {args.repeat} repetitions")
+    baseline = None
+    for name, func in candidates.items():
+        duration = timeit.timeit(func, number=args.repeat)
+        baseline = baseline or duration
+        throughput = args.size * args.repeat / duration / (1024 * 1024)
+        print(
+            "%-28s %8.3f s %10.2f MiB/s %6.1fx"
+            % (name, duration, throughput, baseline / duration)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import time
+
+from c3 import consts, crc, framing, utils
+
+
+def construct_message_bytewise(session_id, request_nr, command, data=None) -> bytearray:
+    """The previous frame builder, which appends the frame byte by byte."""
+    message_length = len(data or []) + (4 if (session_id and request_nr) else 0)
+    message = bytearray(
+        [
+            consts.C3_PROTOCOL_VERSION,
+            command or 0x00,
+            utils.lsb(message_length),
+            utils.msb(message_length),
+        ]
+    )
+    if session_id:
+        message.append(utils.lsb(session_id))
+        message.append(utils.msb(session_id))
+        message.append(utils.lsb(request_nr))
+        message.append(utils.msb(request_nr))
+
+    if data:
+        for byte in data:
+            if isinstance(byte, int):
+                message.append(byte)
+            elif isinstance(byte, str):
+                message.append(ord(byte))
+            else:
+                raise TypeError(
+                    "Data does not contain int or str: %s is %s"
+                    % (str(byte), type(byte))
+                )
+
+    checksum = crc.crc16(message)
+    message.append(utils.lsb(checksum))
+    message.append(utils.msb(checksum))
+
+    message.insert(0, consts.C3_MESSAGE_START)
+    message.append(consts.C3_MESSAGE_END)
+    return message
+
+
+def bench(encode, count: int, command: int, data) -> float:
+    start = time.perf_counter()
+    for request_nr in range(1, count + 1):
+        encode(0x8A9C, request_nr, command, data)
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--frames", type=int, default=50000, help="Number of frames per measurement"
+    )
+    args = parser.parse_args()
+
+    encoder = framing.FrameEncoder()
+    cases = [
+        ("RT log poll", consts.Command.RTLOG_BINARY, None),
+        ("GETPARAM", consts.Command.GETPARAM, "~SerialNumber,LockCount,FirmVer"),
+        ("control", consts.Command.CONTROL, bytes.fromhex("0101010300")),
+        ("1 KiB data", consts.Command.GETDATA, os.urandom(1024)),
+    ]
+    for name, command, data in cases:
+        assert encoder.encode(0x8A9C, 1, command, data) == construct_message_bytewise(
+            0x8A9C, 1, command, data
+        )
+        results = [
+            bench(construct_message_bytewise, args.frames, command, data),
+            bench(framing.encode_frame, args.frames, command, data),
+            bench(encoder.encode, args.frames, command, data),
+        ]
+        print(
+            "%-12s bytewise %9.0f frames/s, encode_frame %9.0f frames/s, FrameEncoder %9.0f frames/s (%.1fx)"
+            % (name, *results, results[2] / results[0])
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import timeit
+
+from c3 import consts, rtlog
+
+
+def build_rtlog_data(record_count: int, unknown_ratio: float) -> bytes:
+    """Event records, of which a part has an unknown verification mode, event type and in/out state."""
+    known_events = [event for event in consts.EventType if 0 <= event < 255]
+    records = bytearray()
+    for i in range(record_count):
+        record = bytearray(os.urandom(16))
+        if (i % 100) < unknown_ratio * 100:
+            record[8:12] = bytes([150, 1, 250, 9])
+        else:
+            record[8:12] = bytes([4, 1, known_events[i % len(known_events)], 0])
+        record[12:16] = (0x21ADADA5 + i).to_bytes(4, "little")
+        records += record
+    return bytes(records)
+
+
+def decode_enum_constructor(data: bytes) -> list:
+    """The previous decoding, which constructs the enums and catches the error of unknown values."""
+    decoded = []
+    for offset in range(0, len(data), rtlog.RTLOG_RECORD_SIZE):
+        try:
+            verified = consts.VerificationMode(data[offset + 8])
+        except ValueError:
+            verified = consts.VerificationMode.OTHER
+        try:
+            event_type = consts.EventType(data[offset + 10])
+        except ValueError:
+            event_type = consts.EventType.UNKNOWN_UNSUPPORTED
+        try:
+            in_out_state = consts.InOutDirection(data[offset + 11])
+        except ValueError:
+            in_out_state = consts.InOutDirection.UNKNOWN_UNSUPPORTED
+        decoded.append((verified, event_type, in_out_state))
+    return decoded
+
+
+def decode_lookup_table(data: bytes) -> list:
+    return [
+        (
+            consts.VerificationModeTable[data[offset + 8]],
+            consts.EventTypeTable[data[offset + 10]],
+            consts.InOutDirectionTable[data[offset + 11]],
+        )
+        for offset in range(0, len(data), rtlog.RTLOG_RECORD_SIZE)
+    ]
+
+
+def decode_records(data: bytes) -> list:
+    return [
+        (record.verified, record.event_type, record.in_out_state)
+        for record in rtlog.decode_batch(data).records()
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--records", type=int, default=10000, help="Number of RT log records"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Number of repetitions")
+    args = parser.parse_args()
+
+    for unknown_ratio in (0.0, 0.1, 0.5):
+        data = build_rtlog_data(args.records, unknown_ratio)
+        assert decode_enum_constructor(data) == decode_lookup_table(data)
+        assert decode_lookup_table(data) == decode_records(data)
+
+        print(f"{args.records} records, {unknown_ratio:.0%} unknown codes")
+        baseline = None
+        for name, func in (
+            ("enum constructor", decode_enum_constructor),
+            ("lookup table", decode_lookup_table),
+            ("records()", decode_records),
+        ):
+            duration = timeit.timeit(lambda: func(data), number=args.repeat)
+            duration /= args.repeat
+            baseline = baseline or duration
+            print(
+                "  %-18s %8.4f s %12.0f records/s %8.1fx"
+                % (name, duration, args.records / duration, baseline / duration)
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+import time
+
+from c3 import C3
+from c3.fleet import C3Fleet
+from c3.simulator import PanelSimulator
+
+
+async def bench_fleet(simulators: list[PanelSimulator], duration: float) -> int:
+    fleet = C3Fleet([simulator.device_info for simulator in simulators])
+    fleet.poll_interval = 0.1
+    records = 0
+
+    async def count():
+        nonlocal records
+        async for _ in fleet.records():
+            records += 1
+
+    async with fleet:
+        try:
+            await asyncio.wait_for(count(), duration)
+        except asyncio.TimeoutError:
+            pass
+    return records
+
+
+def bench_get_device_data(simulator: PanelSimulator, repeat: int) -> tuple[int, float]:
+    panel = C3(simulator.device_info)
+    panel.connect()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        records = len(panel.get_device_data("transaction"))
+    duration = time.perf_counter() - start
+    panel.disconnect()
+    return records * repeat, duration
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--panels", type=int, default=100, help="Number of simulated panels"
+    )
+    parser.add_argument(
+        "--event-rate", type=float, default=10, help="Events per second per panel"
+    )
+    parser.add_argument(
+        "--duration", type=float, default=5, help="Duration of the fleet poll in s"
+    )
+    parser.add_argument(
+        "--transactions",
+        type=int,
+        default=2000,
+        help="Number of records in the transaction table",
+    )
+    args = parser.parse_args()
+
+    simulators = PanelSimulator.start_many(
+        args.panels,
+        event_rate=args.event_rate,
+        table_sizes={"transaction": args.transactions},
+    )
+    try:
+        records = asyncio.run(bench_fleet(simulators, args.duration))
+        print(
+            "fleet of %d panels: %d records in %.1fs, %.0f records/s (%.0f generated/s)"
+            % (
+                args.panels,
+                records,
+                args.duration,
+                records / args.duration,
+                args.panels * args.event_rate,
+            )
+        )
+
+        records, duration = bench_get_device_data(simulators[0], 10)
+        print(
+            "get_device_data: %.0f records/s %.1f ms per table"
+            % (records / duration, duration * 100)
+        )
+    finally:
+        for simulator in simulators:
+            simulator.stop()
+
+
+if __name__ == "__main__":
+    main()
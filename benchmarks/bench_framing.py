@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import socket
+import threading
+import time
+
+from c3 import consts, framing
+from c3.core import C3
+
+
+def build_stream(frame_count: int, data_size: int) -> bytes:
+    frame = C3._construct_message(
+        0x1234, 1, consts.C3_REPLY_OK, bytearray(os.urandom(data_size))
+    )
+    return bytes(frame) * frame_count
+
+
+def bench_feed(stream: bytes, fragment_size: int) -> tuple[int, float]:
+    decoder = framing.FrameDecoder()
+    view = memoryview(stream)
+    frames = 0
+    start = time.perf_counter()
+    for offset in range(0, len(stream), fragment_size):
+        frames += len(decoder.feed(view[offset : offset + fragment_size]))
+    return frames, time.perf_counter() - start
+
+
+def bench_recv_into(stream: bytes, fragment_size: int) -> tuple[int, float]:
+    """Receive the stream over a socket pair, sending it in fragments of the given size."""
+    reader, writer = socket.socketpair()
+
+    def send():
+        view = memoryview(stream)
+        for offset in range(0, len(stream), fragment_size):
+            writer.sendall(view[offset : offset + fragment_size])
+        writer.close()
+
+    sender = threading.Thread(target=send)
+    decoder = framing.FrameDecoder()
+    frames = 0
+    start = time.perf_counter()
+    sender.start()
+    while True:
+        bytes_needed = decoder.bytes_needed()
+        bytes_received = reader.recv_into(
+            decoder.write_buffer(bytes_needed), bytes_needed
+        )
+        if bytes_received == 0:
+            break
+        decoder.commit(bytes_received)
+        if decoder.next_frame():
+            frames += 1
+    duration = time.perf_counter() - start
+    sender.join()
+    reader.close()
+    return frames, duration
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--frames", type=int, default=2000, help="Number of frames in the stream"
+    )
+    parser.add_argument(
+        "--data-size", type=int, default=1024, help="Data size per frame in bytes"
+    )
+    args = parser.parse_args()
+
+    stream = build_stream(args.frames, args.data_size)
+    print(f"Decoding {args.frames} frames of {args.data_size} bytes")
+    for name, bench in (("feed", bench_feed), ("recv_into", bench_recv_into)):
+        for fragment_size in (1, 16, 536, 1460, 64 * 1024):
+            if name == "feed" or fragment_size > 1:
+                frames, duration = bench(stream, fragment_size)
+                assert frames == args.frames
+                print(
+                    "%-10s fragment %6d B: %10.0f frames/s %8.2f MiB/s"
+                    % (
+                        name,
+                        fragment_size,
+                        frames / duration,
+                        len(stream) / duration / (1024 * 1024),
+                    )
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+import argparse
+import re
+import time
+
+from c3 import kv
+
+# Replies captured from panels, see the tests
+CASES = [
+    (
+        "GETPARAM",
+        bytes.fromhex(
+            "7e53657269616c4e756d6265723d414359543033323335333632372c4c6f636b"
+            "436f756e743d342c417578496e436f756e743d342c4175784f7574436f756e743d34"
+        ),
+    ),
+    (
+        "RT log (kv)",
+        bytes.fromhex(
+            "74696d653d323032332d31322d30362032323a33333a31350970696e3d300963617264"
+            "6e6f3d30096576656e74616464723d30096576656e743d32303609696e6f7574737461"
+            "7475733d3209766572696679747970653d32303009696e6465783d380d0a74696d653d"
+            "323032332d31322d30362032323a35373a35340970696e3d3009636172646e6f3d3009"
+            "6576656e74616464723d31096576656e743d3809696e6f75747374617475733d320976"
+            "6572696679747970653d32303009696e6465783d39"
+        ),
+    ),
+    (
+        "data table cfg",
+        b"user=1,UID=i1,CardNo=i2,Pin=i3,Password=s4,Group=i5,StartTime=i6,EndTime=i7,"
+        b"Name=s8,SuperAuthorize=i9\nuserauthorize=2,Pin=i1,AuthorizeTimezoneId=i2,"
+        b"AuthorizeDoorId=i3\nholiday=3,Holiday=i1,HolidayType=i2,Loop=i3\n"
+        b"transaction=5,Cardno=i1,Pin=i2,Verified=i3,DoorID=i4,EventType=i5,"
+        b"InOutState=i6,Time_second=i7\nfirstcard=6,Pin=i1,DoorID=i2,TimezoneID=i3\n"
+        b"inoutfun=8,Index=i1,EventType=i2,InAddr=i3,OutType=i4,OutAddr=i5,OutTime=i6,"
+        b"Reserved=i7\nlosscard=11,CardNo=i1,Reserved=i2\nusertype=12,Pin=i1,Type=i2\n",
+    ),
+]
+
+
+def parse_kv_str(message: bytes) -> dict:
+    """The previous parser, which decodes the message and compiles the pattern on every call."""
+    kv_pairs = {}
+
+    message_str = str(message, encoding="ascii", errors="ignore")
+    pattern = re.compile(r"([\w~]+)=([^,\t]+)")
+    for param_name, param_value in re.findall(pattern, message_str):
+        kv_pairs[param_name] = param_value
+
+    return kv_pairs
+
+
+def parse_kv_records_str(message: bytes) -> list:
+    records = []
+    for message_line in bytes(message).split(b"\x0a"):
+        data_items = parse_kv_str(message_line)
+        if data_items:
+            records.append(data_items)
+    return records
+
+
+def bench(parse, count: int, message) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        parse(message)
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--messages", type=int, default=50000, help="Number of messages per measurement"
+    )
+    args = parser.parse_args()
+
+    for name, message in CASES:
+        results = [
+            bench(parse_kv_records_str, args.messages, message),
+            bench(kv.parse_kv_records, args.messages, message),
+        ]
+        print(
+            "%-15s previous %9.0f messages/s, kv %9.0f messages/s (%.1fx)"
+            % (name, *results, results[1] / results[0])
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+import argparse
+import time
+
+from c3 import C3
+from c3.simulator import PanelSimulator
+
+
+def bench_lock_step(panel: C3, requests: int) -> float:
+    start = time.perf_counter()
+    for i in range(requests):
+        panel.get_device_param([f"Door{i % 4 + 1}Drivertime"])
+    return time.perf_counter() - start
+
+
+def bench_pipeline(panel: C3, requests: int, max_in_flight: int) -> float:
+    start = time.perf_counter()
+    with panel.pipeline(max_in_flight) as pipeline:
+        futures = [
+            pipeline.get_device_param([f"Door{i % 4 + 1}Drivertime"])
+            for i in range(requests)
+        ]
+    assert all(future.result() for future in futures)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--latency", type=float, default=0.1, help="Simulated round trip time in s"
+    )
+    parser.add_argument("--requests", type=int, default=40, help="Number of requests")
+    args = parser.parse_args()
+
+    with PanelSimulator(latency=args.latency) as simulator:
+        panel = C3(simulator.device_info)
+        panel.connect()
+        duration = bench_lock_step(panel, args.requests)
+        print("%-16s %6.2f s" % ("lock-step", duration))
+        for max_in_flight in (2, 4, 8, 16):
+            duration = bench_pipeline(panel, args.requests, max_in_flight)
+            print("%-16s %6.2f s" % (f"{max_in_flight} in flight", duration))
+        panel.disconnect()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import timeit
+
+from c3 import rtlog
+
+
+def build_rtlog_data(record_count: int) -> bytes:
+    records = bytearray()
+    for i in range(record_count):
+        record = bytearray(os.urandom(16))
+        # Mix of event records and door/alarm status records, with a valid time value
+        record[8] = 4
+        record[10] = 255 if i % 10 == 0 else i % 50
+        record[11] = 0
+        record[12:16] = (0x21ADADA5 + i).to_bytes(4, "little")
+        records += record
+    return bytes(records)
+
+
+def decode_per_record(data: bytes) -> list:
+    return [rtlog.factory(data[i : i + 16]) for i in range(0, len(data), 16)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--records", type=int, default=10000, help="Number of RT log records"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Number of repetitions")
+    args = parser.parse_args()
+
+    data = build_rtlog_data(args.records)
+
+    candidates = {
+        "factory per record": lambda: decode_per_record(data),
+        "decode_batch": lambda: rtlog.decode_batch(data),
+        "decode_batch + times()": lambda: rtlog.decode_batch(data).times(),
+        "decode_batch + records()": lambda: rtlog.decode_batch(data).records(),
+    }
+    if rtlog.numpy is not None:
+        candidates["decode_batch (numpy)"] = lambda: rtlog.decode_batch(
+            data, use_numpy=True
+        )
+
+    print(f"Decoding {args.records} RT log records, {args.repeat} repetitions")
+    baseline = None
+    for name, func in candidates.items():
+        duration = timeit.timeit(func, number=args.repeat) / args.repeat
+        baseline = baseline or duration
+        print(
+            "%-26s %8.4f s %12.0f records/s %8.1fx"
+            % (name, duration, args.records / duration, baseline / duration)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,22 @@
 """ZKAccess C3 library"""
 from . import controldevice, rtlog
+from .aio import AsyncC3
 from .core import C3
+from .fleet import C3Fleet
+from .polling import PollSchedule, RTLogPoller
+from .pool import C3Pool
+from .sync import TransactionSync
 
 VERSION = (0, 0, 1)
 
-__all__ = ["C3", "controldevice", "rtlog"]
+__all__ = [
+    "AsyncC3",
+    "C3",
+    "C3Fleet",
+    "C3Pool",
+    "PollSchedule",
+    "RTLogPoller",
+    "TransactionSync",
+    "controldevice",
+    "rtlog",
+]
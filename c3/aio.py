@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Optional
+
+from c3 import consts, controldevice, framing, rtlog
+from c3.core import (
+    C3,
+    C3DeviceInfo,
+    C3PanelStatus,
+    ConnectionClosed,
+    ReceiveTimeout,
+    ReplyError,
+)
+
+
+class AsyncC3:
+    """C3 panel client for asyncio, using asyncio streams instead of blocking sockets.
+
+    The messages are constructed and decoded with the same code as the blocking C3 client.
+    A single event loop can drive many AsyncC3 instances concurrently.
+    Requests on one instance are serialized, since the panel handles one request at a time.
+    """
+
+    log = logging.getLogger("C3")
+    receive_timeout = 1
+    receive_retries = 3
+
+    def __init__(
+        self, host: [str | C3DeviceInfo], port: int = consts.C3_PORT_DEFAULT
+    ) -> None:
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._decoder = framing.FrameDecoder()
+        # The lock is created on connect, to bind it to the running event loop
+        self._lock: Optional[asyncio.Lock] = None
+        self._connected: bool = False
+        self._session_less = False
+        self._initialized = False
+        self._protocol_version = None
+        self._rtlog_command = consts.Command.RTLOG_BINARY
+        self._session_id: int = 0xFEFE
+        self._request_nr: int = -258
+        self._status: C3PanelStatus = C3PanelStatus()
+        if isinstance(host, C3DeviceInfo):
+            self._device_info: C3DeviceInfo = host
+        elif isinstance(host, str):
+            self._device_info: C3DeviceInfo = C3DeviceInfo(
+                host=host, port=port or consts.C3_PORT_DEFAULT
+            )
+
+    async def _send(self, command: consts.Command, data=None):
+        message = C3._construct_message(
+            self._session_id, self._request_nr, command, data
+        )
+
+        if self.log.isEnabledFor(logging.DEBUG):
+            self.log.debug("Sending: %s", message.hex())
+
+        self._writer.write(message)
+        await self._writer.drain()
+        self._request_nr = self._request_nr + 1
+
+    async def _receive(self) -> tuple[bytes, int, int]:
+        decoder = self._decoder
+        decoder.reset()
+        frame = None
+        timeouts = 0
+        closed = False
+        while frame is None and timeouts < self.receive_retries:
+            try:
+                data = await asyncio.wait_for(
+                    self._reader.read(decoder.bytes_needed()), self.receive_timeout
+                )
+            except asyncio.TimeoutError:
+                timeouts += 1
+                continue
+
+            if not data:
+                # The connection was closed by the panel
+                closed = True
+                break
+            frames = decoder.feed(data)
+            frame = frames[0] if frames else None
+
+        if frame is None:
+            if closed and decoder.buffered == 0:
+                raise ConnectionClosed("The connection was closed by the panel")
+            if closed:
+                raise ConnectionError(
+                    f"The connection was closed by the panel, {decoder.bytes_needed()} bytes missing"
+                )
+            if decoder.buffered == 0:
+                raise ReceiveTimeout("No reply received within the receive timeout")
+            if decoder.buffered < framing.C3_HEADER_SIZE:
+                raise ConnectionError(
+                    f"Invalid response header received; expected {framing.C3_HEADER_SIZE} bytes, "
+                    f"received {decoder.buffered}"
+                )
+            raise ValueError(
+                f"Incomplete message received, {decoder.bytes_needed()} bytes missing"
+            )
+
+        # Copy the payload, the decoder buffer is reused by the next request
+        message = bytes(frame.payload)
+        if self.log.isEnabledFor(logging.DEBUG):
+            self.log.debug(
+                "Received command %02x (data size %d): %s",
+                frame.command,
+                len(message),
+                message.hex(),
+            )
+
+        if frame.command == consts.C3_REPLY_ERROR:
+            raise C3._reply_error(message)
+
+        return message, len(message), frame.version
+
+    async def _send_receive(
+        self, command: consts.Command, data=None
+    ) -> tuple[bytes, int]:
+        session_offset = 0
+
+        async with self._lock:
+            try:
+                await self._send(command, data)
+                receive_data, bytes_received, _ = await self._receive()
+            except ReplyError:
+                # The panel answered, the connection is fine
+                raise
+            except ConnectionError:
+                # No reply, or the connection was closed or reset by the panel
+                self._connection_lost()
+                raise
+            except OSError as ex:
+                self._connection_lost()
+                raise ConnectionError(f"Unexpected connection end: {ex}") from ex
+
+        if not self._session_less and bytes_received > 2:
+            session_offset = 4
+            session_id = (receive_data[1] << 8) + receive_data[0]
+            if self._session_id != session_id:
+                raise ValueError("Data received with invalid session ID")
+
+        return receive_data[session_offset:], bytes_received - session_offset
+
+    async def _initialize(self):
+        if not self._initialized:
+            try:
+                params = await self.get_device_param(C3._initialize_parameters)
+                C3._apply_initialize_parameters(self._device_info, self._status, params)
+                self._initialized = True
+            except ConnectionError as ex:
+                self.log.error(
+                    "Connection to %s failed: %s", self._device_info.host, ex
+                )
+            except ValueError as ex:
+                self.log.error(
+                    "Retrieving configuration parameters from %s failed: %s",
+                    self._device_info.host,
+                    ex,
+                )
+
+    def _connection_lost(self):
+        self.log.info("Connection to %s lost", self._device_info.host)
+        if self._writer is not None:
+            self._writer.close()
+            self._reader = self._writer = None
+        self._connected = False
+
+    def is_connected(self) -> bool:
+        return self._writer is not None and self._connected
+
+    def __repr__(self):
+        return C3.__repr__(self)
+
+    host = C3.host
+    port = C3.port
+    mac = C3.mac
+    serial_number = C3.serial_number
+    device_name = C3.device_name
+    firmware_version = C3.firmware_version
+    nr_of_locks = C3.nr_of_locks
+    nr_aux_in = C3.nr_aux_in
+    nr_aux_out = C3.nr_aux_out
+
+    async def _handshake(self, command: consts.Command, data) -> bool:
+        try:
+            async with self._lock:
+                await self._send(command, data)
+                receive_data, bytes_received, protocol_version = await self._receive()
+            if command == consts.Command.CONNECT_SESSION:
+                if bytes_received > 2:
+                    self._session_id = (receive_data[1] << 8) + receive_data[0]
+                    self.log.debug("Connected with Session ID %04x", self._session_id)
+                    self._session_less = False
+                    self._connected = True
+            else:
+                self.log.debug("Connected without session")
+                self._session_less = True
+                self._connected = True
+            self._protocol_version = protocol_version
+        except ConnectionError as ex:
+            self.log.debug(
+                "Connection attempt to %s failed: %s", self._device_info.host, ex
+            )
+        except ValueError as ex:
+            self.log.error("Reply from %s failed: %s", self._device_info.host, ex)
+
+        return self._connected
+
+    async def connect(self, password: Optional[str] = None) -> bool:
+        """Connect to the C3 panel on the host/port provided in the constructor."""
+        self._connected = False
+        self._session_id = 0xFEFE
+        self._request_nr = -258
+        self._lock = asyncio.Lock()
+
+        data = None
+        if password:
+            data = bytearray(password.encode("ascii"))
+
+        try:
+            self._reader, self._writer = await asyncio.wait_for(
+                asyncio.open_connection(self._device_info.host, self._device_info.port),
+                self.receive_timeout * self.receive_retries,
+            )
+        except (OSError, asyncio.TimeoutError) as ex:
+            self.log.error("Error while opening connection: %s", str(ex))
+            self._reader = self._writer = None
+
+        if self._writer is not None:
+            # Attempt to connect to panel with session initiation command,
+            # alternatively attempt to connect to panel without session initiation
+            if not await self._handshake(consts.Command.CONNECT_SESSION, data):
+                self._session_id = None
+                await self._handshake(consts.Command.CONNECT_SESSION_LESS, data)
+
+        if self._connected:
+            await self._initialize()
+
+        return self._connected
+
+    async def disconnect(self):
+        """Disconnect from C3 panel and end session."""
+        if self.is_connected():
+            try:
+                await self._send_receive(consts.Command.DISCONNECT)
+            except (ConnectionError, ValueError):
+                # Disconnecting a broken connection should not create more trouble,
+                # ignoring a ConnectionError for that reason.
+                pass
+
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except OSError as ex:
+                self.log.error("Error while closing connection: %s", str(ex))
+            self._reader = self._writer = None
+
+        self._connected = False
+        self._session_id = None
+        self._request_nr = -258
+
+    async def get_device_param(self, request_parameters: list[str]) -> dict:
+        """Retrieve the requested device parameter values."""
+        if self.is_connected():
+            message, _ = await self._send_receive(
+                consts.Command.GETPARAM, ",".join(request_parameters)
+            )
+            parameter_values = C3._parse_kv_from_message(message)
+        else:
+            raise ConnectionError("No connection to C3 panel.")
+
+        return parameter_values
+
+    async def get_device_data(
+        self,
+        table_name: str,
+        field_names: Optional[list[str]] = None,
+        columnar: bool = False,
+    ) -> list[dict] | dict[str, list]:
+        """Retrieve all records from a device data table."""
+        if self.is_connected():
+            message, _ = await self._send_receive(consts.Command.DATATABLE_CFG)
+            data_cfg = C3._parse_device_data_cfg(message)
+            cfg, parameters = C3._get_device_data_request(
+                data_cfg, table_name, field_names
+            )
+            message, _ = await self._send_receive(consts.Command.GETDATA, parameters)
+        else:
+            raise ConnectionError("No connection to C3 panel.")
+
+        return C3._parse_device_data(cfg, message, columnar, field_names)
+
+    async def get_rt_log(
+        self,
+    ) -> list[rtlog.EventRecord | rtlog.DoorAlarmStatusRecord]:
+        """Retrieve the latest event or alarm records."""
+        if self.is_connected():
+            message, message_length = await self._send_receive(self._rtlog_command)
+            records = C3._parse_rt_log(self._rtlog_command, message, message_length)
+            if records is None:
+                self.log.debug("Transition RT log mode to key/value")
+                self._rtlog_command = consts.Command.RTLOG_KEYVALUE
+                records = []
+        else:
+            raise ConnectionError("No connection to C3 panel.")
+
+        return records
+
+    async def control_device(self, command: controldevice.ControlDeviceBase):
+        """Send a control command to the panel."""
+        if self.is_connected():
+            await self._send_receive(consts.Command.CONTROL, command.to_bytes())
+        else:
+            raise ConnectionError("No connection to C3 panel.")
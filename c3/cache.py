@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+
+def write_json_atomic(path: str, data: Any):
+    """Write data as JSON file, raises OSError when writing fails.
+    The data is written to a temporary file first, which replaces the file when complete,
+    so a failed or interrupted write does not leave a corrupt file behind. Every write uses
+    its own temporary file, concurrent writes of the same file do not interfere.
+    """
+    text = json.dumps(data)
+    fd, temp_path = tempfile.mkstemp(
+        prefix=os.path.basename(path) + ".",
+        suffix=".tmp",
+        dir=os.path.dirname(path) or ".",
+    )
+    try:
+        with open(fd, "w", encoding="utf-8") as json_file:
+            json_file.write(text)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+@dataclass
+class CacheStats:
+    """Hit and miss counters of a cache"""
+
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class PanelCache:
+    """Cache for panel configuration that rarely changes, like the data table configuration.
+
+    Entries are stored per panel, keyed by serial number and firmware version, and per section.
+    An entry expires after ttl seconds (when set). When a path is given, the cache is persisted
+    as JSON file, so the configuration survives a restart of the application.
+    The cache can be shared by multiple panels.
+    """
+
+    log = logging.getLogger("C3")
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[float] = None):
+        self._path = path
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        # Serializes the saves, so an older snapshot does not replace a newer one
+        self._save_lock = threading.Lock()
+        self._entries: dict[str, dict[str, dict]] = {}
+        if path:
+            self.load()
+
+    @staticmethod
+    def key(
+        serial_number: Optional[str], firmware_version: Optional[str]
+    ) -> Optional[str]:
+        """The cache key of a panel, or None when the panel is not identified."""
+        if serial_number and firmware_version:
+            return f"{serial_number}/{firmware_version}"
+        return None
+
+    @staticmethod
+    def host_key(host: str, port: int) -> str:
+        """The cache key of a panel address, it refers to the key of the panel that was last connected on it."""
+        return f"{host}:{port}"
+
+    def get(self, key: Optional[str], section: str, ttl: Optional[float] = None) -> Any:
+        """Return the cached value, or None when it is not available or expired.
+        The ttl overrides the default time to live of the cache."""
+        ttl = ttl if ttl is not None else self._ttl
+        with self._lock:
+            entry = self._entries.get(key, {}).get(section)
+        if entry is None:
+            return None
+        if ttl is not None and time.time() - entry["time"] > ttl:
+            return None
+        return entry["value"]
+
+    def set(self, key: Optional[str], section: str, value: Any):
+        """Store a (JSON serializable) value."""
+        if key is None:
+            return
+        with self._lock:
+            self._entries.setdefault(key, {})[section] = {
+                "time": time.time(),
+                "value": value,
+            }
+        self.save()
+
+    def invalidate(self, key: Optional[str], section: Optional[str] = None):
+        """Remove the section of a panel, or all sections of a panel.
+        Nothing is removed for a panel that is not identified (key None), use clear() to remove all entries.
+        """
+        if key is None:
+            return
+        with self._lock:
+            if section is None:
+                self._entries.pop(key, None)
+            else:
+                self._entries.get(key, {}).pop(section, None)
+        self.save()
+
+    def clear(self):
+        """Remove the entries of all panels."""
+        with self._lock:
+            self._entries.clear()
+        self.save()
+
+    def load(self):
+        if self._path and os.path.exists(self._path):
+            try:
+                with open(self._path, "r", encoding="utf-8") as cache_file:
+                    entries = json.load(cache_file)
+                with self._lock:
+                    self._entries = entries
+            except (OSError, ValueError) as ex:
+                self.log.error("Loading cache %s failed: %s", self._path, ex)
+
+    def save(self):
+        if self._path:
+            with self._save_lock:
+                with self._lock:
+                    # The sections of a panel are replaced, not modified, a shallow copy suffices
+                    entries = {
+                        key: dict(sections) for key, sections in self._entries.items()
+                    }
+                try:
+                    write_json_atomic(self._path, entries)
+                except OSError as ex:
+                    self.log.error("Saving cache %s failed: %s", self._path, ex)
@@ -1,6 +1,6 @@
+from collections import namedtuple
 from enum import IntEnum, unique
-
-# from collections import namedtuple
+from typing import Type
 
 # Defaults
 C3_PORT_DEFAULT = 4370
@@ -19,10 +19,12 @@ class Command(IntEnum):
     CONNECT_SESSION_LESS = 0x01
     DISCONNECT = 0x02
     DATETIME = 0x03
+    SETPARAM = 0x03
     GETPARAM = 0x04
     CONTROL = 0x05
     DATATABLE_CFG = 0x06
     GETDATA = 0x08
+    DELETEDATA = 0x09
     RTLOG_BINARY = 0x0B
     DISCOVER = 0x14
     CONNECT_SESSION = 0x76
@@ -33,9 +35,12 @@ C3_REPLY_OK = 0xC8
 C3_REPLY_ERROR = 0xC9
 
 
+C3_ERROR_COMMAND = -13
+C3_ERROR_PASSWORD = -14
+
 Errors = {
-    -13: "Command error: This command is not available",
-    -14: "The communication password is not correct",
+    C3_ERROR_COMMAND: "Command error: This command is not available",
+    C3_ERROR_PASSWORD: "The communication password is not correct",
 }
 
 
@@ -174,93 +179,124 @@ class InOutStatus(_IntEnumWithDescription):
     OPEN = 2, "Open"
 
 
-# ParameterStruct = namedtuple("read" , "write")
-# ParameterAccess = dict(
-#    "~SerialNumber" = ParameterStruct(True, False),
-#    "LockCount" = ParameterStruct(True, False),
-#    "ReaderCount" = ParameterStruct(True, False),
-#    "AuxInCount" = ParameterStruct(True, False),
-#    "AuxOutCount" = ParameterStruct(True, False),
-#    "ComPwd" = ParameterStruct(True, True),
-#    "IPAddress" = ParameterStruct(True, True),
-#    "GATEIPAddress" = ParameterStruct(True, True),
-#    "RS232BaudRate" = ParameterStruct(True, True),
-#    "NetMask" = ParameterStruct(True, True),
-#    "AntiPassback" = ParameterStruct(True, True),
-#    "InterLock" = ParameterStruct(True, True),
-#    "Door1ForcePassWord" = ParameterStruct(True, True),
-#    "Door2ForcePassWord" = ParameterStruct(True, True),
-#    "Door3ForcePassWord" = ParameterStruct(True, True),
-#    "Door4ForcePassWord" = ParameterStruct(True, True),
-#    "Door1SupperPassWord" = ParameterStruct(True, True),
-#    "Door2SupperPassWord" = ParameterStruct(True, True),
-#    "Door3SupperPassWord" = ParameterStruct(True, True),
-#    "Door4SupperPassWord" = ParameterStruct(True, True),
-#    "Door1CloseAndLock" = ParameterStruct(True, True),
-#    "Door2CloseAndLock" = ParameterStruct(True, True),
-#    "Door3CloseAndLock" = ParameterStruct(True, True),
-#    "Door4CloseAndLock" = ParameterStruct(True, True),
-#    "Door1SensorType" = ParameterStruct(True, True),
-#    "Door2SensorType" = ParameterStruct(True, True),
-#    "Door3SensorType" = ParameterStruct(True, True),
-#    "Door4SensorType" = ParameterStruct(True, True),
-#    "Door1Drivertime" = ParameterStruct(True, True),
-#    "Door2Drivertime" = ParameterStruct(True, True),
-#    "Door3Drivertime" = ParameterStruct(True, True),
-#    "Door4Drivertime" = ParameterStruct(True, True),
-#    "Door1Detectortime" = ParameterStruct(True, True),
-#    "Door2Detectortime" = ParameterStruct(True, True),
-#    "Door3Detectortime" = ParameterStruct(True, True),
-#    "Door4Detectortime" = ParameterStruct(True, True),
-#    "Door1VerifyType" = ParameterStruct(True, True),
-#    "Door2VerifyType" = ParameterStruct(True, True),
-#    "Door3VerifyType" = ParameterStruct(True, True),
-#    "Door4VerifyType" = ParameterStruct(True, True),
-#    "Door1MultiCardOpenDoor" = ParameterStruct(True, True),
-#    "Door2MultiCardOpenDoor" = ParameterStruct(True, True),
-#    "Door3MultiCardOpenDoor" = ParameterStruct(True, True),
-#    "Door4MultiCardOpenDoor" = ParameterStruct(True, True),
-#    "Door1FirstCardOpenDoor" = ParameterStruct(True, True),
-#    "Door2FirstCardOpenDoor" = ParameterStruct(True, True),
-#    "Door3FirstCardOpenDoor" = ParameterStruct(True, True),
-#    "Door4FirstCardOpenDoor" = ParameterStruct(True, True),
-#    "Door1ValidTZ" = ParameterStruct(True, True),
-#    "Door2ValidTZ" = ParameterStruct(True, True),
-#    "Door3ValidTZ" = ParameterStruct(True, True),
-#    "Door4ValidTZ" = ParameterStruct(True, True),
-#    "Door1KeepOpenTimeZone" = ParameterStruct(True, True),
-#    "Door2KeepOpenTimeZone" = ParameterStruct(True, True),
-#    "Door3KeepOpenTimeZone" = ParameterStruct(True, True),
-#    "Door4KeepOpenTimeZone" = ParameterStruct(True, True),
-#    "Door1Intertime" = ParameterStruct(True, True),
-#    "Door2Intertime" = ParameterStruct(True, True),
-#    "Door3Intertime" = ParameterStruct(True, True),
-#    "Door4Intertime" = ParameterStruct(True, True),
-#    "WatchDog" = ParameterStruct(True, True),
-#    "Door4ToDoor2" = ParameterStruct(True, True),
-#    "Door1CancelKeepOpenDay" = ParameterStruct(True, False),
-#    "Door2CancelKeepOpenDay" = ParameterStruct(True, False),
-#    "Door3CancelKeepOpenDay" = ParameterStruct(True, False),
-#    "Door4CancelKeepOpenDay" = ParameterStruct(True, False),
-#    "BackupTime" = ParameterStruct(True, True),
-#    "Reboot" = ParameterStruct(False, True),
-#    "DateTime" = ParameterStruct(False, True),
-#    "Door4ToDoor2" = ParameterStruct(True, True),
-#    "InBIOTowWay " = ParameterStruct(True, True),
-#    "~ZKFPVersion" = ParameterStruct(True, False),
-#    "~DSTF" = ParameterStruct(True, True),
-#    "DaylightSavingTimeOn" = ParameterStruct(True, True),
-#    "DLSTMode" = ParameterStruct(True, True),
-#    "DaylightSavingTime" = ParameterStruct(True, True),
-#    "StandardTime" = ParameterStruct(True, True),
-#    "WeekOfMonth1" = ParameterStruct(True, True),
-#    "WeekOfMonth2" = ParameterStruct(True, True),
-#    "WeekOfMonth3" = ParameterStruct(True, True),
-#    "WeekOfMonth4" = ParameterStruct(True, True),
-#    "WeekOfMonth5" = ParameterStruct(True, True),
-#    "WeekOfMonth6" = ParameterStruct(True, True),
-#    "WeekOfMonth7" = ParameterStruct(True, True),
-#    "WeekOfMonth8" = ParameterStruct(True, True),
-#    "WeekOfMonth9" = ParameterStruct(True, True),
-#    "WeekOfMonth10" = ParameterStruct(True, True),
-# )
+def _lookup_table(enum: Type[IntEnum], unknown: IntEnum) -> tuple:
+    """Map every byte value to its enum member, or to unknown when the value is not defined."""
+    members = {member.value: member for member in enum}
+    return tuple(members.get(value, unknown) for value in range(256))
+
+
+# Decoding of the single byte values in RT log records, without raising for unknown values
+VerificationModeTable = _lookup_table(VerificationMode, VerificationMode.OTHER)
+EventTypeTable = _lookup_table(EventType, EventType.UNKNOWN_UNSUPPORTED)
+InOutDirectionTable = _lookup_table(InOutDirection, InOutDirection.UNKNOWN_UNSUPPORTED)
+
+
+# Static parameters describe the hardware and firmware, they do not change while connected
+ParameterStruct = namedtuple(
+    "ParameterStruct", ["read", "write", "static"], defaults=[False]
+)
+
+# Read and write access of the known device parameters
+ParameterAccess = {
+    "~SerialNumber": ParameterStruct(True, False, True),
+    "LockCount": ParameterStruct(True, False, True),
+    "ReaderCount": ParameterStruct(True, False, True),
+    "AuxInCount": ParameterStruct(True, False, True),
+    "AuxOutCount": ParameterStruct(True, False, True),
+    "FirmVer": ParameterStruct(True, False, True),
+    "DeviceName": ParameterStruct(True, False, True),
+    "~DeviceName": ParameterStruct(True, False, True),
+    "~CardFormatFunOn": ParameterStruct(True, False, True),
+    "~Ext485ReaderFunOn": ParameterStruct(True, False, True),
+    "~IsOnlyRFMachine": ParameterStruct(True, False, True),
+    "~MaxAttLogCount": ParameterStruct(True, False, True),
+    "~MaxUserCount": ParameterStruct(True, False, True),
+    "~MaxUserFingerCount": ParameterStruct(True, False, True),
+    "MachineType": ParameterStruct(True, False, True),
+    "DeviceID": ParameterStruct(True, True),
+    "MasterInbio485": ParameterStruct(True, True),
+    "MThreshold": ParameterStruct(True, True),
+    "PC485AsInbio485": ParameterStruct(True, True),
+    "SimpleEventType": ParameterStruct(True, True),
+    "ComPwd": ParameterStruct(True, True),
+    "IPAddress": ParameterStruct(True, True),
+    "GATEIPAddress": ParameterStruct(True, True),
+    "RS232BaudRate": ParameterStruct(True, True),
+    "NetMask": ParameterStruct(True, True),
+    "AntiPassback": ParameterStruct(True, True),
+    "InterLock": ParameterStruct(True, True),
+    "Door1ForcePassWord": ParameterStruct(True, True),
+    "Door2ForcePassWord": ParameterStruct(True, True),
+    "Door3ForcePassWord": ParameterStruct(True, True),
+    "Door4ForcePassWord": ParameterStruct(True, True),
+    "Door1SupperPassWord": ParameterStruct(True, True),
+    "Door2SupperPassWord": ParameterStruct(True, True),
+    "Door3SupperPassWord": ParameterStruct(True, True),
+    "Door4SupperPassWord": ParameterStruct(True, True),
+    "Door1CloseAndLock": ParameterStruct(True, True),
+    "Door2CloseAndLock": ParameterStruct(True, True),
+    "Door3CloseAndLock": ParameterStruct(True, True),
+    "Door4CloseAndLock": ParameterStruct(True, True),
+    "Door1SensorType": ParameterStruct(True, True),
+    "Door2SensorType": ParameterStruct(True, True),
+    "Door3SensorType": ParameterStruct(True, True),
+    "Door4SensorType": ParameterStruct(True, True),
+    "Door1Drivertime": ParameterStruct(True, True),
+    "Door2Drivertime": ParameterStruct(True, True),
+    "Door3Drivertime": ParameterStruct(True, True),
+    "Door4Drivertime": ParameterStruct(True, True),
+    "Door1Detectortime": ParameterStruct(True, True),
+    "Door2Detectortime": ParameterStruct(True, True),
+    "Door3Detectortime": ParameterStruct(True, True),
+    "Door4Detectortime": ParameterStruct(True, True),
+    "Door1VerifyType": ParameterStruct(True, True),
+    "Door2VerifyType": ParameterStruct(True, True),
+    "Door3VerifyType": ParameterStruct(True, True),
+    "Door4VerifyType": ParameterStruct(True, True),
+    "Door1MultiCardOpenDoor": ParameterStruct(True, True),
+    "Door2MultiCardOpenDoor": ParameterStruct(True, True),
+    "Door3MultiCardOpenDoor": ParameterStruct(True, True),
+    "Door4MultiCardOpenDoor": ParameterStruct(True, True),
+    "Door1FirstCardOpenDoor": ParameterStruct(True, True),
+    "Door2FirstCardOpenDoor": ParameterStruct(True, True),
+    "Door3FirstCardOpenDoor": ParameterStruct(True, True),
+    "Door4FirstCardOpenDoor": ParameterStruct(True, True),
+    "Door1ValidTZ": ParameterStruct(True, True),
+    "Door2ValidTZ": ParameterStruct(True, True),
+    "Door3ValidTZ": ParameterStruct(True, True),
+    "Door4ValidTZ": ParameterStruct(True, True),
+    "Door1KeepOpenTimeZone": ParameterStruct(True, True),
+    "Door2KeepOpenTimeZone": ParameterStruct(True, True),
+    "Door3KeepOpenTimeZone": ParameterStruct(True, True),
+    "Door4KeepOpenTimeZone": ParameterStruct(True, True),
+    "Door1Intertime": ParameterStruct(True, True),
+    "Door2Intertime": ParameterStruct(True, True),
+    "Door3Intertime": ParameterStruct(True, True),
+    "Door4Intertime": ParameterStruct(True, True),
+    "WatchDog": ParameterStruct(True, True),
+    "Door4ToDoor2": ParameterStruct(True, True),
+    "Door1CancelKeepOpenDay": ParameterStruct(True, False),
+    "Door2CancelKeepOpenDay": ParameterStruct(True, False),
+    "Door3CancelKeepOpenDay": ParameterStruct(True, False),
+    "Door4CancelKeepOpenDay": ParameterStruct(True, False),
+    "BackupTime": ParameterStruct(True, True),
+    "Reboot": ParameterStruct(False, True),
+    "DateTime": ParameterStruct(False, True),
+    "InBIOTowWay": ParameterStruct(True, True),
+    "~ZKFPVersion": ParameterStruct(True, False, True),
+    "~DSTF": ParameterStruct(True, True),
+    "DaylightSavingTimeOn": ParameterStruct(True, True),
+    "DLSTMode": ParameterStruct(True, True),
+    "DaylightSavingTime": ParameterStruct(True, True),
+    "StandardTime": ParameterStruct(True, True),
+    "WeekOfMonth1": ParameterStruct(True, True),
+    "WeekOfMonth2": ParameterStruct(True, True),
+    "WeekOfMonth3": ParameterStruct(True, True),
+    "WeekOfMonth4": ParameterStruct(True, True),
+    "WeekOfMonth5": ParameterStruct(True, True),
+    "WeekOfMonth6": ParameterStruct(True, True),
+    "WeekOfMonth7": ParameterStruct(True, True),
+    "WeekOfMonth8": ParameterStruct(True, True),
+    "WeekOfMonth9": ParameterStruct(True, True),
+    "WeekOfMonth10": ParameterStruct(True, True),
+}
@@ -1,14 +1,53 @@
 from __future__ import annotations
 
+import functools
 import logging
-import re
 import socket
-import threading
-from dataclasses import dataclass, field
+import time
+from concurrent.futures import Executor, Future
+from dataclasses import dataclass, field, replace
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, Iterator, Optional
 
-from c3 import consts, controldevice, crc, rtlog, utils
+from c3 import (
+    cache,
+    consts,
+    controldevice,
+    framing,
+    kv,
+    locks,
+    pipeline,
+    rtlog,
+    timers,
+    utils,
+)
+
+
+def _synchronized(method):
+    """Serialize the calls of a method with all other synchronized methods of the panel."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+class ReplyError(ConnectionError):
+    """The panel replied with an error code"""
+
+    def __init__(self, message: str, error: int):
+        super().__init__(message)
+        self.error = error
+
+
+class ReceiveTimeout(ConnectionError, TimeoutError):
+    """No reply received from the panel within the receive timeout"""
+
+
+class ConnectionClosed(ConnectionError):
+    """The panel closed the connection without replying"""
 
 
 @dataclass
@@ -91,26 +130,86 @@ class _DataTableCfg:
                 for (field_name, field_typedef) in fields
             ]
 
+    def fields_by_index(self) -> Dict[int, _DataTableCfgField]:
+        return {f.index: f for f in self.fields}
+
+    def to_kv(self) -> dict:
+        """The table configuration in the key/value format it is received in"""
+        return {
+            self.name: str(self.index),
+            **{f.name: f"{f.type}{f.index}" for f in self.fields},
+        }
+
 
 class C3:
     log = logging.getLogger("C3")
     log.setLevel(logging.ERROR)
     receive_timeout = 1
     receive_retries = 3
+    timer_scheduler: timers.TimerScheduler = timers.default_scheduler
+    worker: Executor = timers.default_worker
+    data_cfg_ttl: Optional[float] = 24 * 60 * 60
+    capabilities_ttl: Optional[float] = 24 * 60 * 60
+    # Limits of a single GETPARAM request, larger requests are split
+    max_params_per_request = 30
+    max_param_request_size = 1024
+    # Seconds to cache the value of a parameter that is not static, 0 (default) to disable, None to cache while connected
+    param_cache_ttl: Optional[float] = 0.0
+    # TCP keepalive: probe after keepalive_idle seconds without traffic, every keepalive_interval seconds,
+    # the connection is dropped after keepalive_count unanswered probes
+    keepalive_idle = 10
+    keepalive_interval = 5
+    keepalive_count = 3
+    # Check whether the panel closed the connection, when idle for at least this number of seconds
+    liveness_probe_interval = 5.0
+    # Send a request when the connection is idle for this number of seconds, None to disable
+    heartbeat_interval: Optional[float] = None
+    # Reconnect (with the same password and session mode) when the connection is found to be lost
+    auto_reconnect = False
 
     def __init__(
-        self, host: [str | C3DeviceInfo], port: int = consts.C3_PORT_DEFAULT
+        self,
+        host: [str | C3DeviceInfo],
+        port: int = consts.C3_PORT_DEFAULT,
+        panel_cache: Optional[cache.PanelCache] = None,
     ) -> None:
-        self._sock: socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self._sock.settimeout(self.receive_timeout)
+        # The socket is created on connect, a panel that is never connected uses no file descriptor
+        self._sock: Optional[socket.socket] = None
+        self._decoder = framing.FrameDecoder()
+        self._encoder = framing.FrameEncoder()
         self._connected: bool = False
         self._session_less = False
         self._initialized = False
+        self._initialize_values: dict = {}
+        # Parameter name -> (value, time retrieved)
+        self._param_cache: dict[str, tuple[str, float]] = {}
+        self._param_cache_stats = cache.CacheStats()
         self._protocol_version = None
         self._rtlog_command = consts.Command.RTLOG_BINARY
         self._session_id: int = 0xFEFE
         self._request_nr: int = -258
         self._status: C3PanelStatus = C3PanelStatus()
+        self._auto_close_timers: Dict[tuple, timers.TimerHandle] = {}
+        self._panel_cache = panel_cache
+        self._data_cfg: Optional[list[_DataTableCfg]] = None
+        self._data_cfg_key: Optional[str] = None
+        self._data_cfg_time: float = 0
+        # Whether the panel handles multiple requests in flight, None when not known yet
+        self._pipelining: Optional[bool] = None
+        self._active_pipeline: Optional[pipeline.C3Pipeline] = None
+        # Serializes the requests of multiple threads, a reply must be received before the next request is sent
+        self._lock = locks.MeteredLock()
+        self._password: Optional[str] = None
+        self._last_activity = time.monotonic()
+        # Set while connected on request of the user, cleared by disconnect
+        self._keep_connected = False
+        self._heartbeat_timer: Optional[timers.TimerHandle] = None
+        self._reconnect_future: Optional[Future] = None
+        # The first error of the last failed connect, tells a refused session from an unreachable panel
+        self._connect_error: Optional[Exception] = None
+        self._door_settings_refresh: Optional[Future] = None
+        # Whether the replies carry the number of their request, None until the first reply of a connection
+        self._echoes_request_nr: Optional[bool] = None
         if isinstance(host, C3DeviceInfo):
             self._device_info: C3DeviceInfo = host
         elif isinstance(host, str):
@@ -122,40 +221,11 @@ class C3:
     def _get_message_header(
         cls, data: [bytes or bytearray]
     ) -> tuple[[int or None], int, int]:
-        if len(data) >= 5:
-            version = data[1]
-            if (
-                data[0] == consts.C3_MESSAGE_START
-            ):  # and version == consts.C3_PROTOCOL_VERSION:
-                command = data[2]
-                data_size = data[3] + (data[4] * 256)
-            else:
-                raise ValueError("Received reply does not start with start token")
-        else:
-            raise ValueError(f"Received reply of insufficient length {len(data)}")
-
-        return command, data_size, version
+        return framing.parse_header(data)
 
     @classmethod
-    def _get_message(cls, data: [bytes or bytearray]) -> bytearray:
-        if data[-1] == consts.C3_MESSAGE_END:
-            # Get the message payload, without start, crc and end bytes
-            checksum = crc.crc16(data[1:-3])
-
-            if utils.lsb(checksum) == data[-3] or utils.msb(checksum) == data[-2]:
-                # Return all data without header (leading) and crc (trailing)
-                message = bytearray(data[5:-3])
-            else:
-                raise ValueError(
-                    "Payload checksum is invalid: %02x%02x expected %02x%02x"
-                    % (data[-3], data[-2], utils.lsb(checksum), utils.msb(checksum))
-                )
-        else:
-            raise ValueError(
-                "Payload does not include message end marker (%02x)" % data[-1]
-            )
-
-        return message
+    def _get_message(cls, data: [bytes or bytearray]) -> memoryview:
+        return framing.check_frame(data)
 
     @classmethod
     def _construct_message(
@@ -164,155 +234,212 @@ class C3:
         request_nr: Optional[int],
         command: consts.Command,
         data=None,
-    ) -> bytes:
-        message_length = len(data or []) + (4 if (session_id and request_nr) else 0)
-        message = bytearray(
-            [
-                consts.C3_PROTOCOL_VERSION,
-                command or 0x00,
-                utils.lsb(message_length),
-                utils.msb(message_length),
-            ]
-        )
-        if session_id:
-            message.append(utils.lsb(session_id))
-            message.append(utils.msb(session_id))
-            message.append(utils.lsb(request_nr))
-            message.append(utils.msb(request_nr))
-
-        if data:
-            for byte in data:
-                if isinstance(byte, int):
-                    message.append(byte)
-                elif isinstance(byte, str):
-                    message.append(ord(byte))
-                else:
-                    raise TypeError(
-                        "Data does not contain int or str: %s is %s"
-                        % (str(byte), type(byte))
-                    )
-
-        checksum = crc.crc16(message)
-        message.append(utils.lsb(checksum))
-        message.append(utils.msb(checksum))
-
-        message.insert(0, consts.C3_MESSAGE_START)
-        message.append(consts.C3_MESSAGE_END)
-        return message
+    ) -> bytearray:
+        return framing.encode_frame(session_id, request_nr, command, data)
 
     def _send(self, command: consts.Command, data=None) -> int:
-        message = self._construct_message(
+        message = self._encoder.encode(
             self._session_id, self._request_nr, command, data
         )
 
-        self.log.debug("Sending: %s", message.hex())
+        if self.log.isEnabledFor(logging.DEBUG):
+            self.log.debug("Sending: %s", message.hex())
 
         bytes_written = self._sock.send(message)
         self._request_nr = self._request_nr + 1
+        self._last_activity = time.monotonic()
         return bytes_written
 
-    def _receive(self) -> tuple[bytearray, int, int]:
-        # Get the first 5 bytes
+    def _receive_frame(self) -> framing.Frame:
+        """Receive one message, reading until it is complete.
+
+        The payload of the returned frame is a view on the receive buffer, it is only valid until the next receive.
+        """
         self._sock.settimeout(self.receive_timeout)
 
-        header = bytes()
-        for _ in range(self.receive_retries):
+        decoder = self._decoder
+        decoder.reset()
+        timeouts = 0
+        closed = False
+        bytes_needed = decoder.bytes_needed()
+        while bytes_needed > 0 and timeouts < self.receive_retries:
             try:
-                header = self._sock.recv(5)
-                if len(header) == 5:
-                    break
+                bytes_received = self._sock.recv_into(
+                    decoder.write_buffer(bytes_needed), bytes_needed
+                )
             except socket.timeout:
-                pass
-
-        if len(header) == 5:
-            self.log.debug("Received header: %s", header.hex())
-
-            message = bytearray()
-            received_command, data_size, protocol_version = self._get_message_header(
-                header
+                timeouts += 1
+                continue
+
+            if bytes_received == 0:
+                # The connection was closed by the panel
+                closed = True
+                break
+            decoder.commit(bytes_received)
+            bytes_needed = decoder.bytes_needed()
+
+        if decoder.buffered == 0 and closed:
+            raise ConnectionClosed("The connection was closed by the panel")
+        if decoder.buffered == 0 and timeouts >= self.receive_retries:
+            raise ReceiveTimeout("No reply received within the receive timeout")
+        if decoder.buffered < framing.C3_HEADER_SIZE:
+            raise ConnectionError(
+                f"Invalid response header received; expected {framing.C3_HEADER_SIZE} bytes, "
+                f"received {decoder.buffered}"
             )
-            # Get the optional message data, checksum (2 bytes) and end marker (1 byte)
-            payload = self._sock.recv(data_size + 3)
-            if data_size > 0:
-                # Process message in case data available
-                self.log.debug(
-                    "Receiving payload (data size %d): %s", data_size, payload.hex()
-                )
-                message = self._get_message(header + payload)
-
-            if len(message) != data_size:
-                raise ValueError(
-                    f"Length of received message ({len(message)}) doesn't match specified ({data_size})"
-                )
 
-            if received_command == consts.C3_REPLY_OK:
-                pass
-            elif received_command == consts.C3_REPLY_ERROR:
-                error = utils.byte_to_signed_int(message[-1])
-                raise ConnectionError(
-                    f"Error {error} received in reply: {consts.Errors[error] if error in consts.Errors else 'Unknown'}"
-                )
-        else:
+        frame = decoder.next_frame()
+        if frame is None and closed:
             raise ConnectionError(
-                f"Invalid response header received; expected 5 bytes, received {header}"
+                f"The connection was closed by the panel, {bytes_needed} bytes missing"
+            )
+        if frame is None:
+            raise ValueError(
+                f"Incomplete message received, {bytes_needed} bytes missing"
+            )
+        self._last_activity = time.monotonic()
+
+        if self.log.isEnabledFor(logging.DEBUG):
+            self.log.debug(
+                "Received command %02x (data size %d): %s",
+                frame.command,
+                len(frame.payload),
+                frame.payload.hex(),
             )
 
-        return message, data_size, protocol_version
+        return frame
+
+    @classmethod
+    def _reply_error(cls, message: [bytes, memoryview]) -> ReplyError:
+        error = utils.byte_to_signed_int(message[-1])
+        return ReplyError(
+            f"Error {error} received in reply: {consts.Errors[error] if error in consts.Errors else 'Unknown'}",
+            error,
+        )
+
+    def _receive(self) -> tuple[memoryview, int, int]:
+        """Receive one message, reading until it is complete.
+
+        The returned message is a view on the receive buffer, it is only valid until the next receive.
+        """
+        frame = self._receive_frame()
+        message = frame.payload
+
+        if frame.command == consts.C3_REPLY_OK:
+            pass
+        elif frame.command == consts.C3_REPLY_ERROR:
+            raise self._reply_error(message)
+
+        return message, len(message), frame.version
 
+    def _is_reply_to(self, request_nr: int, reply_nr: int) -> bool:
+        """Whether a reply with reply_nr in its session header answers the request with request_nr.
+
+        Some firmware numbers the replies itself, these answer the oldest request. A panel that
+        returns the request number (detected on the first reply of a connection) sends a reply with
+        another number only for a request that was given up on, that reply is to be discarded.
+        """
+        if self._echoes_request_nr is None:
+            self._echoes_request_nr = request_nr == reply_nr
+        return request_nr == reply_nr or not self._echoes_request_nr
+
+    @_synchronized
     def _send_receive(
         self, command: consts.Command, data=None
-    ) -> tuple[bytearray, int]:
+    ) -> tuple[memoryview, int]:
         bytes_received = 0
-        receive_data = bytearray()
+        receive_data = memoryview(b"")
         session_offset = 0
 
+        if self._active_pipeline is not None:
+            # Receive the replies of the pipelined requests first
+            self._active_pipeline.flush()
+
         try:
+            request_nr = self._request_nr & 0xFFFF
             bytes_written = self._send(command, data)
-            if bytes_written > 0:
+            while bytes_written > 0:
                 receive_data, bytes_received, _ = self._receive()
-                if not self._session_less and bytes_received > 2:
-                    session_offset = 4
-                    session_id = (receive_data[1] << 8) + receive_data[0]
-                    # msg_seq = (receive_data[3] << 8) + receive_data[2]
-                    if self._session_id != session_id:
-                        raise ValueError("Data received with invalid session ID")
-        except BrokenPipeError as ex:
-            self._connected = False
+                if self._session_less or bytes_received <= 2:
+                    break
+                session_offset = 4
+                session_id = (receive_data[1] << 8) + receive_data[0]
+                if self._session_id != session_id:
+                    raise ValueError("Data received with invalid session ID")
+                if bytes_received < 4:
+                    break
+                reply_nr = (receive_data[3] << 8) + receive_data[2]
+                if self._is_reply_to(request_nr, reply_nr):
+                    break
+                self.log.debug("Discarding the late reply to request %04x", reply_nr)
+        except ReplyError:
+            # The panel answered, the connection is fine
+            raise
+        except ConnectionError:
+            # No reply, or the connection was closed or reset by the panel
+            self._connection_lost()
+            raise
+        except OSError as ex:
+            self._connection_lost()
             raise ConnectionError(f"Unexpected connection end: {ex}") from ex
 
         return receive_data[session_offset:], bytes_received - session_offset
 
+    # The settings of all doors (a panel has at most 4) are retrieved with the identification
+    _door_settings_parameters = [
+        f"Door{door_nr}{name}"
+        for door_nr in range(1, 5)
+        for name in ["SensorType", "Drivertime", "Detectortime"]
+    ]
+    _initialize_parameters = [
+        "~SerialNumber",
+        "FirmVer",
+        "DeviceName",
+        "LockCount",
+        "AuxInCount",
+        "AuxOutCount",
+    ] + _door_settings_parameters
+
+    @classmethod
+    def _apply_initialize_parameters(
+        cls, device_info: C3DeviceInfo, status: C3PanelStatus, params: dict
+    ):
+        device_info.serial_number = params.get(
+            "~SerialNumber", device_info.serial_number
+        )
+        device_info.firmware_version = params.get(
+            "FirmVer", device_info.firmware_version
+        )
+        device_info.device_name = params.get("DeviceName", device_info.device_name)
+        status.nr_of_locks = int(params.get("LockCount", status.nr_of_locks))
+        status.nr_aux_in = int(params.get("AuxInCount", status.nr_aux_in))
+        status.nr_aux_out = int(params.get("AuxOutCount", status.nr_aux_out))
+        cls._apply_door_settings(status, params)
+
+    @staticmethod
+    def _apply_door_settings(status: C3PanelStatus, params: dict):
+        for door_nr in range(1, status.nr_of_locks + 1):
+            door_prefix = f"Door{door_nr}"
+            try:
+                status.door_settings[door_nr] = C3DoorSettings(
+                    sensor_type=consts.DoorSensorType(
+                        int(params[door_prefix + "SensorType"])
+                    ),
+                    lock_drive_time=int(params[door_prefix + "Drivertime"]),
+                    door_alarm_timeout=int(params[door_prefix + "Detectortime"]),
+                )
+            except (KeyError, ValueError):
+                # Not all firmwares return the door settings with the identification
+                pass
+
     def _initialize(self):
         if not self._initialized:
             try:
-                params = self.get_device_param(
-                    [
-                        "~SerialNumber",
-                        "FirmVer",
-                        "DeviceName",
-                        "LockCount",
-                        "AuxInCount",
-                        "AuxOutCount",
-                    ]
-                )
-                self._device_info.serial_number = params.get(
-                    "~SerialNumber", self._device_info.serial_number
-                )
-                self._device_info.firmware_version = params.get(
-                    "FirmVer", self._device_info.firmware_version
-                )
-                self._device_info.device_name = params.get(
-                    "DeviceName", self._device_info.device_name
-                )
-                self._status.nr_of_locks = int(
-                    params.get("LockCount", self._status.nr_of_locks)
-                )
-                self._status.nr_aux_in = int(
-                    params.get("AuxInCount", self._status.nr_aux_in)
-                )
-                self._status.nr_aux_out = int(
-                    params.get("AuxOutCount", self._status.nr_aux_out)
+                params = self.get_device_param(self._initialize_parameters)
+                self._apply_initialize_parameters(
+                    self._device_info, self._status, params
                 )
+                self._initialize_values = params
                 self._initialized = True
             except ConnectionError as ex:
                 self.log.error(
@@ -325,30 +452,132 @@ class C3:
                     ex,
                 )
 
+    def _probe(self) -> bool:
+        """Check without blocking whether the connection was closed or reset by the panel."""
+        try:
+            # Peek, to not remove data from the receive buffer
+            self._sock.setblocking(False)
+            alive = len(self._sock.recv(1, socket.MSG_PEEK)) > 0
+        except BlockingIOError:
+            # The socket is open and reading from it would block
+            alive = True
+        except OSError:
+            alive = False
+        finally:
+            if self._sock is not None:
+                self._sock.settimeout(self.receive_timeout)
+        return alive
+
+    def _close_socket(self):
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError as ex:
+                self.log.error("Error while closing socket: %s", str(ex))
+            self._sock = None
+
+    def _connection_lost(self):
+        self.log.info("Connection to %s lost", self._device_info.host)
+        self._close_socket()
+        self._connected = False
+
     def is_connected(self) -> bool:
-        # try:
-        #    # this will try to read bytes without blocking and also without removing them from buffer (peek only)
-        #    data = self._sock.recv(1, socket.MSG_DONTWAIT | socket.MSG_PEEK)
-        #    if len(data) == 0:
-        #        return True
-        # except BlockingIOError:
-        #    return True  # socket is open and reading from it would block
-        # except ConnectionResetError:
-        #    return False  # socket was closed for some other reason
-        # except Exception as e:
-        #    return False
+        if (
+            self._sock is not None
+            and self._connected
+            and time.monotonic() - self._last_activity >= self.liveness_probe_interval
+            # When another thread uses the connection, it is alive; the probe would disturb it
+            and self._lock.acquire(blocking=False)
+        ):
+            try:
+                if self._probe():
+                    self._last_activity = time.monotonic()
+                else:
+                    self._connection_lost()
+            finally:
+                self._lock.release()
+
+        if not self._connected and self._keep_connected and self.auto_reconnect:
+            # Reconnecting takes up to a few receive timeouts, the caller does not wait for it
+            if self._reconnect_future is None or self._reconnect_future.done():
+                self._reconnect_future = self.worker.submit(self._auto_reconnect)
+
         return self._sock is not None and self._connected
 
-    @classmethod
-    def _parse_kv_from_message(cls, message: bytes) -> dict:
-        kv_pairs = {}
+    @_synchronized
+    def _auto_reconnect(self):
+        # Another thread may have reconnected or disconnected in the meantime
+        if not self._connected and self._keep_connected and self.auto_reconnect:
+            self.reconnect()
+
+    @_synchronized
+    def reconnect(self) -> bool:
+        """Connect again, with the password and the session mode of the previous connection."""
+        self._connection_lost()
+        self.log.info("Reconnecting to %s", self._device_info.host)
+        return self.connect(self._password)
+
+    def _configure_socket(self):
+        """Enable TCP keepalive, so a connection that is dropped silently is detected in bounded time."""
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        if hasattr(socket, "TCP_KEEPIDLE"):
+            self._sock.setsockopt(
+                socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, self.keepalive_idle
+            )
+        elif hasattr(socket, "TCP_KEEPALIVE"):
+            # macOS
+            self._sock.setsockopt(
+                socket.IPPROTO_TCP, socket.TCP_KEEPALIVE, self.keepalive_idle
+            )
+        if hasattr(socket, "TCP_KEEPINTVL"):
+            self._sock.setsockopt(
+                socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, self.keepalive_interval
+            )
+        if hasattr(socket, "TCP_KEEPCNT"):
+            self._sock.setsockopt(
+                socket.IPPROTO_TCP, socket.TCP_KEEPCNT, self.keepalive_count
+            )
+        if hasattr(socket, "SIO_KEEPALIVE_VALS"):
+            # Windows
+            self._sock.ioctl(
+                socket.SIO_KEEPALIVE_VALS,
+                (1, self.keepalive_idle * 1000, self.keepalive_interval * 1000),
+            )
 
-        message_str = message.decode(encoding="ascii", errors="ignore")
-        pattern = re.compile(r"([\w~]+)=([^,\t]+)")
-        for param_name, param_value in re.findall(pattern, message_str):
-            kv_pairs[param_name] = param_value
+    def _schedule_heartbeat(self):
+        if self._heartbeat_timer is not None:
+            self._heartbeat_timer.cancel()
+            self._heartbeat_timer = None
+        if self.heartbeat_interval and self._keep_connected:
+            self._heartbeat_timer = self.timer_scheduler.call_later(
+                self.heartbeat_interval, self.worker.submit, self._heartbeat
+            )
 
-        return kv_pairs
+    def _heartbeat(self):
+        """Send a request on an idle connection, to find out whether the panel still answers.
+        Runs on the worker, the timer only starts it; the next heartbeat is scheduled when done.
+        """
+        if self._lock.acquire(blocking=False):
+            try:
+                if (
+                    self._connected
+                    and time.monotonic() - self._last_activity
+                    >= self.heartbeat_interval
+                ):
+                    self._send_receive(consts.Command.GETPARAM, "~SerialNumber")
+            except (ConnectionError, ValueError, OSError) as ex:
+                self.log.error("Heartbeat to %s failed: %s", self._device_info.host, ex)
+                self._connection_lost()
+            finally:
+                self._lock.release()
+
+            self._auto_reconnect()
+
+        self._schedule_heartbeat()
+
+    @classmethod
+    def _parse_kv_from_message(cls, message: bytes) -> dict:
+        return kv.parse_kv(message)
 
     @classmethod
     def _kv_to_message(cls, data: dict):
@@ -368,6 +597,11 @@ class C3:
     def log_level(self, level: int):
         self.log.setLevel(level)
 
+    @property
+    def lock_stats(self) -> locks.LockStats:
+        """Contention metrics of the requests of multiple threads on this panel"""
+        return self._lock.stats
+
     @property
     def host(self) -> str:
         return self._device_info.host
@@ -423,82 +657,63 @@ class C3:
         return self._status.nr_aux_out or 0
 
     @classmethod
-    def discover(cls, interface_address: str = None, timeout: int = 2) -> list[C3]:
-        """Scan on all local network interface, or the provided interface, for C3 panels."""
-        devices = []
-        message = cls._construct_message(
-            None, None, consts.Command.DISCOVER, consts.C3_DISCOVERY_MESSAGE
-        )
-
-        if interface_address:
-            ip_addresses = [interface_address]
-        else:
-            interfaces = socket.getaddrinfo(
-                host=socket.gethostname(), port=None, family=socket.AF_INET
-            )
-            ip_addresses = [ip[-1][0] for ip in interfaces]
-        for ip_address in ip_addresses:
-            cls.log.debug("Discover on %s", ip_address)
-            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
-            sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
-            sock.settimeout(timeout)
-            sock.bind((ip_address, 0))
-            sock.sendto(message, ("255.255.255.255", consts.C3_PORT_BROADCAST))
-
-            while True:
-                try:
-                    payload = sock.recv(64 * 1024)
-                except socket.timeout:
-                    break
-
-                if payload:
-                    received_command, data_size, _ = cls._get_message_header(payload)
-                    if received_command == consts.C3_REPLY_OK:
-                        # Get the message data and signature
-                        message = cls._get_message(payload)
-
-                        if len(message) != data_size:
-                            raise ValueError(
-                                "Length of received message (%d) does not match specified size (%d)"
-                                % (len(message), data_size)
-                            )
-                        data = cls._parse_kv_from_message(message)
-                        devices.append(
-                            C3(
-                                C3DeviceInfo(
-                                    host=data.get("IP"),
-                                    mac=data.get("MAC"),
-                                    serial_number=data.get("SN"),
-                                    device_name=data.get("Device"),
-                                    firmware_version=data.get("Ver"),
-                                )
-                            )
-                        )
-            sock.close()
+    def discover(
+        cls,
+        interface_address: str = None,
+        timeout: int = 2,
+        subnets: Optional[list[str]] = None,
+        wrap: bool = False,
+    ) -> list[C3DeviceInfo] | list[C3]:
+        """Scan on all local network interface, or the provided interface, for C3 panels.
+        The interfaces are scanned concurrently, panels in the optional subnets are scanned by unicast.
+        Returns the information of the panels found, or C3 instances for these panels when wrap is set.
+        """
+        # Imported here, the discovery module builds on this module
+        from c3 import discovery
 
-        return devices
+        devices = discovery.discover(
+            [interface_address] if interface_address else None, subnets, timeout
+        )
+        return [C3(device) for device in devices] if wrap else devices
 
+    @_synchronized
     def connect(self, password: Optional[str] = None) -> bool:
         """Connect to the C3 panel on the host/port provided in the constructor."""
         self._connected = False
         self._session_id = 0xFEFE
         self._request_nr: -258
+        self._password = password
+        self._param_cache.clear()
+        self._connect_error = None
+        self._echoes_request_nr = None
 
         data = None
         if password:
             data = bytearray(password.encode("ascii"))
 
-        # Recreate a socket when it has been removed in disconnect method because of an error
-        if self._sock is None:
-            self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        # Use the known session mode and RT log format, instead of detecting them again
+        capabilities = None if self._initialized else self._load_capabilities()
+        if capabilities:
+            self._session_less = capabilities["session_less"]
+            self._rtlog_command = consts.Command(capabilities["rtlog_command"])
+            if self._pipelining is None:
+                self._pipelining = capabilities["pipelining"]
+
+        # A socket can be connected once, every connection attempt uses a new socket
+        self._close_socket()
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.settimeout(self.receive_timeout)
 
         try:
+            self._configure_socket()
             self._sock.connect((self._device_info.host, self._device_info.port))
         except socket.error as ex:
             self.log.error("Error while opening socket: %s", str(ex))
-            self._sock = None
+            self._connect_error = ex
+            self._close_socket()
 
-        if self._sock is not None:
+        # A panel that was connected without session before, is connected without session right away
+        if self._sock is not None and not self._session_less:
             # Attempt to connect to panel with session initiation command
             try:
                 bytes_written = self._send(consts.Command.CONNECT_SESSION, data)
@@ -518,40 +733,66 @@ class C3:
                     self._device_info.host,
                     ex,
                 )
+                self._connect_error = ex
             except ValueError as ex:
                 self.log.error("Reply from %s failed: %s", self._device_info.host, ex)
+                self._connect_error = ex
 
-            # Alternatively attempt to connect to panel without session initiation
-            if not self._connected:
-                try:
-                    self._session_id = None
-                    bytes_written = self._send(
-                        consts.Command.CONNECT_SESSION_LESS, data
-                    )
-                    if bytes_written > 0:
-                        _, _, protocol_version = self._receive()
-                        self.log.debug("Connected without session")
-                        self._session_less = True
-                        self._protocol_version = protocol_version
-                        self._connected = True
-                except ConnectionError as ex:
-                    self.log.debug(
-                        "Connection attempt without session to %s failed: %s",
-                        self._device_info.host,
-                        ex,
-                    )
-                except ValueError as ex:
-                    self.log.error(
-                        "Reply from %s failed: %s", self._device_info.host, ex
-                    )
+        # Alternatively attempt to connect to panel without session initiation
+        session_less_rejected = False
+        if self._sock is not None and not self._connected:
+            try:
+                self._session_id = None
+                bytes_written = self._send(consts.Command.CONNECT_SESSION_LESS, data)
+                if bytes_written > 0:
+                    _, _, protocol_version = self._receive()
+                    self.log.debug("Connected without session")
+                    self._session_less = True
+                    self._protocol_version = protocol_version
+                    self._connected = True
+            except ConnectionError as ex:
+                self.log.debug(
+                    "Connection attempt without session to %s failed: %s",
+                    self._device_info.host,
+                    ex,
+                )
+                session_less_rejected = (
+                    isinstance(ex, ReplyError) and ex.error == consts.C3_ERROR_COMMAND
+                )
+                self._connect_error = self._connect_error or ex
+            except ValueError as ex:
+                self.log.error("Reply from %s failed: %s", self._device_info.host, ex)
+                self._connect_error = self._connect_error or ex
 
         if self._connected:
+            self._keep_connected = True
+            if capabilities:
+                self._apply_initialize_parameters(
+                    self._device_info, self._status, capabilities["parameters"]
+                )
+                self._initialize_values = capabilities["parameters"]
+                self._initialized = True
             self._initialize()
+            if self._capabilities() != capabilities:
+                self._save_capabilities()
+            self._schedule_heartbeat()
+        else:
+            if session_less_rejected and self._session_less:
+                # The panel does not support the session-less handshake; detect the session mode again.
+                # A wrong password or a timeout does not tell anything about the session mode.
+                self._session_less = False
+                cache_key = self._panel_cache_key()
+                if capabilities and cache_key is not None:
+                    self._panel_cache.invalidate(cache_key, "capabilities")
+            self._close_socket()
 
         return self._connected
 
+    @_synchronized
     def disconnect(self):
         """Disconnect from C3 panel and end session."""
+        self._keep_connected = False
+        self._schedule_heartbeat()
         if self.is_connected():
             try:
                 self._send_receive(consts.Command.DISCONNECT)
@@ -560,17 +801,27 @@ class C3:
                 # ignoring a ConnectionError for that reason.
                 pass
 
-            if self._sock is not None:
-                try:
-                    self._sock.close()
-                except socket.error as ex:
-                    self.log.error("Error while closing socket: %s", str(ex))
-                self._sock = None
-
+        self._close_socket()
         self._connected = False
+        self._param_cache.clear()
         self._session_id = None
         self._request_nr: -258
 
+    def pipeline(self, max_in_flight: int = 8) -> pipeline.C3Pipeline:
+        """Return a pipeline, to send multiple requests without waiting for the reply of each request.
+        Use it as context manager, all replies are received when the context is left:
+
+            with panel.pipeline() as requests:
+                params = requests.get_device_param(["~SerialNumber"])
+                users = requests.get_device_data("user")
+            print(params.result(), users.result())
+        """
+        if self._sock is not None:
+            # Send the requests right away, instead of holding them until the previous one is acknowledged
+            self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return pipeline.C3Pipeline(self, max_in_flight)
+
+    @_synchronized
     def set_device_datetime(self, time: Optional[datetime] = None):
         """Send a control command to the panel."""
         time = time or datetime.now()
@@ -591,39 +842,225 @@ class C3:
         else:
             raise ConnectionError("No connection to C3 panel.")
 
-    def get_device_param(self, request_parameters: list[str]) -> dict:
-        """Retrieve the requested device parameter values."""
-        if self.is_connected():
+    @_synchronized
+    def set_device_param(self, parameters: dict, validate: bool = False):
+        """Set the values of device parameters, the cached values of these parameters are discarded.
+        With validate set, names that are unknown or not writable raise a ValueError before anything is sent.
+        """
+        if validate:
+            self._validate_parameters(parameters, write=True)
+
+        if not self.is_connected():
+            raise ConnectionError("No connection to C3 panel.")
+
+        try:
+            self._send_receive(consts.Command.SETPARAM, self._kv_to_message(parameters))
+        finally:
+            # Also after a failure, since the panel may have applied the values
+            for name in parameters:
+                self._param_cache.pop(name, None)
+
+    @_synchronized
+    def get_device_param(
+        self,
+        request_parameters: list[str],
+        validate: bool = False,
+        refresh: bool = False,
+    ) -> dict:
+        """Retrieve the requested device parameter values.
+
+        Static parameters (like the serial number and number of locks) are cached while connected,
+        other parameters only when param_cache_ttl is set. With refresh set, all values are retrieved.
+        The parameters are requested in chunks of at most max_params_per_request names and
+        max_param_request_size bytes, the chunks are pipelined when the panel supports it.
+        With validate set, names that are unknown or not readable raise a ValueError before
+        anything is sent.
+        """
+        if validate:
+            self._validate_parameters(request_parameters)
+
+        if not self.is_connected():
+            raise ConnectionError("No connection to C3 panel.")
+
+        now = time.monotonic()
+        parameter_values = {}
+        missing = []
+        for name in request_parameters:
+            cached = None if refresh else self._param_cache.get(name)
+            if cached is not None and self._param_cache_valid(name, cached[1], now):
+                parameter_values[name] = cached[0]
+                self._param_cache_stats.hits += 1
+            else:
+                missing.append(name)
+                self._param_cache_stats.misses += 1
+
+        if missing or not request_parameters:
+            received = self._request_device_param(missing)
+            for name, value in received.items():
+                self._param_cache[name] = (value, now)
+            parameter_values.update(received)
+
+        return parameter_values
+
+    def _param_cache_valid(self, name: str, cache_time: float, now: float) -> bool:
+        access = consts.ParameterAccess.get(name)
+        if access is not None and access.static:
+            return True
+        return self.param_cache_ttl is None or now - cache_time < self.param_cache_ttl
+
+    def _request_device_param(self, request_parameters: list[str]) -> dict:
+        chunks = self._chunk_parameters(request_parameters)
+        if len(chunks) <= 1:
             message, _ = self._send_receive(
                 consts.Command.GETPARAM, ",".join(request_parameters)
             )
-            parameter_values = self._parse_kv_from_message(message)
-        else:
-            raise ConnectionError("No connection to C3 panel.")
+            return self._parse_kv_from_message(message)
 
+        with self.pipeline() as requests:
+            futures = [requests.get_device_param(chunk) for chunk in chunks]
+        parameter_values = {}
+        for future in futures:
+            parameter_values.update(future.result())
         return parameter_values
 
+    @property
+    def param_cache_stats(self) -> cache.CacheStats:
+        """Hit and miss counters of the parameter cache"""
+        return replace(self._param_cache_stats)
+
+    @classmethod
+    def _chunk_parameters(cls, request_parameters: list[str]) -> list[list[str]]:
+        """Split the parameter names in chunks that fit in a single request."""
+        chunks = []
+        chunk_size = 0
+        for name in request_parameters:
+            if chunks and (
+                len(chunks[-1]) < cls.max_params_per_request
+                and chunk_size + 1 + len(name) <= cls.max_param_request_size
+            ):
+                chunks[-1].append(name)
+                chunk_size += 1 + len(name)
+            else:
+                chunks.append([name])
+                chunk_size = len(name)
+        return chunks
+
+    @staticmethod
+    def _validate_parameters(parameters, write: bool = False):
+        for name in parameters:
+            access = consts.ParameterAccess.get(name)
+            if access is None:
+                raise ValueError(f"Unknown parameter: {name}")
+            if not (access.write if write else access.read):
+                raise ValueError(
+                    f"Parameter {name} can not be {'written' if write else 'read'}"
+                )
+
+    @classmethod
+    def _parse_device_data_cfg(cls, message: bytes) -> list[_DataTableCfg]:
+        # The configuration of every table is on its own line
+        return [
+            _DataTableCfg(data_items)
+            for data_items in kv.parse_kv_records(message, intern=True)
+        ]
+
+    def _cache_key(self) -> Optional[str]:
+        return cache.PanelCache.key(
+            self._device_info.serial_number, self._device_info.firmware_version
+        )
+
+    def _capabilities(self) -> dict:
+        return {
+            "session_less": self._session_less,
+            "rtlog_command": int(self._rtlog_command),
+            "protocol_version": self._protocol_version,
+            "pipelining": self._pipelining,
+            "parameters": self._initialize_values,
+        }
+
+    def _load_capabilities(self) -> Optional[dict]:
+        """The cached capabilities of the panel."""
+        cache_key = self._panel_cache_key()
+        if cache_key is None:
+            return None
+        return self._panel_cache.get(cache_key, "capabilities", self.capabilities_ttl)
+
+    def _panel_cache_key(self) -> Optional[str]:
+        """The cache key of the panel, found by its address when the panel is not identified yet."""
+        if self._panel_cache is None:
+            return None
+        return self._cache_key() or self._panel_cache.get(
+            cache.PanelCache.host_key(self.host, self.port),
+            "panel",
+            self.capabilities_ttl,
+        )
+
+    def _save_capabilities(self):
+        """Store the connection capabilities, so the next connection skips their detection."""
+        if self._panel_cache is not None and self._initialized:
+            cache_key = self._cache_key()
+            self._panel_cache.set(
+                cache.PanelCache.host_key(self.host, self.port), "panel", cache_key
+            )
+            self._panel_cache.set(cache_key, "capabilities", self._capabilities())
+
     def _get_device_data_cfg(self) -> list[_DataTableCfg]:
-        data_cfg = []
+        """Return the data table configuration of the panel.
 
-        if self.is_connected():
-            message, _ = self._send_receive(consts.Command.DATATABLE_CFG)
-            # get the individual table configuration, that is split using a newline (\n)
-            for message_line in message.split(b"\x0a"):
-                data_items = self._parse_kv_from_message(message_line)
-                if data_items:
-                    data_cfg.append(_DataTableCfg(data_items))
-        else:
+        The configuration is cached for the panel serial number and firmware version,
+        in memory and in the panel cache when one is provided, for at most data_cfg_ttl seconds.
+        """
+        if not self.is_connected():
             raise ConnectionError("No connection to C3 panel.")
 
+        cache_key = self._cache_key()
+        if (
+            self._data_cfg is not None
+            and self._data_cfg_key == cache_key
+            and (
+                self.data_cfg_ttl is None
+                or time.monotonic() - self._data_cfg_time <= self.data_cfg_ttl
+            )
+        ):
+            return self._data_cfg
+
+        data_cfg = None
+        if self._panel_cache is not None:
+            cached_data_cfg = self._panel_cache.get(
+                cache_key, "data_cfg", self.data_cfg_ttl
+            )
+            if cached_data_cfg is not None:
+                data_cfg = [_DataTableCfg(data_items) for data_items in cached_data_cfg]
+
+        if data_cfg is None:
+            message, _ = self._send_receive(consts.Command.DATATABLE_CFG)
+            data_cfg = self._parse_device_data_cfg(message)
+            if self._panel_cache is not None:
+                self._panel_cache.set(
+                    cache_key, "data_cfg", [cfg.to_kv() for cfg in data_cfg]
+                )
+
+        self._data_cfg = data_cfg
+        self._data_cfg_key = cache_key
+        self._data_cfg_time = time.monotonic()
+
         return data_cfg
 
-    def get_device_data(
-        self, table_name: str, field_names: Optional[list[str]] = None
-    ) -> list[dict]:
-        data_cfg = self._get_device_data_cfg()
-        device_data = []
+    def invalidate_cache(self):
+        """Discard the cached configuration of the panel, so it is retrieved again on next use."""
+        self._data_cfg = None
+        self._param_cache.clear()
+        if self._panel_cache is not None:
+            self._panel_cache.invalidate(self._panel_cache_key())
 
+    @classmethod
+    def _get_device_data_request(
+        cls,
+        data_cfg: list[_DataTableCfg],
+        table_name: str,
+        field_names: Optional[list[str]] = None,
+    ) -> tuple[_DataTableCfg, list[int]]:
+        """Return the table configuration and the GETDATA parameters to retrieve the requested table fields."""
         cfg = next((c for c in data_cfg if c.name == table_name), None)
         if cfg:
             data_fields = [f.name for f in cfg.fields]
@@ -649,58 +1086,168 @@ class C3:
             # - the indexes of the fields to retrieve
             # - two bytes set to 0 - purpose or meaning unknown
             parameters = [cfg.index, len(field_indexes)] + field_indexes + [0, 0]
-            message, _ = self._send_receive(consts.Command.GETDATA, parameters)
-            if message[0] == cfg.index:
-                response_field_cnt = message[1]
-                response_field_indexes = message[2 : 2 + response_field_cnt]
-                response_data = message[2 + response_field_cnt :]
-                while response_data:
-                    device_data_record = {}
-
-                    for response_field_index in response_field_indexes:
-                        response_field = next(
-                            (f for f in cfg.fields if f.index == response_field_index),
-                            None,
-                        )
-                        if response_field:
-                            field_size = response_data[0]
-                            if response_field.type == "i":
-                                device_data_record[
-                                    response_field.name
-                                ] = int.from_bytes(
-                                    response_data[1 : 1 + field_size], "little"
-                                )
-                            elif response_field.type == "s":
-                                device_data_record[response_field.name] = response_data[
-                                    1 : 1 + field_size
-                                ].decode(encoding="ascii", errors="ignore")
-                            else:
-                                ValueError(
-                                    "Unsupported type %s for field %s"
-                                    % (response_field.type, response_field.name)
-                                )
-
-                            response_data = response_data[1 + field_size :]
-                        else:
-                            raise ValueError(
-                                "Unknown field index returned by panel: %d"
-                                % response_field_index
-                            )
-
-                    device_data.append(device_data_record)
-            else:
-                raise ValueError(
-                    "Wrong table returned by panel. Expected %d, received %d"
-                    % (cfg.index, message[0])
-                )
         else:
             raise ValueError(
                 "Table '%s' is not available, use one of: %s"
                 % (table_name, ",".join([cfg.name for cfg in data_cfg]))
             )
 
+        return cfg, parameters
+
+    @classmethod
+    def _iter_device_data(
+        cls, cfg: _DataTableCfg, message: [bytes, memoryview]
+    ) -> Iterator[dict]:
+        """Decode the records in a GETDATA reply one by one, walking the reply with a single offset."""
+        message = memoryview(message)
+
+        if len(message) < 2 or len(message) < 2 + message[1]:
+            raise ValueError(
+                "Incomplete data table header received (%d bytes)" % len(message)
+            )
+        if message[0] != cfg.index:
+            raise ValueError(
+                "Wrong table returned by panel. Expected %d, received %d"
+                % (cfg.index, message[0])
+            )
+
+        fields_by_index = cfg.fields_by_index()
+        response_field_cnt = message[1]
+        response_fields = []
+        for response_field_index in message[2 : 2 + response_field_cnt]:
+            response_field = fields_by_index.get(response_field_index)
+            if response_field is None:
+                raise ValueError(
+                    "Unknown field index returned by panel: %d" % response_field_index
+                )
+            response_fields.append((response_field.name, response_field.type))
+
+        offset = 2 + response_field_cnt
+        message_end = len(message)
+        while offset < message_end:
+            device_data_record = {}
+
+            for field_name, field_type in response_fields:
+                if offset >= message_end:
+                    raise ValueError(
+                        "Field %s is missing from the received data (%d bytes)"
+                        % (field_name, message_end)
+                    )
+                field_size = message[offset]
+                field_end = offset + 1 + field_size
+                if field_end > message_end:
+                    raise ValueError(
+                        "Field %s exceeds the received data (%d > %d)"
+                        % (field_name, field_end, message_end)
+                    )
+                field_value = message[offset + 1 : field_end]
+                if field_type == "i":
+                    device_data_record[field_name] = int.from_bytes(
+                        field_value, "little"
+                    )
+                elif field_type == "s":
+                    device_data_record[field_name] = str(
+                        field_value, encoding="ascii", errors="ignore"
+                    )
+                else:
+                    # Binary fields (like fingerprint templates) are returned as is
+                    device_data_record[field_name] = bytes(field_value)
+                offset = field_end
+
+            yield device_data_record
+
+    @classmethod
+    def _parse_device_data(
+        cls,
+        cfg: _DataTableCfg,
+        message: [bytes, memoryview],
+        columnar: bool = False,
+        field_names: Optional[list[str]] = None,
+    ) -> list[dict] | dict[str, list]:
+        if columnar:
+            # A list per requested field, also when the table is empty
+            device_data = {
+                name: [] for name in field_names or [f.name for f in cfg.fields]
+            }
+            for device_data_record in cls._iter_device_data(cfg, message):
+                for name, value in device_data_record.items():
+                    device_data.setdefault(name, []).append(value)
+        else:
+            device_data = list(cls._iter_device_data(cfg, message))
+
         return device_data
 
+    def iter_device_data(
+        self, table_name: str, field_names: Optional[list[str]] = None
+    ) -> Iterator[dict]:
+        """Retrieve the records of a device data table, decoding them one by one."""
+        with self._lock:
+            data_cfg = self._get_device_data_cfg()
+            cfg, parameters = self._get_device_data_request(
+                data_cfg, table_name, field_names
+            )
+            message, _ = self._send_receive(consts.Command.GETDATA, parameters)
+            # Copy the reply, the receive buffer may be reused while the generator is consumed
+            message = bytes(message)
+        yield from self._iter_device_data(cfg, message)
+
+    @_synchronized
+    def get_device_data(
+        self,
+        table_name: str,
+        field_names: Optional[list[str]] = None,
+        columnar: bool = False,
+    ) -> list[dict] | dict[str, list]:
+        """Retrieve all records of a device data table.
+        The records are returned as a list of dictionaries, or when columnar is set,
+        as a dictionary with a list of values per field."""
+        data_cfg = self._get_device_data_cfg()
+        cfg, parameters = self._get_device_data_request(
+            data_cfg, table_name, field_names
+        )
+        message, _ = self._send_receive(consts.Command.GETDATA, parameters)
+
+        return self._parse_device_data(cfg, message, columnar, field_names)
+
+    @classmethod
+    def _get_delete_device_data_request(
+        cls, cfg: _DataTableCfg, conditions: list[dict]
+    ) -> bytes:
+        """Return the DELETEDATA parameters to delete the records matching the conditions.
+
+        The parameters consist of the index of the table, followed by the conditions as text.
+        Like the filter of the DeleteDeviceData function of the PullSDK, the conditions of one record
+        are tab separated key=value pairs, multiple records are separated by a carriage return and newline.
+        """
+        data_fields = [f.name for f in cfg.fields]
+        condition_lines = []
+        for condition in conditions:
+            invalid_fields = [f for f in condition if f not in data_fields]
+            if invalid_fields:
+                raise ValueError(
+                    "Not all fields are available (%s), choose from %s"
+                    % (",".join(invalid_fields), ",".join(data_fields))
+                )
+            condition_lines.append(
+                "\t".join("{0}={1}".format(k, v) for k, v in condition.items())
+            )
+
+        return bytes([cfg.index]) + "\r\n".join(condition_lines).encode(
+            encoding="ascii", errors="ignore"
+        )
+
+    @_synchronized
+    def delete_device_data(self, table_name: str, conditions: list[dict]):
+        """Delete the records of a device data table that match one of the conditions.
+        A condition is a dictionary with field names and values, all fields must match.
+        An empty condition matches all records of the table."""
+        data_cfg = self._get_device_data_cfg()
+        cfg, _ = self._get_device_data_request(data_cfg, table_name)
+        self._send_receive(
+            consts.Command.DELETEDATA,
+            self._get_delete_device_data_request(cfg, conditions),
+        )
+
     def _update_inout_status(self, logs: list[rtlog.RTLogRecord]):
         for log in logs:
             if isinstance(log, rtlog.DoorAlarmStatusRecord):
@@ -709,6 +1256,13 @@ class C3:
                         lock_nr, log.door_sensor_status(lock_nr), auto_close=False
                     )
 
+            elif (
+                isinstance(log, rtlog.EventRecord)
+                and log.event_type == consts.EventType.DEVICE_START
+            ):
+                # The configuration may have changed while the panel was down
+                self._refresh_door_settings()
+
             elif isinstance(log, rtlog.EventRecord) and log.port_nr - 1 in range(
                 self.nr_of_locks
             ):
@@ -854,40 +1408,59 @@ class C3:
                             auto_close=lock_drive_time,
                         )
 
-    def get_rt_log(self) -> list[rtlog.EventRecord | rtlog.DoorAlarmStatusRecord]:
-        """Retrieve the latest event or alarm records."""
+    @classmethod
+    def _parse_rt_log(
+        cls, rtlog_command: consts.Command, message: bytes, message_length: int
+    ) -> Optional[list[rtlog.EventRecord | rtlog.DoorAlarmStatusRecord]]:
+        """Decode the RT log records in a reply.
+        Returns None when the reply shows that the panel does not support the used RT log command.
+        """
         records = []
 
-        if self.is_connected():
-            message, message_length = self._send_receive(self._rtlog_command)
-            if message_length:
-                if self._rtlog_command == consts.Command.RTLOG_BINARY:
-                    # One RT log is 16 bytes
-                    # Ensure the array is not empty and a multiple of 16
-                    if message_length % 16 == 0:
-                        logs_messages = [
-                            message[i : i + 16] for i in range(0, message_length, 16)
-                        ]
-                        for log_message in logs_messages:
-                            self.log.debug(
-                                "Received RT binary log: %s", log_message.hex()
+        if message_length:
+            if rtlog_command == consts.Command.RTLOG_BINARY:
+                # One RT log is 16 bytes
+                # Ensure the array is not empty and a multiple of 16
+                if message_length % 16 == 0:
+                    records = [
+                        rtlog.factory(message[i : i + 16])
+                        for i in range(0, message_length, 16)
+                    ]
+                    if cls.log.isEnabledFor(logging.DEBUG):
+                        for i in range(0, message_length, 16):
+                            cls.log.debug(
+                                "Received RT binary log: %s", message[i : i + 16].hex()
                             )
-                            records.append(rtlog.factory(log_message))
-                    else:
-                        # The panel firmware does not support binary mode
-                        self.log.debug("Transition RT log mode to key/value")
-                        self._rtlog_command = consts.Command.RTLOG_KEYVALUE
-                elif self._rtlog_command == consts.Command.RTLOG_KEYVALUE:
-                    kv_pairs = self._parse_kv_from_message(message)
-                    self.log.debug(
-                        "Received RT k/v log (%d): %s", len(kv_pairs), kv_pairs
-                    )
-                    if len(kv_pairs) > 0:
-                        records.append(rtlog.factory(kv_pairs))
                 else:
-                    raise NotImplementedError(
-                        f"The requested RT log command {self._rtlog_command} is not supported"
+                    # The panel firmware does not support binary mode
+                    records = None
+            elif rtlog_command == consts.Command.RTLOG_KEYVALUE:
+                # A reply contains a record per line
+                records = rtlog.decode_kv_batch(message)
+                if cls.log.isEnabledFor(logging.DEBUG):
+                    cls.log.debug(
+                        "Received RT k/v log (%d records): %s",
+                        len(records),
+                        bytes(message),
                     )
+            else:
+                raise NotImplementedError(
+                    f"The requested RT log command {rtlog_command} is not supported"
+                )
+
+        return records
+
+    @_synchronized
+    def get_rt_log(self) -> list[rtlog.EventRecord | rtlog.DoorAlarmStatusRecord]:
+        """Retrieve the latest event or alarm records."""
+        if self.is_connected():
+            message, message_length = self._send_receive(self._rtlog_command)
+            records = self._parse_rt_log(self._rtlog_command, message, message_length)
+            if records is None:
+                self.log.debug("Transition RT log mode to key/value")
+                self._rtlog_command = consts.Command.RTLOG_KEYVALUE
+                self._save_capabilities()
+                records = []
         else:
             raise ConnectionError("No connection to C3 panel.")
 
@@ -907,10 +1480,46 @@ class C3:
         ):
             self._status.lock_status[door_nr] = status
 
-        if status == consts.InOutStatus.OPEN and ((auto_close or 0) > 0):
-            threading.Timer(
-                auto_close, self._set_lock_status, [door_nr, consts.InOutStatus.CLOSED]
-            ).start()
+            # A newer open event reschedules a pending automatic close, a close event cancels it
+            if status == consts.InOutStatus.OPEN and ((auto_close or 0) > 0):
+                self._schedule_auto_close(
+                    ("lock", door_nr), auto_close, self._auto_close_lock, door_nr
+                )
+            elif status != consts.InOutStatus.OPEN:
+                self._schedule_auto_close(
+                    ("lock", door_nr), None, self._auto_close_lock, door_nr
+                )
+
+    def _schedule_auto_close(
+        self, timer_key: tuple, delay: Optional[int], callback, output_nr: int
+    ) -> None:
+        """Cancel the pending automatic close timer for an output, and schedule a new one when a delay is given.
+        Called while holding the lock."""
+        timer = self._auto_close_timers.pop(timer_key, None)
+        if timer:
+            timer.cancel()
+        if delay is not None:
+            # The token identifies this timer, when it fires after it was replaced by a newer one
+            self._auto_close_timers[timer_key] = self.timer_scheduler.call_later(
+                delay,
+                self.worker.submit,
+                self._auto_close,
+                timer_key,
+                object(),
+                callback,
+                output_nr,
+            )
+
+    @_synchronized
+    def _auto_close(self, timer_key: tuple, token: object, callback, output_nr: int):
+        """Run the callback of an automatic close timer, unless the timer was cancelled or
+        rescheduled by an event that arrived after it fired. Runs on the worker, as it waits for the lock.
+        """
+        timer = self._auto_close_timers.get(timer_key)
+        # The arguments of the timer are those of worker.submit
+        if timer is not None and timer.args[2] is token:
+            del self._auto_close_timers[timer_key]
+            callback(output_nr)
 
     def _auto_close_lock(self, door_nr: int) -> None:
         """Set the specified door lock to closed.
@@ -943,12 +1552,15 @@ class C3:
         ):
             self._status.aux_out_status[aux_nr] = status
 
-        if status == consts.InOutStatus.OPEN and ((auto_close or 0) > 0):
-            threading.Timer(
-                auto_close,
-                self._set_aux_out_status,
-                [aux_nr, consts.InOutStatus.CLOSED],
-            ).start()
+            # A newer open event reschedules a pending automatic close, a close event cancels it
+            if status == consts.InOutStatus.OPEN and ((auto_close or 0) > 0):
+                self._schedule_auto_close(
+                    ("aux_out", aux_nr), auto_close, self._auto_close_aux_out, aux_nr
+                )
+            elif status != consts.InOutStatus.OPEN:
+                self._schedule_auto_close(
+                    ("aux_out", aux_nr), None, self._auto_close_aux_out, aux_nr
+                )
 
     def _auto_close_aux_out(self, aux_nr: int) -> None:
         """Set the specified auxiliary output to closed.
@@ -958,6 +1570,7 @@ class C3:
         """
         self._status.aux_out_status[aux_nr] = consts.InOutStatus.CLOSED
 
+    @_synchronized
     def control_device(self, command: controldevice.ControlDeviceBase):
         """Send a control command to the panel."""
         if self.is_connected():
@@ -973,46 +1586,34 @@ class C3:
                         and self.door_settings(command.output_number).sensor_type
                         == consts.DoorSensorType.NONE
                     ):
-                        threading.Timer(
+                        self._schedule_auto_close(
+                            ("lock", command.output_number),
                             command.duration,
                             self._auto_close_lock,
-                            [command.output_number],
-                        ).start()
+                            command.output_number,
+                        )
                     if command.address == consts.ControlOutputAddress.AUX_OUTPUT:
-                        threading.Timer(
+                        self._schedule_auto_close(
+                            ("aux_out", command.output_number),
                             command.duration,
                             self._auto_close_aux_out,
-                            [command.output_number],
-                        ).start()
+                            command.output_number,
+                        )
         else:
             raise ConnectionError("No connection to C3 panel.")
 
+    @_synchronized
     def door_settings(self, door_nr: int) -> C3DoorSettings:
         """Returns the settings of the door as configured on the panel"""
         if door_nr in self._status.door_settings:
             return self._status.door_settings[door_nr]
         elif not self._status.door_settings:
-            for door_idx in range(self._status.nr_of_locks):
-                door_prefix = f"Door{door_idx+1}"
-                param_values = self.get_device_param(
-                    [
-                        door_prefix + p
-                        for p in ["SensorType", "Drivertime", "Detectortime"]
-                    ]
-                )
-                if param_values:
-                    self._status.door_settings[door_idx + 1] = C3DoorSettings(
-                        sensor_type=consts.DoorSensorType(
-                            int(param_values.get(door_prefix + "SensorType"))
-                        ),
-                        lock_drive_time=int(
-                            param_values.get(door_prefix + "Drivertime")
-                        ),
-                        door_alarm_timeout=int(
-                            param_values.get(door_prefix + "Detectortime")
-                        ),
-                    )
-
+            self._apply_door_settings(
+                self._status,
+                self.get_device_param(
+                    self._door_settings_parameters[: 3 * self._status.nr_of_locks]
+                ),
+            )
             return self._status.door_settings[door_nr]
         else:
             raise ValueError(
@@ -1021,6 +1622,35 @@ class C3:
                 self._status.nr_of_locks,
             )
 
+    def _refresh_door_settings(self):
+        """Retrieve the door settings again, in the background, for instance after the panel restarted.
+        A refresh that is pending already is not scheduled again."""
+        with self._lock:
+            if self._door_settings_refresh is None:
+                # On the worker, the request would hold up the timers of all panels
+                self._door_settings_refresh = self.worker.submit(
+                    self._refresh_door_settings_now
+                )
+
+    def _refresh_door_settings_now(self):
+        with self._lock:
+            self._door_settings_refresh = None
+            try:
+                params = self.get_device_param(
+                    self._door_settings_parameters[: 3 * self._status.nr_of_locks],
+                    refresh=True,
+                )
+            except (ConnectionError, ValueError, OSError) as ex:
+                self.log.error(
+                    "Retrieving door settings from %s failed: %s",
+                    self._device_info.host,
+                    ex,
+                )
+                return
+            self._apply_door_settings(self._status, params)
+            self._initialize_values = {**self._initialize_values, **params}
+            self._save_capabilities()
+
     def lock_status(self, door_nr: int) -> consts.InOutStatus:
         """Returns the (cached) door open/close status.
         Requires a preceding call to get_rt_log to update to the latest status."""
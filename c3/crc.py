@@ -34,19 +34,57 @@ class Crc16Builder:
         return self._crc & 0xFFFF
 
 
+# The divisor only depends on the lower 8 bits of (crc ^ data), so it is calculated once for all 256 values.
+CRC16_TABLE = tuple(Crc16Builder._calc_divisor(i) for i in range(256))
+
+
+class Crc16:
+    """Table driven CRC-16 engine that processes complete buffers in one call.
+
+    The engine is incremental: update() can be called for consecutive chunks of a message,
+    the result is the same as calculating the CRC over the concatenated chunks.
+    """
+
+    __slots__ = ("_crc",)
+
+    def __init__(self, crc: int = None):
+        self._crc = (crc or CRC_START_16) & 0xFFFF
+
+    def update(self, data: [bytes, bytearray, memoryview]) -> "Crc16":
+        crc = self._crc
+        table = CRC16_TABLE
+        if isinstance(data, memoryview) and data.format != "B":
+            data = data.cast("B")
+        for byte in data:
+            crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+        self._crc = crc
+        return self
+
+    def copy(self) -> "Crc16":
+        return Crc16(self._crc)
+
+    @property
+    def crc(self) -> int:
+        return self._crc
+
+
+def crc16_buffer(data: [bytes, bytearray, memoryview], crc: int = None) -> int:
+    """Calculate the CRC-16 of a bytes-like object, optionally continuing from a previous crc value."""
+    return Crc16(crc).update(data).crc
+
+
 def crc16(data, crc=None):
-    builder = Crc16Builder(crc)
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return crc16_buffer(data, crc)
+
+    builder = Crc16(crc)
 
     if hasattr(data, "__iter__"):
         for byte in data:
             if isinstance(byte, int):
-                builder.add_byte(byte)
+                builder.update((byte & 0xFF,))
             elif isinstance(byte, str):
-                if len(byte) == 1:
-                    builder.add_byte(ord(byte))
-                else:
-                    for char in byte:
-                        builder.add_byte(ord(char))
+                builder.update([ord(char) & 0xFF for char in byte])
             else:
                 raise TypeError("Data of type %s is not supported" % type(byte))
     else:
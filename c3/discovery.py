@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import ipaddress
+import json
+import logging
+import os
+import selectors
+import socket
+import threading
+import time
+from dataclasses import asdict, dataclass, field, replace
+from typing import Iterable, Iterator, Optional
+
+from c3 import cache, consts
+from c3.core import C3, C3DeviceInfo
+
+log = logging.getLogger("C3")
+
+# Number of unicast requests sent before checking for replies, so replies do not overflow the receive buffer
+SWEEP_BATCH_SIZE = 64
+
+
+def local_addresses() -> list[str]:
+    """The IPv4 addresses of the local network interfaces."""
+    interfaces = socket.getaddrinfo(
+        host=socket.gethostname(), port=None, family=socket.AF_INET
+    )
+    # The same address is returned for every socket type
+    return list(dict.fromkeys(ip[-1][0] for ip in interfaces))
+
+
+def parse_discovery_reply(payload: bytes) -> Optional[C3DeviceInfo]:
+    """The device information in a discovery reply, None when the reply is not valid."""
+    try:
+        received_command, data_size, _ = C3._get_message_header(payload)
+        if received_command != consts.C3_REPLY_OK:
+            return None
+        message = C3._get_message(payload)
+    except ValueError as ex:
+        log.debug("Invalid discovery reply: %s", ex)
+        return None
+
+    if len(message) != data_size:
+        log.debug(
+            "Length of discovery reply (%d) does not match specified size (%d)",
+            len(message),
+            data_size,
+        )
+        return None
+
+    data = C3._parse_kv_from_message(message)
+    return C3DeviceInfo(
+        host=data.get("IP"),
+        mac=data.get("MAC"),
+        serial_number=data.get("SN"),
+        device_name=data.get("Device"),
+        firmware_version=data.get("Ver"),
+    )
+
+
+def _open_socket(address: Optional[str], broadcast: bool) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+    if broadcast:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+    sock.bind((address or "", 0))
+    sock.setblocking(False)
+    return sock
+
+
+def iter_discover(
+    interface_addresses: Optional[Iterable[str]] = None,
+    subnets: Optional[Iterable[str]] = None,
+    timeout: float = 2,
+    port: int = consts.C3_PORT_BROADCAST,
+) -> Iterator[C3DeviceInfo]:
+    """Scan for C3 panels and yield each panel as soon as its reply is received.
+
+    A discovery request is broadcast on all local interfaces (or on the provided interface addresses)
+    at once. Panels in routed segments, which are not reached by a broadcast, are found by sending the
+    request to every host address of the provided subnets (e.g. "10.1.2.0/24").
+    Replies are received until no reply arrived for timeout seconds after the last request was sent.
+    A panel that replies on multiple interfaces is yielded once.
+    """
+    message = C3._construct_message(
+        None, None, consts.Command.DISCOVER, consts.C3_DISCOVERY_MESSAGE
+    )
+    if interface_addresses is None:
+        interface_addresses = local_addresses()
+    hosts = (
+        str(host)
+        for subnet in subnets or []
+        for host in ipaddress.ip_network(subnet, strict=False).hosts()
+    )
+
+    selector = selectors.DefaultSelector()
+    seen = set()
+    try:
+        for address in interface_addresses:
+            log.debug("Discover on %s", address)
+            try:
+                sock = _open_socket(address, broadcast=True)
+                sock.sendto(message, ("255.255.255.255", port))
+            except OSError as ex:
+                log.error("Discovery on %s failed: %s", address, ex)
+                continue
+            selector.register(sock, selectors.EVENT_READ)
+
+        sweep_sock = None
+        if subnets:
+            sweep_sock = _open_socket(None, broadcast=False)
+            selector.register(sweep_sock, selectors.EVENT_READ)
+
+        deadline = time.monotonic() + timeout
+        while selector.get_map():
+            if sweep_sock is not None:
+                sent = 0
+                for host in hosts:
+                    try:
+                        sweep_sock.sendto(message, (host, port))
+                    except OSError as ex:
+                        log.debug("Discovery of %s failed: %s", host, ex)
+                    sent += 1
+                    if sent == SWEEP_BATCH_SIZE:
+                        break
+                if sent:
+                    deadline = time.monotonic() + timeout
+                    select_timeout = 0
+                else:
+                    sweep_sock = None
+                    select_timeout = deadline - time.monotonic()
+            else:
+                select_timeout = deadline - time.monotonic()
+                if select_timeout <= 0:
+                    break
+
+            for key, _ in selector.select(select_timeout):
+                try:
+                    payload = key.fileobj.recv(64 * 1024)
+                except OSError:
+                    continue
+                device = parse_discovery_reply(payload)
+                if device is not None:
+                    identity = device.mac or device.serial_number or device.host
+                    if identity not in seen:
+                        seen.add(identity)
+                        yield device
+    finally:
+        for key in list(selector.get_map().values()):
+            key.fileobj.close()
+        selector.close()
+
+
+def discover(
+    interface_addresses: Optional[Iterable[str]] = None,
+    subnets: Optional[Iterable[str]] = None,
+    timeout: float = 2,
+    port: int = consts.C3_PORT_BROADCAST,
+) -> list[C3DeviceInfo]:
+    """Scan for C3 panels, see iter_discover."""
+    return list(iter_discover(interface_addresses, subnets, timeout, port))
+
+
+@dataclass
+class DiscoveryDiff:
+    """The differences between a scan and the previous scans"""
+
+    added: list[C3DeviceInfo] = field(default_factory=list)
+    """Panels that were not found before"""
+    changed: list[tuple[C3DeviceInfo, C3DeviceInfo]] = field(default_factory=list)
+    """Panels of which the IP address or other information changed, as (previous, current)"""
+    missing: list[C3DeviceInfo] = field(default_factory=list)
+    """Panels that were found before, but not in this scan"""
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.missing)
+
+
+class DiscoveryCache:
+    """The panels found by previous scans, keyed by MAC address.
+
+    Updating the cache with the result of a scan returns the differences only, so a repeated scan
+    reports the panels that appeared, disappeared or got another IP address.
+    When a path is given, the cache is persisted as JSON file, to compare scans between runs.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self._path = path
+        self._lock = threading.Lock()
+        self._devices: dict[str, C3DeviceInfo] = {}
+        if path:
+            self.load()
+
+    @staticmethod
+    def key(device: C3DeviceInfo) -> str:
+        return (device.mac or device.serial_number or device.host).lower()
+
+    @property
+    def devices(self) -> list[C3DeviceInfo]:
+        with self._lock:
+            return list(self._devices.values())
+
+    def get(self, mac: str) -> Optional[C3DeviceInfo]:
+        with self._lock:
+            return self._devices.get(mac.lower())
+
+    def update(
+        self, devices: Iterable[C3DeviceInfo], complete: bool = True
+    ) -> DiscoveryDiff:
+        """Store the result of a scan and return the differences with the previous scans.
+        With complete unset, the scan covered part of the network, and no panels are reported missing.
+        """
+        diff = DiscoveryDiff()
+        with self._lock:
+            found = set()
+            for device in devices:
+                key = self.key(device)
+                found.add(key)
+                previous = self._devices.get(key)
+                if previous is None:
+                    diff.added.append(device)
+                elif replace(previous, port=device.port) != device:
+                    diff.changed.append((previous, device))
+                self._devices[key] = device
+
+            if complete:
+                for key in [key for key in self._devices if key not in found]:
+                    diff.missing.append(self._devices.pop(key))
+
+        if diff:
+            self.save()
+        return diff
+
+    def scan(self, **kwargs) -> DiscoveryDiff:
+        """Scan for panels (see iter_discover for the arguments) and update the cache."""
+        return self.update(iter_discover(**kwargs))
+
+    def load(self):
+        if self._path and os.path.exists(self._path):
+            try:
+                with open(self._path, "r", encoding="utf-8") as cache_file:
+                    entries = json.load(cache_file)
+                with self._lock:
+                    self._devices = {
+                        key: C3DeviceInfo(**value) for key, value in entries.items()
+                    }
+            except (OSError, ValueError, TypeError) as ex:
+                log.error("Loading discovery cache %s failed: %s", self._path, ex)
+
+    def save(self):
+        if self._path:
+            # Written while holding the lock, so an older state does not replace a newer one
+            with self._lock:
+                devices = {key: asdict(device) for key, device in self._devices.items()}
+                try:
+                    cache.write_json_atomic(self._path, devices)
+                except OSError as ex:
+                    log.error("Saving discovery cache %s failed: %s", self._path, ex)
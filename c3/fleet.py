@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+
+from c3 import rtlog
+from c3.aio import AsyncC3
+from c3.core import C3DeviceInfo
+from c3.polling import PollSchedule, PollStats, RTLogPoller
+
+
+@dataclass
+class C3FleetRecord:
+    """RT log record, tagged with the panel it originates from"""
+
+    serial_number: str
+    host: str
+    record: rtlog.EventRecord | rtlog.DoorAlarmStatusRecord
+
+
+class C3Fleet:
+    """Poll the RT log of multiple panels concurrently and merge the records in one stream.
+
+    Every panel is polled by its own task on the event loop, the number of panels that
+    is communicating at the same moment is bounded by max_concurrency.
+    A panel that fails is reconnected with an exponential backoff, without delaying the other panels.
+    The interval between the polls of a panel adapts to its activity (see PollSchedule), between
+    poll_interval and poll_interval_max.
+    """
+
+    log = logging.getLogger("C3")
+    poll_interval = 0.2
+    poll_interval_max = 5.0
+    reconnect_delay_min = 1.0
+    reconnect_delay_max = 60.0
+
+    def __init__(
+        self,
+        devices: list[C3DeviceInfo],
+        password: Optional[str] = None,
+        max_concurrency: int = 50,
+        queue_size: int = 10000,
+    ) -> None:
+        self._panels = [AsyncC3(device) for device in devices]
+        self._password = password
+        self._max_concurrency = max_concurrency
+        self._queue_size = queue_size
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: list[asyncio.Task] = []
+        self._schedules: dict[int, PollSchedule] = {}
+
+    @property
+    def panels(self) -> list[AsyncC3]:
+        return self._panels
+
+    @property
+    def poll_stats(self) -> dict[str, PollStats]:
+        """The polling metrics per panel host"""
+        return {
+            panel.host: self._schedules[id(panel)].stats
+            for panel in self._panels
+            if id(panel) in self._schedules
+        }
+
+    def is_running(self) -> bool:
+        return bool(self._tasks)
+
+    async def _connect(self, panel: AsyncC3) -> bool:
+        async with self._semaphore:
+            return await panel.connect(self._password)
+
+    async def _poll(self, panel: AsyncC3) -> list:
+        async with self._semaphore:
+            return await panel.get_rt_log()
+
+    async def _run_panel(self, panel: AsyncC3):
+        failures = 0
+        schedule = self._schedules.setdefault(
+            id(panel), PollSchedule(self.poll_interval, self.poll_interval_max)
+        )
+
+        while True:
+            try:
+                if not panel.is_connected():
+                    if not await self._connect(panel):
+                        raise ConnectionError(f"Connection to {panel.host} failed")
+                    schedule.reset()
+
+                records = await self._poll(panel)
+                schedule.record_poll(RTLogPoller.count_events(records))
+                for record in records:
+                    await self._queue.put(
+                        C3FleetRecord(
+                            serial_number=panel.serial_number,
+                            host=panel.host,
+                            record=record,
+                        )
+                    )
+                failures = 0
+                await asyncio.sleep(schedule.delay())
+            except Exception as ex:
+                # An unexpected error is logged with its traceback, but does not stop polling the panel
+                expected = isinstance(ex, (ConnectionError, ValueError, OSError))
+                schedule.record_poll(0, error=True)
+                failures += 1
+                delay = min(
+                    self.reconnect_delay_max,
+                    self.reconnect_delay_min * 2 ** (failures - 1),
+                )
+                # Spread the reconnects of panels that failed at the same moment
+                delay = delay * random.uniform(0.8, 1.0)
+                self.log.error(
+                    "Polling %s failed (%d times), retrying in %.1fs: %s",
+                    panel.host,
+                    failures,
+                    delay,
+                    ex,
+                    exc_info=not expected,
+                )
+                await panel.disconnect()
+                await asyncio.sleep(delay)
+
+    def start(self):
+        """Start polling all panels, must be called from within the event loop."""
+        if not self._tasks:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+            self._queue = asyncio.Queue(self._queue_size)
+            self._tasks = [
+                asyncio.ensure_future(self._run_panel(panel)) for panel in self._panels
+            ]
+
+    async def stop(self):
+        """Stop polling and disconnect from all panels."""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await asyncio.gather(
+            *[panel.disconnect() for panel in self._panels], return_exceptions=True
+        )
+
+    async def records(self) -> AsyncIterator[C3FleetRecord]:
+        """The merged stream of RT log records of all panels, in order of arrival.
+
+        The stream ends when the fleet is stopped, after the records received until then.
+        """
+        self.start()
+        queue, tasks = self._queue, self._tasks
+        while True:
+            if not queue.empty():
+                yield queue.get_nowait()
+                continue
+            if not self._tasks or all(task.done() for task in tasks):
+                return
+
+            getter = asyncio.ensure_future(queue.get())
+            try:
+                done, _ = await asyncio.wait(
+                    [getter, *tasks], return_when=asyncio.FIRST_COMPLETED
+                )
+            finally:
+                getter.cancel()
+            if getter in done:
+                yield getter.result()
+
+    async def __aenter__(self) -> C3Fleet:
+        self.start()
+        return self
+
+    async def __aexit__(self, *_):
+        await self.stop()
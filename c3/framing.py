@@ -0,0 +1,321 @@
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass
+from typing import Optional
+
+from c3 import consts, crc, utils
+
+# Start, version, command and 2 bytes length
+C3_HEADER_SIZE = 5
+# 2 bytes checksum and end marker
+C3_TRAILER_SIZE = 3
+C3_MAX_FRAME_SIZE = C3_HEADER_SIZE + 0xFFFF + C3_TRAILER_SIZE
+# The buffers start at this size and grow up to their maximum size when a larger frame is handled
+_INITIAL_BUFFER_SIZE = 1024
+
+
+# Start, version, command and length
+_HEADER = struct.Struct("<BBBH")
+_SESSION_ID = struct.Struct("<H")
+_REQUEST_NR = struct.Struct("<H")
+# Checksum and end marker
+_TRAILER = struct.Struct("<HB")
+
+# (command, session id, data size) -> (header bytes, checksum of the header without start marker)
+_templates: dict[tuple[int, Optional[int], int], tuple[bytes, int]] = {}
+_MAX_TEMPLATES = 256
+
+
+def payload_bytes(data) -> [bytes, bytearray, memoryview]:
+    """Return the request data as bytes-like object; data is bytes-like, a str or a sequence of ints and characters."""
+    if data is None:
+        return b""
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return data
+    if isinstance(data, str):
+        return data.encode("latin-1")
+
+    payload = bytearray()
+    for byte in data:
+        if isinstance(byte, int):
+            payload.append(byte)
+        elif isinstance(byte, str):
+            payload.append(ord(byte))
+        else:
+            raise TypeError(
+                "Data does not contain int or str: %s is %s" % (str(byte), type(byte))
+            )
+    return payload
+
+
+def _template(command: int, session_id: Optional[int], data_size: int):
+    key = (command, session_id, data_size)
+    template = _templates.get(key)
+    if template is None:
+        header = _HEADER.pack(
+            consts.C3_MESSAGE_START, consts.C3_PROTOCOL_VERSION, command, data_size
+        )
+        if session_id is not None:
+            header += _SESSION_ID.pack(session_id & 0xFFFF)
+        template = (header, crc.crc16_buffer(memoryview(header)[1:]))
+        if len(_templates) >= _MAX_TEMPLATES:
+            _templates.clear()
+        _templates[key] = template
+    return template
+
+
+def frame_size(session_id: Optional[int], data: [bytes, bytearray, memoryview]) -> int:
+    """The size of the frame for a request with the given session and payload."""
+    return C3_HEADER_SIZE + (4 if session_id else 0) + len(data) + C3_TRAILER_SIZE
+
+
+def encode_into(
+    buffer: [bytearray, memoryview],
+    session_id: Optional[int],
+    request_nr: Optional[int],
+    command: int,
+    data: [bytes, bytearray, memoryview] = b"",
+) -> int:
+    """Write a request frame in the buffer and return its size.
+
+    The header and its checksum are taken from a template per command, session and data size,
+    so only the request number and the data are processed per frame.
+    """
+    if session_id:
+        header, checksum = _template(command or 0x00, session_id, len(data) + 4)
+    else:
+        header, checksum = _template(command or 0x00, None, len(data))
+
+    view = memoryview(buffer)
+    offset = len(header)
+    view[:offset] = header
+    if session_id:
+        _REQUEST_NR.pack_into(view, offset, (request_nr or 0) & 0xFFFF)
+        offset += _REQUEST_NR.size
+    view[offset : offset + len(data)] = data
+    offset += len(data)
+
+    checksum = crc.crc16_buffer(view[len(header) : offset], checksum)
+    _TRAILER.pack_into(view, offset, checksum, consts.C3_MESSAGE_END)
+    return offset + _TRAILER.size
+
+
+def encode_frame(
+    session_id: Optional[int], request_nr: Optional[int], command: int, data=None
+) -> bytearray:
+    """Return a new request frame, for a session when session_id is set."""
+    data = payload_bytes(data)
+    frame = bytearray(frame_size(session_id, data))
+    encode_into(frame, session_id, request_nr, command, data)
+    return frame
+
+
+class FrameEncoder:
+    """Encoder that writes request frames in a reusable buffer.
+
+    The frame returned by encode() is a view on the buffer, it remains valid until the next
+    call of encode(); copy it when it needs to be retained.
+    The buffer starts small and grows to at most buffer_size bytes.
+    """
+
+    def __init__(self, buffer_size: int = C3_MAX_FRAME_SIZE):
+        self._max_size = buffer_size
+        self._buffer = bytearray(min(buffer_size, _INITIAL_BUFFER_SIZE))
+        self._view = memoryview(self._buffer)
+
+    def encode(
+        self,
+        session_id: Optional[int],
+        request_nr: Optional[int],
+        command: int,
+        data=None,
+    ) -> memoryview:
+        data = payload_bytes(data)
+        size = frame_size(session_id, data)
+        if size > len(self._buffer):
+            if size > self._max_size:
+                raise ValueError(
+                    f"Send buffer too small for {size} bytes ({self._max_size})"
+                )
+            # A new buffer, frames returned before remain valid
+            self._buffer = bytearray(
+                min(self._max_size, max(size, 2 * len(self._buffer)))
+            )
+            self._view = memoryview(self._buffer)
+        encode_into(self._view, session_id, request_nr, command, data)
+        return self._view[:size]
+
+
+@dataclass
+class Frame:
+    """A received C3 message, the payload excludes the header and checksum"""
+
+    command: int
+    version: int
+    payload: memoryview
+
+
+def parse_header(data: [bytes, bytearray, memoryview]) -> tuple[int, int, int]:
+    """Return the command, the data size and the protocol version from a message header."""
+    if len(data) >= C3_HEADER_SIZE:
+        version = data[1]
+        if data[0] == consts.C3_MESSAGE_START:
+            command = data[2]
+            data_size = data[3] + (data[4] * 256)
+        else:
+            raise ValueError("Received reply does not start with start token")
+    else:
+        raise ValueError(f"Received reply of insufficient length {len(data)}")
+
+    return command, data_size, version
+
+
+def check_frame(data: [bytes, bytearray, memoryview]) -> memoryview:
+    """Validate the end marker and checksum of a complete message and return a view on its payload."""
+    data = memoryview(data)
+    if data[-1] == consts.C3_MESSAGE_END:
+        # Get the message payload, without start, crc and end bytes
+        checksum = crc.crc16_buffer(data[1:-3])
+
+        if utils.lsb(checksum) == data[-3] or utils.msb(checksum) == data[-2]:
+            # Return all data without header (leading) and crc (trailing)
+            message = data[C3_HEADER_SIZE:-C3_TRAILER_SIZE]
+        else:
+            raise ValueError(
+                "Payload checksum is invalid: %02x%02x expected %02x%02x"
+                % (data[-3], data[-2], utils.lsb(checksum), utils.msb(checksum))
+            )
+    else:
+        raise ValueError(
+            "Payload does not include message end marker (%02x)" % data[-1]
+        )
+
+    return message
+
+
+class FrameDecoder:
+    """Incremental decoder that assembles C3 messages from a byte stream.
+
+    Received data is stored in a preallocated buffer, either by feeding chunks with feed(),
+    or by letting a socket write directly in the buffer with write_buffer() and commit():
+        sock.recv_into(decoder.write_buffer(n), n)
+
+    The payload of a decoded Frame is a view on the internal buffer. It remains valid until
+    new data is written to the decoder; copy it when it needs to be retained.
+    The buffer starts small and grows to at most buffer_size bytes.
+    """
+
+    def __init__(self, buffer_size: int = C3_MAX_FRAME_SIZE):
+        self._max_size = buffer_size
+        self._buffer = bytearray(min(buffer_size, _INITIAL_BUFFER_SIZE))
+        self._view = memoryview(self._buffer)
+        # Start of the first data that is not decoded yet
+        self._start = 0
+        # End of the received data
+        self._end = 0
+
+    def reset(self):
+        """Discard all buffered data."""
+        self._start = 0
+        self._end = 0
+
+    @property
+    def buffered(self) -> int:
+        """The number of received bytes that are not decoded yet."""
+        return self._end - self._start
+
+    def bytes_needed(self) -> int:
+        """The number of bytes that is required to complete the next message."""
+        buffered = self.buffered
+        if buffered < C3_HEADER_SIZE:
+            return C3_HEADER_SIZE - buffered
+
+        try:
+            _, data_size, _ = parse_header(
+                self._view[self._start : self._start + C3_HEADER_SIZE]
+            )
+        except ValueError:
+            self.reset()
+            raise
+        return max(0, C3_HEADER_SIZE + data_size + C3_TRAILER_SIZE - buffered)
+
+    def write_buffer(self, size: int) -> memoryview:
+        """Return a writable view on the buffer for at most size bytes of new data."""
+        if self._end + size > len(self._buffer):
+            pending = self.buffered
+            if pending + size > self._max_size:
+                raise ValueError(
+                    f"Receive buffer too small for {pending + size} bytes ({self._max_size})"
+                )
+            if pending + size > len(self._buffer):
+                # Move the pending data to the front of a larger buffer
+                buffer = bytearray(
+                    min(self._max_size, max(pending + size, 2 * len(self._buffer)))
+                )
+                buffer[:pending] = self._view[self._start : self._end]
+                self._buffer = buffer
+                self._view = memoryview(buffer)
+            else:
+                # Move the pending data to the front of the buffer
+                self._view[:pending] = self._view[self._start : self._end]
+            self._start = 0
+            self._end = pending
+
+        return self._view[self._end : self._end + size]
+
+    def commit(self, size: int):
+        """Register size bytes as received, after these were written in the view returned by write_buffer()."""
+        self._end += size
+
+    def next_frame(self) -> Optional[Frame]:
+        """Return the next complete message, or None when more data is needed."""
+        if self.buffered < C3_HEADER_SIZE or self.bytes_needed() > 0:
+            return None
+
+        start = self._start
+        command, data_size, version = parse_header(
+            self._view[start : start + C3_HEADER_SIZE]
+        )
+        frame_size = C3_HEADER_SIZE + data_size + C3_TRAILER_SIZE
+        try:
+            if data_size > 0:
+                payload = check_frame(self._view[start : start + frame_size])
+            else:
+                # Empty replies are accepted as is, some firmwares do not send a valid checksum for these
+                payload = self._view[start:start]
+        except ValueError:
+            # The stream cannot be trusted anymore
+            self.reset()
+            raise
+
+        self._start = start + frame_size
+        return Frame(command=command, version=version, payload=payload)
+
+    def feed(self, data: [bytes, bytearray, memoryview]) -> list[Frame]:
+        """Add received data and return all messages that are completed by it."""
+        frames = []
+        data = memoryview(data)
+
+        while data:
+            size = min(len(data), self._max_size - self.buffered)
+            if size == 0:
+                self.reset()
+                raise ValueError(
+                    f"Received message does not fit in receive buffer ({self._max_size})"
+                )
+            if frames and self._end + size > len(self._buffer):
+                # The buffer is about to be reused, detach the payload of already decoded frames
+                for frame in frames:
+                    frame.payload = memoryview(bytes(frame.payload))
+
+            self.write_buffer(size)[:] = data[:size]
+            self.commit(size)
+            data = data[size:]
+
+            frame = self.next_frame()
+            while frame:
+                frames.append(frame)
+                frame = self.next_frame()
+
+        return frames
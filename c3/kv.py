@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import re
+import sys
+
+# Key/value pairs are separated by a comma (parameters) or a tab (RT log, data table configuration),
+# records by a newline (\n or \r\n)
+_KV_PATTERN = re.compile(r"([\w~]+)=([^,\t\r\n]+)")
+_RECORD_SEPARATOR = "\n"
+
+
+def _decode(message: [bytes, bytearray, memoryview]) -> str:
+    # Decoding the whole message at once is much cheaper than decoding every key and value
+    return str(message, encoding="ascii", errors="ignore")
+
+
+def _to_dict(pairs: list[tuple[str, str]], intern: bool) -> dict[str, str]:
+    if intern:
+        return {sys.intern(key): value for key, value in pairs}
+    return dict(pairs)
+
+
+def parse_kv(
+    message: [bytes, bytearray, memoryview], intern: bool = False
+) -> dict[str, str]:
+    """Parse the key/value pairs of a message in one dictionary, a later value of a key replaces an earlier one.
+    With intern set, the keys are interned, which saves memory when the dictionaries are kept.
+    """
+    return _to_dict(_KV_PATTERN.findall(_decode(message)), intern)
+
+
+def parse_kv_records(
+    message: [bytes, bytearray, memoryview], intern: bool = False
+) -> list[dict[str, str]]:
+    """Parse the key/value pairs of a message with a record per line, empty records are skipped."""
+    return [
+        _to_dict(pairs, intern)
+        for pairs in map(_KV_PATTERN.findall, _decode(message).split(_RECORD_SEPARATOR))
+        if pairs
+    ]
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, replace
+
+
+@dataclass
+class LockStats:
+    """Contention metrics of a lock or pool"""
+
+    acquisitions: int = 0
+    """Number of times the lock was acquired"""
+    contended: int = 0
+    """Number of acquisitions that had to wait, because the lock was held by another thread"""
+    timeouts: int = 0
+    """Number of acquisitions that gave up waiting"""
+    wait_time: float = 0.0
+    """Total time waited for the lock, in seconds"""
+    max_wait_time: float = 0.0
+    """Longest time waited for the lock, in seconds"""
+
+    @property
+    def mean_wait_time(self) -> float:
+        """Average time waited per contended acquisition, in seconds"""
+        return self.wait_time / self.contended if self.contended else 0.0
+
+    def record(self, wait_time: float, contended: bool):
+        self.acquisitions += 1
+        if contended:
+            self.contended += 1
+            self.wait_time += wait_time
+            self.max_wait_time = max(self.max_wait_time, wait_time)
+
+
+class MeteredLock:
+    """Re-entrant lock that keeps track of contention and of the time waited for it."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._stats_lock = threading.Lock()
+        self._stats = LockStats()
+
+    @property
+    def stats(self) -> LockStats:
+        """A snapshot of the metrics"""
+        with self._stats_lock:
+            return replace(self._stats)
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        if self._lock.acquire(blocking=False):
+            wait_time, contended = 0.0, False
+        elif not blocking:
+            return False
+        else:
+            start = time.perf_counter()
+            if not self._lock.acquire(timeout=timeout):
+                with self._stats_lock:
+                    self._stats.timeouts += 1
+                return False
+            wait_time, contended = time.perf_counter() - start, True
+
+        with self._stats_lock:
+            self._stats.record(wait_time, contended)
+        return True
+
+    def release(self):
+        self._lock.release()
+
+    def __enter__(self) -> MeteredLock:
+        self.acquire()
+        return self
+
+    def __exit__(self, *_):
+        self.release()
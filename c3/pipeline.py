@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import collections
+import logging
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Callable, Iterable, Optional
+
+from c3 import consts, controldevice
+
+if TYPE_CHECKING:
+    from c3.core import C3
+
+# Requests that change the panel state are not sent again when their reply is missing
+_NOT_REPEATABLE = (consts.Command.CONTROL, consts.Command.DELETEDATA)
+
+
+class C3Future(Future):
+    """The pending reply of a pipelined request.
+
+    The replies are received by the thread that waits for a result,
+    calling result() or exception() receives replies until this request is answered.
+    """
+
+    def __init__(
+        self,
+        pipeline: C3Pipeline,
+        command: consts.Command,
+        data,
+        parse: Optional[Callable],
+    ):
+        super().__init__()
+        self.command = command
+        self.data = data
+        self.request_nr: Optional[int] = None
+        self.pipelined = False
+        self._pipeline = pipeline
+        self._parse = parse
+
+    def result(self, timeout=None):
+        self._pipeline._wait(self)
+        return super().result(timeout)
+
+    def exception(self, timeout=None):
+        self._pipeline._wait(self)
+        return super().exception(timeout)
+
+
+class C3Pipeline:
+    """Send multiple requests on one session, without waiting for the reply of each request.
+
+    Up to max_in_flight requests are sent before the first reply is received. A reply is
+    matched to its request by the request number in the session header. When the panel
+    numbers its replies itself, the replies are matched in the order the requests were sent,
+    which TCP preserves.
+    A pipeline is lock-step (one request in flight) for session-less connections, since these
+    lack a request number, and for firmware that does not answer requests that are received
+    while a request is processed. The latter is detected by a receive timeout with multiple
+    requests in flight; the panel is then reconnected, so late replies cannot be mistaken for
+    others, and the unanswered requests are sent again, one at a time, except for requests
+    that change the panel state (control and delete), which fail with the timeout.
+    Any other receive error means the connection is lost, all requests in flight fail with it.
+
+    Within the context of the pipeline, requests of other threads on the same panel wait
+    until all replies are received.
+    """
+
+    log = logging.getLogger("C3")
+
+    def __init__(self, panel: C3, max_in_flight: int = 8):
+        self._panel = panel
+        self.max_in_flight = max(1, max_in_flight)
+        self._in_flight: collections.OrderedDict[
+            int, C3Future
+        ] = collections.OrderedDict()
+
+    def __enter__(self) -> C3Pipeline:
+        # Other threads wait until all replies are received
+        self._panel._lock.acquire()
+        self._panel._active_pipeline = self
+        return self
+
+    def __exit__(self, *_):
+        try:
+            self.flush()
+        finally:
+            self._panel._active_pipeline = None
+            self._panel._lock.release()
+
+    @property
+    def in_flight(self) -> int:
+        """The number of requests waiting for a reply"""
+        return len(self._in_flight)
+
+    def _max_in_flight(self) -> int:
+        if self._panel._session_less or self._panel._pipelining is False:
+            return 1
+        return self.max_in_flight
+
+    def _send(self, future: C3Future):
+        future.request_nr = self._panel._request_nr & 0xFFFF
+        future.pipelined = bool(self._in_flight)
+        self._in_flight[future.request_nr] = future
+        try:
+            self._panel._send(future.command, future.data)
+        except OSError as ex:
+            self._connection_lost(ex)
+            raise
+
+    def submit(
+        self,
+        command: consts.Command,
+        data=None,
+        parse: Optional[Callable] = None,
+    ) -> C3Future:
+        """Send a request and return the future for its reply.
+        The result of the future is the reply message, or the return value of parse(message).
+        """
+        if not self._panel.is_connected():
+            raise ConnectionError("No connection to C3 panel.")
+
+        with self._panel._lock:
+            while len(self._in_flight) >= self._max_in_flight():
+                self._receive_next()
+
+            future = C3Future(self, command, data, parse)
+            future.set_running_or_notify_cancel()
+            self._send(future)
+        return future
+
+    def flush(self):
+        """Receive the replies of all requests in flight."""
+        with self._panel._lock:
+            while self._in_flight:
+                self._receive_next()
+
+    def _wait(self, future: C3Future):
+        with self._panel._lock:
+            while not future.done() and self._in_flight:
+                self._receive_next()
+
+    def _connection_lost(self, ex: Exception, futures: Iterable[C3Future] = ()):
+        """Fail all requests in flight (and the given futures), none of them will be answered."""
+        futures = [*self._in_flight.values(), *futures]
+        self._in_flight.clear()
+        for future in futures:
+            if not future.done():
+                future.set_exception(ex)
+        self._panel._connection_lost()
+
+    def _fall_back_to_lock_step(self, ex: Exception):
+        self.log.warning(
+            "No reply from %s with %d requests in flight (%s), continuing lock-step",
+            self._panel.host,
+            len(self._in_flight),
+            ex,
+        )
+        self._panel._pipelining = False
+        self._panel._save_capabilities()
+        unanswered = collections.deque(self._in_flight.values())
+        self._in_flight.clear()
+        # A late reply on this connection would be taken for the reply to a request sent next
+        if not self._panel.reconnect():
+            self._connection_lost(
+                ConnectionError(f"Reconnecting to {self._panel.host} failed"),
+                unanswered,
+            )
+            return
+        while unanswered:
+            future = unanswered.popleft()
+            if future.command in _NOT_REPEATABLE:
+                # The panel may have executed the request, sending it again could repeat it
+                future.set_exception(ex)
+                continue
+            try:
+                self._send(future)
+            except OSError as send_ex:
+                self._connection_lost(send_ex, unanswered)
+                return
+            while not future.done():
+                self._receive_next()
+            if not self._panel._connected:
+                self._connection_lost(
+                    ConnectionError("No connection to C3 panel."), unanswered
+                )
+                return
+
+    def _receive_next(self):
+        panel = self._panel
+        try:
+            frame = panel._receive_frame()
+        except (ConnectionError, ValueError, OSError) as ex:
+            if isinstance(ex, TimeoutError) and len(self._in_flight) > 1:
+                self._fall_back_to_lock_step(ex)
+            else:
+                self._connection_lost(ex)
+            return
+
+        # Copy the message, the receive buffer is reused for the next reply
+        message = bytes(frame.payload)
+        session_offset = 0
+        future = None
+        if not panel._session_less and len(message) > 2:
+            session_offset = 4
+            if len(message) >= 4:
+                reply_nr = message[2] + (message[3] << 8)
+                request_nr = (
+                    reply_nr
+                    if reply_nr in self._in_flight
+                    else next(iter(self._in_flight))
+                )
+                if not panel._is_reply_to(request_nr, reply_nr):
+                    self.log.debug(
+                        "Discarding the late reply to request %04x", reply_nr
+                    )
+                    return
+                future = self._in_flight.pop(request_nr)
+        if future is None:
+            # A reply without request number answers the oldest request
+            _, future = self._in_flight.popitem(last=False)
+        if future.pipelined and not panel._pipelining:
+            # A request that was sent before the previous reply was received is answered
+            panel._pipelining = True
+            panel._save_capabilities()
+
+        if frame.command == consts.C3_REPLY_ERROR:
+            future.set_exception(panel._reply_error(message))
+        elif session_offset and panel._session_id != message[0] + (message[1] << 8):
+            future.set_exception(ValueError("Data received with invalid session ID"))
+        else:
+            message = message[session_offset:]
+            try:
+                future.set_result(future._parse(message) if future._parse else message)
+            except (ValueError, KeyError) as ex:
+                future.set_exception(ex)
+
+    def get_device_param(self, request_parameters: list[str]) -> C3Future:
+        """Request device parameter values, the result is a dictionary."""
+        return self.submit(
+            consts.Command.GETPARAM,
+            ",".join(request_parameters),
+            self._panel._parse_kv_from_message,
+        )
+
+    def get_device_data(
+        self,
+        table_name: str,
+        field_names: Optional[list[str]] = None,
+        columnar: bool = False,
+    ) -> C3Future:
+        """Request all records of a device data table, the result is the same as for C3.get_device_data."""
+        # Retrieving the table configuration (when not cached) receives all replies in flight first
+        data_cfg = self._panel._get_device_data_cfg()
+        cfg, parameters = self._panel._get_device_data_request(
+            data_cfg, table_name, field_names
+        )
+        return self.submit(
+            consts.Command.GETDATA,
+            parameters,
+            lambda message: self._panel._parse_device_data(
+                cfg, message, columnar, field_names
+            ),
+        )
+
+    def control_device(self, command: controldevice.ControlDeviceBase) -> C3Future:
+        """Send a control command to the panel.
+        Unlike C3.control_device, the status of the outputs is not updated."""
+        return self.submit(consts.Command.CONTROL, command.to_bytes())
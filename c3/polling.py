@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Callable, Iterator, Optional
+
+from c3 import rtlog
+from c3.core import C3
+
+
+@dataclass
+class PollStats:
+    """Metrics of the polling of one panel"""
+
+    polls: int = 0
+    """Number of polls"""
+    events: int = 0
+    """Number of event records received"""
+    errors: int = 0
+    """Number of polls that failed"""
+    interval: float = 0.0
+    """The current interval between polls, in seconds"""
+    poll_time: float = 0.0
+    """Total time between consecutive polls, in seconds"""
+    event_latency: float = 0.0
+    """Total estimated latency of the received events, in seconds"""
+    max_event_latency: float = 0.0
+    """Upper bound of the latency of the received events, in seconds"""
+
+    @property
+    def cadence(self) -> float:
+        """Achieved average time between polls, in seconds"""
+        return self.poll_time / (self.polls - 1) if self.polls > 1 else 0.0
+
+    @property
+    def mean_event_latency(self) -> float:
+        """Estimated average time between an event occurring and it being received, in seconds"""
+        return self.event_latency / self.events if self.events else 0.0
+
+
+class PollSchedule:
+    """Adaptive interval between the polls of one panel.
+
+    After a poll that returned events, the panel is polled every min_interval seconds, for at
+    least burst_duration seconds, since events tend to come in bursts (a door that is opened
+    is usually closed shortly after). When the panel is idle, the interval is multiplied by
+    backoff after every poll, up to max_interval.
+
+    The schedule does no I/O, a polling loop reports every poll with record_poll() and waits
+    until next_poll (or for delay()). This makes it usable for any loop, threaded or asyncio,
+    over one or multiple panels.
+    """
+
+    def __init__(
+        self,
+        min_interval: float = 0.2,
+        max_interval: float = 5.0,
+        backoff: float = 1.5,
+        burst_duration: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not 0 < min_interval <= max_interval:
+            raise ValueError(
+                "The interval bounds must be 0 < min_interval <= max_interval"
+            )
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = max(1.0, backoff)
+        self.burst_duration = burst_duration
+        self._clock = clock
+        self._interval = min_interval
+        self._burst_until = 0.0
+        self._last_poll: Optional[float] = None
+        self.next_poll = clock()
+        self._stats = PollStats(interval=min_interval)
+
+    @property
+    def interval(self) -> float:
+        """The current interval between polls, in seconds"""
+        return self._interval
+
+    @property
+    def stats(self) -> PollStats:
+        """A snapshot of the metrics"""
+        return replace(self._stats)
+
+    def delay(self) -> float:
+        """The number of seconds until the next poll is due."""
+        return max(0.0, self.next_poll - self._clock())
+
+    def due(self) -> bool:
+        return self._clock() >= self.next_poll
+
+    def record_poll(self, events: int, error: bool = False) -> float:
+        """Register a poll that returned the given number of events, returns the delay until the next poll."""
+        now = self._clock()
+        stats = self._stats
+        stats.polls += 1
+        if self._last_poll is not None:
+            elapsed = now - self._last_poll
+            stats.poll_time += elapsed
+            if events:
+                # The events occurred somewhere between the previous poll and this poll
+                stats.events += events
+                stats.event_latency += events * elapsed / 2
+                stats.max_event_latency = max(stats.max_event_latency, elapsed)
+        elif events:
+            stats.events += events
+        self._last_poll = now
+
+        if error:
+            stats.errors += 1
+
+        if events:
+            self._interval = self.min_interval
+            self._burst_until = now + self.burst_duration
+        elif now >= self._burst_until:
+            self._interval = min(self.max_interval, self._interval * self.backoff)
+
+        stats.interval = self._interval
+        self.next_poll = now + self._interval
+        return self._interval
+
+    def reset(self):
+        """Poll at the minimum interval again, for instance after a reconnect."""
+        self._interval = self.min_interval
+        self._last_poll = None
+        self.next_poll = self._clock()
+        self._stats.interval = self._interval
+
+
+class RTLogPoller:
+    """Poll the RT log of a C3 panel, with an adaptive interval.
+
+    Iterating the poller yields the records as they are received, until stop() is called:
+
+        poller = RTLogPoller(panel)
+        for record in poller:
+            print(record)
+
+    Only event records count as activity; a panel returns a door/alarm status record when
+    there are no events, which does not reset the interval.
+    """
+
+    log = logging.getLogger("C3")
+
+    def __init__(self, panel: C3, schedule: Optional[PollSchedule] = None):
+        self.panel = panel
+        self.schedule = schedule or PollSchedule()
+        self._stop = threading.Event()
+
+    @property
+    def stats(self) -> PollStats:
+        return self.schedule.stats
+
+    @staticmethod
+    def count_events(records: list) -> int:
+        return sum(1 for record in records if isinstance(record, rtlog.EventRecord))
+
+    def poll(self) -> list[rtlog.EventRecord | rtlog.DoorAlarmStatusRecord]:
+        """Retrieve the RT log once and update the schedule; exceptions are passed on."""
+        try:
+            records = self.panel.get_rt_log()
+        except (ConnectionError, ValueError, OSError):
+            self.schedule.record_poll(0, error=True)
+            raise
+        self.schedule.record_poll(self.count_events(records))
+        return records
+
+    def wait(self) -> bool:
+        """Wait until the next poll is due, returns False when the poller is stopped."""
+        return not self._stop.wait(self.schedule.delay())
+
+    def stop(self):
+        """Stop the iteration, also from another thread."""
+        self._stop.set()
+
+    def __iter__(self) -> Iterator[rtlog.EventRecord | rtlog.DoorAlarmStatusRecord]:
+        self._stop.clear()
+        while self.wait():
+            yield from self.poll()
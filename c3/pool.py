@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import contextlib
+import logging
+import threading
+import time
+from dataclasses import replace
+from typing import Iterator, Optional
+
+from c3 import cache, consts, controldevice
+from c3.core import C3, C3DeviceInfo, ConnectionClosed
+from c3.locks import LockStats
+
+
+class C3Pool:
+    """Pool of sessions to one panel, for callers in multiple threads.
+
+    A C3 instance handles one request at a time, callers in other threads wait for it.
+    The pool keeps up to size sessions, so independent callers use their own session instead.
+    Sessions are connected when needed. When the panel does not accept another session,
+    the size of the pool is reduced to the number of sessions the panel accepted, until
+    size_restore_interval has passed.
+
+    The door, lock and auxiliary status is tracked per session; poll the RT log on a dedicated
+    C3 instance, not through the pool.
+    """
+
+    log = logging.getLogger("C3")
+    # Seconds after which a pool reduced by a refused session tries the configured size again
+    size_restore_interval = 300.0
+
+    def __init__(
+        self,
+        host: [str | C3DeviceInfo],
+        size: int = 2,
+        password: Optional[str] = None,
+        port: int = consts.C3_PORT_DEFAULT,
+        panel_cache: Optional[cache.PanelCache] = None,
+    ) -> None:
+        if isinstance(host, C3DeviceInfo):
+            self._device_info = host
+        else:
+            self._device_info = C3DeviceInfo(
+                host=host, port=port or consts.C3_PORT_DEFAULT
+            )
+        self._max_size = max(1, size)
+        self._size = self._max_size
+        self._restore_time = 0.0
+        self._password = password
+        self._panel_cache = panel_cache
+        self._condition = threading.Condition()
+        self._sessions: list[C3] = []
+        self._idle: list[C3] = []
+        self._stats = LockStats()
+
+    @property
+    def size(self) -> int:
+        """The maximum number of sessions"""
+        return self._size
+
+    @property
+    def in_use(self) -> int:
+        """The number of sessions that is used by a caller"""
+        with self._condition:
+            return len(self._sessions) - len(self._idle)
+
+    @property
+    def stats(self) -> LockStats:
+        """Metrics of the callers that had to wait for a free session"""
+        with self._condition:
+            return replace(self._stats)
+
+    def acquire(self, timeout: Optional[float] = None) -> C3:
+        """Return a connected session for exclusive use, it must be returned with release()."""
+        start = time.perf_counter()
+        contended = False
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            with self._condition:
+                if (
+                    self._size < self._max_size
+                    and time.monotonic() >= self._restore_time
+                ):
+                    self._size = self._max_size
+                while not self._idle and len(self._sessions) >= self._size:
+                    contended = True
+                    remaining = (
+                        None if deadline is None else deadline - time.monotonic()
+                    )
+                    if remaining is not None and remaining <= 0:
+                        self._stats.timeouts += 1
+                        raise TimeoutError(
+                            f"No session to {self._device_info.host} available"
+                        )
+                    self._condition.wait(remaining)
+
+                if self._idle:
+                    panel = self._idle.pop()
+                else:
+                    panel = C3(self._device_info, panel_cache=self._panel_cache)
+                    self._sessions.append(panel)
+
+            if panel.is_connected() or panel.connect(self._password):
+                with self._condition:
+                    self._stats.record(time.perf_counter() - start, contended)
+                return panel
+
+            self._discard(panel)
+
+    def _discard(self, panel: C3):
+        # A panel that accepts no more sessions closes the connection without replying;
+        # any other failure (unreachable, timeout, wrong password) does not change the size.
+        refused = isinstance(
+            panel._connect_error, (ConnectionClosed, ConnectionResetError)
+        )
+        panel.disconnect()
+        with self._condition:
+            self._sessions.remove(panel)
+            self._condition.notify()
+            if not self._sessions or not refused:
+                raise ConnectionError(f"Connection to {self._device_info.host} failed")
+            if self._size > len(self._sessions):
+                self.log.warning(
+                    "%s does not accept more than %d sessions",
+                    self._device_info.host,
+                    len(self._sessions),
+                )
+                self._size = len(self._sessions)
+                self._restore_time = time.monotonic() + self.size_restore_interval
+
+    def release(self, panel: C3):
+        """Return a session to the pool."""
+        # Checked before taking the condition, is_connected() may have to reach the panel
+        connected = panel.is_connected()
+        with self._condition:
+            closed = panel not in self._sessions
+            if connected and not closed:
+                self._idle.append(panel)
+            elif not closed:
+                # A broken session is replaced by a new session on the next acquire
+                self._sessions.remove(panel)
+            self._condition.notify()
+        if closed:
+            # The pool was closed while the session was in use
+            panel.disconnect()
+
+    @contextlib.contextmanager
+    def session(self, timeout: Optional[float] = None) -> Iterator[C3]:
+        """Context manager that acquires and releases a session."""
+        panel = self.acquire(timeout)
+        try:
+            yield panel
+        finally:
+            self.release(panel)
+
+    def close(self):
+        """Disconnect all sessions."""
+        with self._condition:
+            sessions, self._sessions, self._idle = self._sessions, [], []
+        for panel in sessions:
+            panel.disconnect()
+
+    def __enter__(self) -> C3Pool:
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def get_device_param(self, request_parameters: list[str]) -> dict:
+        with self.session() as panel:
+            return panel.get_device_param(request_parameters)
+
+    def get_device_data(
+        self,
+        table_name: str,
+        field_names: Optional[list[str]] = None,
+        columnar: bool = False,
+    ) -> list[dict] | dict[str, list]:
+        with self.session() as panel:
+            return panel.get_device_data(table_name, field_names, columnar)
+
+    def control_device(self, command: controldevice.ControlDeviceBase):
+        with self.session() as panel:
+            panel.control_device(command)
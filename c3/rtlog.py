@@ -1,12 +1,68 @@
 from __future__ import annotations
 
+import logging
+import struct
 from abc import ABC, abstractmethod
 
-from c3 import consts
+from c3 import consts, kv
 from c3.utils import C3DateTime
 
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+log = logging.getLogger("C3")
+
+# Binary RT log record layout: card_no/pin (or alarm/dss status) as 4 byte integers,
+# verified, port, event type and in/out state as single bytes, followed by the 4 byte time value.
+RTLOG_RECORD_SIZE = 16
+RTLOG_STRUCT = struct.Struct("<IIBBBBI")
+_UINT32 = struct.Struct("<I")
+
+# Event type stored for a key/value record with an event that does not fit in the binary record,
+# 254 is not a valid event type, so it decodes as unknown
+_EVENT_TYPE_UNKNOWN = 254
+
+
+def _byte(value: str, unknown: int) -> int:
+    """An enum value, a value that does not fit decodes as unknown like any other unknown value."""
+    value = int(value)
+    return value if 0 <= value <= 0xFF else unknown
+
+
+def _unsigned(data: dict, name: str, size: int) -> int:
+    """A numeric value, which must fit in the size (in bytes) of its field in the binary record."""
+    value = int(data[name])
+    if not 0 <= value < 1 << (8 * size):
+        raise ValueError(f"RT log value {name}={value} exceeds the binary record field")
+    return value
+
+
+def _time_value(value: str) -> int:
+    time_value = C3DateTime(*C3DateTime.from_str(value).timetuple()[:6]).to_value()
+    if not 0 <= time_value <= 0xFFFFFFFF:
+        raise ValueError(f"RT log time {value} exceeds the binary record field")
+    return time_value
+
 
 class RTLogRecord(ABC):
+    """Realtime Log record, backed by the 16 byte binary record from the wire.
+
+    The fields are decoded from the binary record when they are accessed, so a record holds
+    nothing but its 16 bytes. to_bytes() returns the binary record, which recreates the record
+    with factory(); records are pickled in the same wire format.
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: [bytes, bytearray, memoryview]):
+        if len(data) != RTLOG_RECORD_SIZE:
+            raise ValueError(
+                f"RT log record size ({len(data)}) is not {RTLOG_RECORD_SIZE}"
+            )
+        self._data = bytes(data)
+
     @abstractmethod
     def is_door_alarm(self) -> bool:
         ...
@@ -15,16 +71,34 @@ class RTLogRecord(ABC):
     def is_event(self) -> bool:
         ...
 
+    def to_bytes(self) -> bytes:
+        """The record in binary RT log wire format."""
+        return self._data
+
+    @property
+    def event_type(self) -> consts.EventType:
+        return consts.EventTypeTable[self._data[10]]
+
+    @property
+    def time_second(self) -> C3DateTime:
+        return C3DateTime.from_value(_UINT32.unpack_from(self._data, 12)[0])
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._data == other._data
+
+    def __hash__(self):
+        return hash(self._data)
+
+    def __reduce__(self):
+        return self.__class__, (self._data,)
+
 
 class DoorAlarmStatusRecord(RTLogRecord):
     """Realtime Log record for a door and alarm status"""
 
-    def __init__(self):
-        self.alarm_status = bytes(4)
-        self.dss_status = bytes(4)
-        self.verified: consts.VerificationMode = consts.VerificationMode.NONE
-        self.event_type: consts.EventType = consts.EventType.NA
-        self.time_second = 0
+    __slots__ = ()
 
     @classmethod
     def from_bytes(cls, data: bytes):
@@ -54,21 +128,7 @@ class DoorAlarmStatusRecord(RTLogRecord):
         Time_second (byte 12-15)                                     a5:ad:ad:21 => (big endian:) 21ADADA5 =
                                                                                                   2017-7-30 16:51:49
         """
-        record = DoorAlarmStatusRecord()
-        record.alarm_status = bytes(data[0:4])
-        record.dss_status = bytes(data[4:8])
-        try:
-            record.verified = consts.VerificationMode(data[9])
-        except ValueError:
-            record.verified = consts.VerificationMode.OTHER
-        try:
-            record.event_type = consts.EventType(data[10])
-        except ValueError:
-            record.event_type = consts.EventType.UNKNOWN_UNSUPPORTED
-        record.time_second = C3DateTime.from_value(
-            int.from_bytes(data[12:16], byteorder="little")
-        )
-        return record
+        return cls(data)
 
     @classmethod
     def from_kv(cls, data: dict):
@@ -81,21 +141,30 @@ class DoorAlarmStatusRecord(RTLogRecord):
           'alarm': '00000000'
         }
         """
-        record = DoorAlarmStatusRecord()
-        record.alarm_status = bytes.fromhex(data["alarm"])
+        alarm_status = bytes.fromhex(data["alarm"])[:4].ljust(4, b"\x00")
         sensor = int(data["sensor"], base=16)
-        record.dss_status = bytes([(sensor >> (i * 2)) & 0x03 for i in range(0, 4)])
+        dss_status = bytes([(sensor >> (i * 2)) & 0x03 for i in range(0, 4)])
         # relay = 00
-        # try:
-        #     record.verified = consts.VerificationMode(data[9])
-        # except ValueError:
-        #     record.verified = consts.VerificationMode.OTHER
-        # try:
-        #     record.event_type = consts.EventType(data[10])
-        # except ValueError:
-        #     record.event_type = consts.EventType.UNKNOWN_UNSUPPORTED
-        record.time_second = C3DateTime.from_str(data["time"])
-        return record
+        return cls(
+            alarm_status
+            + dss_status
+            + bytes(
+                [0, consts.VerificationMode.NONE, consts.EventType.DOOR_ALARM_STATUS, 0]
+            )
+            + _UINT32.pack(_time_value(data["time"]))
+        )
+
+    @property
+    def alarm_status(self) -> bytes:
+        return self._data[0:4]
+
+    @property
+    def dss_status(self) -> bytes:
+        return self._data[4:8]
+
+    @property
+    def verified(self) -> consts.VerificationMode:
+        return consts.VerificationModeTable[self._data[9]]
 
     def is_door_alarm(self) -> bool:
         return True
@@ -169,14 +238,7 @@ class DoorAlarmStatusRecord(RTLogRecord):
 class EventRecord(RTLogRecord):
     """Realtime Event record"""
 
-    def __init__(self):
-        self.card_no = 0
-        self.pin = 0
-        self.verified: consts.VerificationMode = consts.VerificationMode.NONE
-        self.port_nr: int = 0
-        self.event_type: consts.EventType = consts.EventType.NA
-        self.in_out_state: consts.InOutDirection = consts.InOutDirection.NONE
-        self.time_second = 0
+    __slots__ = ()
 
     @classmethod
     def from_bytes(cls, data: bytes):
@@ -200,30 +262,12 @@ class EventRecord(RTLogRecord):
                                                                |
         Time_second (byte 12-15)                               a5:ad:ad:21 => (big endian)21ADADA5 = 2017-07-30 16:51:49
         """
-        record = EventRecord()
-        record.card_no = int.from_bytes(data[0:4], byteorder="little")
-        record.pin = int.from_bytes(data[4:8], byteorder="little")
-        try:
-            record.verified = consts.VerificationMode(data[8])
-        except ValueError:
-            record.verified = consts.VerificationMode.OTHER
-        record.port_nr = data[9]
-        try:
-            record.event_type = consts.EventType(data[10])
-        except ValueError:
-            record.event_type = consts.EventType.UNKNOWN_UNSUPPORTED
-        try:
-            record.in_out_state = consts.InOutDirection(data[11])
-        except ValueError:
-            record.in_out_state = consts.InOutDirection.UNKNOWN_UNSUPPORTED
-        record.time_second = C3DateTime.from_value(
-            int.from_bytes(data[12:16], byteorder="little")
-        )
-        return record
+        return cls(data)
 
     @classmethod
     def from_kv(cls, data: dict):
         """Create EventRecord from text-based key/value log
+        Raises ValueError when the card number, pin, door or time does not fit in the binary record.
         A key/value log contains the following fields:
         {
           'time': '2023-12-06 22:33:15',
@@ -236,24 +280,40 @@ class EventRecord(RTLogRecord):
           'index': '9'
         }
         """
-        record = EventRecord()
-        record.card_no = int(data["cardno"])
-        record.pin = int(data["pin"])
-        try:
-            record.verified = consts.VerificationMode(int(data["verifytype"]))
-        except ValueError:
-            record.verified = consts.VerificationMode.OTHER
-        record.port_nr = int(data["eventaddr"])
-        try:
-            record.event_type = consts.EventType(int(data["event"]))
-        except ValueError:
-            record.event_type = consts.EventType.UNKNOWN_UNSUPPORTED
-        try:
-            record.in_out_state = consts.InOutDirection(int(data["inoutstatus"]))
-        except ValueError:
-            record.in_out_state = consts.InOutDirection.UNKNOWN_UNSUPPORTED
-        record.time_second = C3DateTime.from_str(data["time"])
-        return record
+        event_type = _byte(data["event"], _EVENT_TYPE_UNKNOWN)
+        if event_type == consts.EventType.DOOR_ALARM_STATUS:
+            event_type = _EVENT_TYPE_UNKNOWN
+        return cls(
+            RTLOG_STRUCT.pack(
+                _unsigned(data, "cardno", 4),
+                _unsigned(data, "pin", 4),
+                _byte(data["verifytype"], consts.VerificationMode.OTHER),
+                _unsigned(data, "eventaddr", 1),
+                event_type,
+                _byte(data["inoutstatus"], consts.InOutDirection.UNKNOWN_UNSUPPORTED),
+                _time_value(data["time"]),
+            )
+        )
+
+    @property
+    def card_no(self) -> int:
+        return _UINT32.unpack_from(self._data, 0)[0]
+
+    @property
+    def pin(self) -> int:
+        return _UINT32.unpack_from(self._data, 4)[0]
+
+    @property
+    def verified(self) -> consts.VerificationMode:
+        return consts.VerificationModeTable[self._data[8]]
+
+    @property
+    def port_nr(self) -> int:
+        return self._data[9]
+
+    @property
+    def in_out_state(self) -> consts.InOutDirection:
+        return consts.InOutDirectionTable[self._data[11]]
 
     def is_door_alarm(self) -> bool:
         return False
@@ -278,9 +338,9 @@ class EventRecord(RTLogRecord):
 
 
 def factory(
-    log_message: [bytes, bytearray, dict]
+    log_message: [bytes, bytearray, memoryview, dict]
 ) -> DoorAlarmStatusRecord | EventRecord:
-    if isinstance(log_message, (bytes, bytearray)):
+    if isinstance(log_message, (bytes, bytearray, memoryview)):
         if log_message[10] == consts.EventType.DOOR_ALARM_STATUS:
             rtlog = DoorAlarmStatusRecord.from_bytes(log_message)
         else:
@@ -294,3 +354,138 @@ def factory(
         raise NotImplementedError(f"RT log type {type(log_message)} is not supported")
 
     return rtlog
+
+
+class RTLogBatch:
+    """Columnar batch of binary RT log records, decoded in one pass.
+
+    The columns contain the raw values from the wire format, per record:
+    card_no (byte 0-3), pin (byte 4-7), verified (byte 8), port_nr (byte 9),
+    event_type (byte 10), in_out_state (byte 11) and time_value (byte 12-15).
+    For door/alarm status records (event_type 255), the first 12 bytes have a different meaning.
+    The columns are tuples, or numpy arrays when decoded with numpy.
+    Record objects are only created when requested with records().
+    """
+
+    __slots__ = ("_data", "_columns")
+
+    column_names = (
+        "card_no",
+        "pin",
+        "verified",
+        "port_nr",
+        "event_type",
+        "in_out_state",
+        "time_value",
+    )
+
+    def __init__(self, data: bytes, columns: tuple):
+        self._data = data
+        self._columns = columns
+
+    def __len__(self) -> int:
+        return len(self._data) // RTLOG_RECORD_SIZE
+
+    def column(self, name: str):
+        return self._columns[self.column_names.index(name)]
+
+    @property
+    def card_no(self):
+        return self._columns[0]
+
+    @property
+    def pin(self):
+        return self._columns[1]
+
+    @property
+    def verified(self):
+        return self._columns[2]
+
+    @property
+    def port_nr(self):
+        return self._columns[3]
+
+    @property
+    def event_type(self):
+        return self._columns[4]
+
+    @property
+    def in_out_state(self):
+        return self._columns[5]
+
+    @property
+    def time_value(self):
+        return self._columns[6]
+
+    def times(self) -> list[C3DateTime]:
+        """The record times, converted to datetime."""
+        return [C3DateTime.from_value(int(value)) for value in self.time_value]
+
+    def to_bytes(self) -> bytes:
+        """The batch in binary RT log wire format."""
+        return self._data
+
+    def record(self, index: int) -> DoorAlarmStatusRecord | EventRecord:
+        offset = index * RTLOG_RECORD_SIZE
+        return factory(self._data[offset : offset + RTLOG_RECORD_SIZE])
+
+    def records(self) -> list[DoorAlarmStatusRecord | EventRecord]:
+        """Create the record objects for all records in the batch."""
+        return [self.record(i) for i in range(len(self))]
+
+
+RTLOG_DTYPE = (
+    numpy.dtype(
+        [
+            ("card_no", "<u4"),
+            ("pin", "<u4"),
+            ("verified", "u1"),
+            ("port_nr", "u1"),
+            ("event_type", "u1"),
+            ("in_out_state", "u1"),
+            ("time_value", "<u4"),
+        ]
+    )
+    if numpy
+    else None
+)
+
+
+def decode_batch(
+    data: [bytes, bytearray, memoryview], use_numpy: bool = False
+) -> RTLogBatch:
+    """Decode a binary RT log payload, consisting of one or more 16 byte records, into a columnar batch.
+    When use_numpy is set, the columns are numpy arrays (requires numpy to be installed).
+    """
+    if len(data) % RTLOG_RECORD_SIZE:
+        raise ValueError(
+            f"RT log data size ({len(data)}) is not a multiple of {RTLOG_RECORD_SIZE}"
+        )
+    data = bytes(data)
+
+    if use_numpy:
+        if numpy is None:
+            raise ImportError("Decoding RT logs with numpy requires numpy")
+        array = numpy.frombuffer(data, dtype=RTLOG_DTYPE)
+        columns = tuple(array[name] for name in RTLogBatch.column_names)
+    elif data:
+        columns = tuple(zip(*RTLOG_STRUCT.iter_unpack(data)))
+    else:
+        columns = ((),) * len(RTLogBatch.column_names)
+
+    return RTLogBatch(data, columns)
+
+
+def decode_kv_batch(
+    data: [bytes, bytearray, memoryview]
+) -> list[DoorAlarmStatusRecord | EventRecord]:
+    """Decode a key/value RT log payload, consisting of one or more records separated by a newline.
+    A record that can not be represented is skipped, the panel does not return it again.
+    """
+    records = []
+    for record in kv.parse_kv_records(data, intern=True):
+        try:
+            records.append(factory(record))
+        except ValueError as ex:
+            log.error("Skipping RT log record %s: %s", record, ex)
+    return records
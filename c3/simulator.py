@@ -0,0 +1,594 @@
+from __future__ import annotations
+
+import collections
+import itertools
+import logging
+import random
+import socket
+import socketserver
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+from c3 import consts, framing, rtlog, utils
+from c3.core import C3, C3DeviceInfo, _DataTableCfg
+
+# The data table configuration as reported by a C3-400 (AC Ver 4.3.4)
+DATA_TABLE_CFG = [
+    "user=1,UID=i1,CardNo=i2,Pin=i3,Password=s4,Group=i5,StartTime=i6,EndTime=i7,Name=s8,SuperAuthorize=i9",
+    "userauthorize=2,Pin=i1,AuthorizeTimezoneId=i2,AuthorizeDoorId=i3",
+    "holiday=3,Holiday=i1,HolidayType=i2,Loop=i3",
+    "timezone=4,TimezoneId=i1,"
+    + ",".join(
+        f"{day}Time{i}=i{2 + d * 3 + i - 1}"
+        for d, day in enumerate(
+            ["Sun", "Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Hol1", "Hol2", "Hol3"]
+        )
+        for i in range(1, 4)
+    ),
+    "transaction=5,Cardno=i1,Pin=i2,Verified=i3,DoorID=i4,EventType=i5,InOutState=i6,Time_second=i7",
+    "firstcard=6,Pin=i1,DoorID=i2,TimezoneID=i3",
+    "multimcard=7,Index=i1,DoorId=i2,Group1=i3,Group2=i4,Group3=i5,Group4=i6,Group5=i7",
+    "inoutfun=8,Index=i1,EventType=i2,InAddr=i3,OutType=i4,OutAddr=i5,OutTime=i6,Reserved=i7",
+    "template=9,Size=i1,Pin=i2,FingerID=i3,Valid=i4,Template=s5",
+    "templatev10=10,Size=i1,UID=i2,Pin=i3,FingerID=i4,Valid=i5,Template=B6,Resverd=i7,EndTag=i8",
+    "losscard=11,CardNo=i1,Reserved=i2",
+    "usertype=12,Pin=i1,Type=i2",
+    "wiegandfmt=13,Pin=i1,Name=s2,WgCount=i3,Format=s4",
+]
+
+# The number of parameters a panel returns in one GETPARAM reply
+MAX_PARAMS_PER_REQUEST = 30
+
+# Error codes returned by the simulated panel
+_ERROR_COMMAND = consts.C3_ERROR_COMMAND
+_ERROR_PASSWORD = consts.C3_ERROR_PASSWORD
+
+
+def _time_value(value: datetime) -> int:
+    return utils.C3DateTime(
+        year=value.year,
+        month=value.month,
+        day=value.day,
+        hour=value.hour,
+        minute=value.minute,
+        second=value.second,
+    ).to_value()
+
+
+class _Session:
+    """State of a single TCP connection to the simulated panel"""
+
+    def __init__(self):
+        self.session_id: Optional[int] = None
+        self.closed = False
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    def setup(self):
+        simulator: PanelSimulator = self.server.simulator
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with simulator._lock:
+            self.refused = (
+                simulator.max_sessions is not None
+                and len(simulator._connections) >= simulator.max_sessions
+            )
+            if not self.refused:
+                simulator._connections.add(self.request)
+
+    def handle(self):
+        simulator: PanelSimulator = self.server.simulator
+        if self.refused:
+            # Close the connection, like a panel that accepts a limited number of sessions
+            return
+        session = _Session()
+        decoder = framing.FrameDecoder()
+
+        while not session.closed:
+            try:
+                data = self.request.recv(64 * 1024)
+            except OSError:
+                break
+            if not data:
+                break
+
+            arrival = time.monotonic()
+            try:
+                frames = decoder.feed(data)
+            except ValueError as ex:
+                simulator.log.error("Simulator %s: %s", simulator.serial_number, ex)
+                break
+
+            if not simulator.pipelining:
+                # Like some firmwares, ignore the requests received while a request is processed
+                frames = frames[:1]
+            for frame in frames:
+                reply = simulator.handle_request(
+                    session, frame.command, bytes(frame.payload)
+                )
+                simulator._delay_reply(arrival)
+                if not simulator.pipelining:
+                    self._discard_pending(decoder)
+                simulator._send_reply(self.request, reply)
+                if session.closed:
+                    break
+
+    def _discard_pending(self, decoder: framing.FrameDecoder):
+        decoder.reset()
+        self.request.setblocking(False)
+        try:
+            while self.request.recv(64 * 1024):
+                pass
+        except OSError:
+            pass
+        finally:
+            self.request.setblocking(True)
+
+    def finish(self):
+        simulator: PanelSimulator = self.server.simulator
+        with simulator._lock:
+            simulator._connections.discard(self.request)
+
+
+class _DiscoveryHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        simulator: PanelSimulator = self.server.simulator
+        data, sock = self.request
+        try:
+            command, _, _ = framing.parse_header(data)
+            payload = framing.check_frame(data)
+        except ValueError:
+            return
+        if command == consts.Command.DISCOVER and bytes(
+            payload
+        ) == consts.C3_DISCOVERY_MESSAGE.encode("ascii"):
+            sock.sendto(simulator.discovery_reply(), self.client_address)
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+    block_on_close = False
+
+
+class _UDPServer(socketserver.UDPServer):
+    allow_reuse_address = True
+
+
+class PanelSimulator:
+    """In-process emulation of a C3 panel, for tests and benchmarks without hardware.
+
+    The simulator listens on a TCP port (and optionally a UDP port for discovery) and
+    speaks the C3 wire protocol, using the same message construction and checksum as the client.
+    Supported are the connect (with and without session), disconnect, datetime, parameter,
+    data table (configuration, retrieval and deletion), RT log (binary and key/value),
+    control and discovery commands.
+
+    The data tables are filled with generated records, the number per table is set with table_sizes.
+    RT log events are generated at event_rate events per second, or added with add_event().
+    The latency (in seconds) delays every reply from the arrival of its request, like a network
+    round trip, so requests that arrive together are answered together. The fragment_size splits every reply in
+    fragments of the given number of bytes, to exercise the reassembly in the client.
+    With pipelining disabled, requests that arrive while a request is processed are ignored.
+    With max_sessions set, connections beyond that number are closed right away.
+    """
+
+    log = logging.getLogger("C3")
+    # Maximum number of RT log records returned in a single reply
+    max_rtlog_records = 100
+
+    _serial_numbers = itertools.count(1)
+
+    def __init__(
+        self,
+        serial_number: Optional[str] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        password: Optional[str] = None,
+        session: bool = True,
+        rtlog_binary: bool = True,
+        nr_of_locks: int = 4,
+        table_sizes: Optional[dict[str, int]] = None,
+        parameters: Optional[dict[str, str]] = None,
+        event_rate: float = 0.0,
+        latency: float = 0.0,
+        fragment_size: Optional[int] = None,
+        discovery_port: Optional[int] = None,
+        pipelining: bool = True,
+        max_sessions: Optional[int] = None,
+    ) -> None:
+        self.serial_number = serial_number or "SIM%010d" % next(self._serial_numbers)
+        self.host = host
+        self.port = port
+        self.password = password
+        self.session = session
+        self.rtlog_binary = rtlog_binary
+        self.event_rate = event_rate
+        self.latency = latency
+        self.fragment_size = fragment_size
+        self.discovery_port = discovery_port
+        self.pipelining = pipelining
+        self.max_sessions = max_sessions
+        self.mac = "00:17:61:%02x:%02x:%02x" % tuple(
+            self.serial_number.encode("ascii")[-3:]
+        )
+
+        self.parameters: dict[str, str] = {
+            "~SerialNumber": self.serial_number,
+            "FirmVer": "AC Ver 4.3.4 Apr 28 2017",
+            "DeviceName": "C3-%d00" % nr_of_locks,
+            "LockCount": str(nr_of_locks),
+            "AuxInCount": str(nr_of_locks),
+            "AuxOutCount": str(nr_of_locks),
+            "IPAddress": host,
+            "NetMask": "255.255.255.0",
+            "GATEIPAddress": "0.0.0.0",
+        }
+        for door_nr in range(1, nr_of_locks + 1):
+            self.parameters[f"Door{door_nr}SensorType"] = "2"
+            self.parameters[f"Door{door_nr}Drivertime"] = "5"
+            self.parameters[f"Door{door_nr}Detectortime"] = "15"
+        self.parameters.update(parameters or {})
+
+        self.data_cfg = [
+            _DataTableCfg(C3._parse_kv_from_message(line.encode("ascii")))
+            for line in DATA_TABLE_CFG
+        ]
+        self.tables: dict[str, list[dict]] = {
+            cfg.name: self._generate_records(cfg, (table_sizes or {}).get(cfg.name, 0))
+            for cfg in self.data_cfg
+        }
+        self.controls: list[bytes] = []
+        self.requests: collections.Counter = collections.Counter()
+
+        self._lock = threading.Lock()
+        self._events: collections.deque = collections.deque()
+        self._event_index = 0
+        self._event_time = time.monotonic()
+        self._event_carry = 0.0
+        self._connections: set[socket.socket] = set()
+        self._tcp_server: Optional[_TCPServer] = None
+        self._udp_server: Optional[_UDPServer] = None
+        self._threads: list[threading.Thread] = []
+
+    @property
+    def device_info(self) -> C3DeviceInfo:
+        """The connection details of the simulated panel, to pass to a client."""
+        return C3DeviceInfo(
+            host=self.host,
+            port=self.port,
+            mac=self.mac,
+            serial_number=self.serial_number,
+            device_name=self.parameters["DeviceName"],
+            firmware_version=self.parameters["FirmVer"],
+        )
+
+    def start(self) -> PanelSimulator:
+        """Start listening, when port 0 is used, a free port is selected."""
+        self._tcp_server = _TCPServer((self.host, self.port), _RequestHandler)
+        self._tcp_server.simulator = self
+        self.port = self._tcp_server.server_address[1]
+        servers = [self._tcp_server]
+
+        if self.discovery_port is not None:
+            self._udp_server = _UDPServer(
+                (self.host, self.discovery_port), _DiscoveryHandler
+            )
+            self._udp_server.simulator = self
+            self.discovery_port = self._udp_server.server_address[1]
+            servers.append(self._udp_server)
+
+        self._event_time = time.monotonic()
+        for server in servers:
+            thread = threading.Thread(
+                target=server.serve_forever,
+                kwargs={"poll_interval": 0.1},
+                name=f"C3Simulator-{self.serial_number}",
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+
+        return self
+
+    def stop(self):
+        """Stop listening and close all open connections."""
+        for server in (self._tcp_server, self._udp_server):
+            if server is not None:
+                server.shutdown()
+                server.server_close()
+        self.drop_connections()
+        for thread in self._threads:
+            thread.join()
+        self._tcp_server = self._udp_server = None
+        self._threads = []
+
+    def drop_connections(self):
+        """Close all open connections, like a panel that restarts."""
+        with self._lock:
+            connections = list(self._connections)
+        for connection in connections:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def __enter__(self) -> PanelSimulator:
+        return self.start()
+
+    def __exit__(self, *_):
+        self.stop()
+
+    @classmethod
+    def start_many(cls, count: int, **kwargs) -> list[PanelSimulator]:
+        """Start count simulated panels, each on its own port."""
+        return [cls(**kwargs).start() for _ in range(count)]
+
+    @staticmethod
+    def _generate_records(cfg: _DataTableCfg, count: int) -> list[dict]:
+        time_value = _time_value(datetime(2024, 1, 1))
+        records = []
+        for i in range(count):
+            record = {}
+            for data_field in cfg.fields:
+                if data_field.name == "Time_second":
+                    record[data_field.name] = time_value + i
+                elif data_field.type == "i":
+                    record[data_field.name] = i + 1
+                elif data_field.type == "s":
+                    record[data_field.name] = f"{data_field.name}{i + 1}"
+                else:
+                    record[data_field.name] = bytes(8)
+            records.append(record)
+        return records
+
+    def add_event(
+        self,
+        card_no: int = 0,
+        pin: int = 0,
+        verified: int = consts.VerificationMode.CARD,
+        port_nr: int = 1,
+        event_type: int = consts.EventType.NORMAL_PUNCH_OPEN,
+        in_out_state: int = consts.InOutDirection.ENTRY,
+        time_second: Optional[datetime] = None,
+    ):
+        """Queue an event, it is returned by the next RT log request."""
+        with self._lock:
+            self._events.append(
+                (
+                    card_no,
+                    pin,
+                    verified,
+                    port_nr,
+                    event_type,
+                    in_out_state,
+                    time_second or datetime.now().replace(microsecond=0),
+                )
+            )
+
+    def _generate_events(self):
+        now = time.monotonic()
+        with self._lock:
+            self._event_carry += (now - self._event_time) * self.event_rate
+            self._event_time = now
+            count = int(self._event_carry)
+            self._event_carry -= count
+        for _ in range(count):
+            self._event_index += 1
+            self.add_event(
+                card_no=random.randint(1, 0xFFFFFF),
+                pin=self._event_index,
+                port_nr=random.randint(1, int(self.parameters["LockCount"])),
+            )
+
+    def _take_events(self) -> list[tuple]:
+        self._generate_events()
+        with self._lock:
+            return [
+                self._events.popleft()
+                for _ in range(min(len(self._events), self.max_rtlog_records))
+            ]
+
+    def _rtlog_binary(self) -> bytes:
+        events = self._take_events()
+        now = datetime.now().replace(microsecond=0)
+        if not events:
+            # No events, return the door/alarm status
+            return rtlog.RTLOG_STRUCT.pack(
+                0,
+                0,
+                0,
+                0,
+                consts.EventType.DOOR_ALARM_STATUS,
+                0,
+                _time_value(now),
+            )
+        return b"".join(
+            rtlog.RTLOG_STRUCT.pack(*event[:6], _time_value(event[6]))
+            for event in events
+        )
+
+    def _rtlog_keyvalue(self) -> bytes:
+        events = self._take_events()
+        now = datetime.now().replace(microsecond=0)
+        if not events:
+            lines = [
+                f"time={now:%Y-%m-%d %H:%M:%S}\tsensor=00\trelay=00\talarm=00000000"
+            ]
+        else:
+            lines = [
+                f"time={event_time:%Y-%m-%d %H:%M:%S}\tpin={pin}\tcardno={card_no}\t"
+                f"eventaddr={port_nr}\tevent={event_type}\tinoutstatus={in_out_state}\t"
+                f"verifytype={verified}\tindex={self._event_index}"
+                for card_no, pin, verified, port_nr, event_type, in_out_state, event_time in events
+            ]
+        return "\r\n".join(lines).encode("ascii")
+
+    def _table_cfg(self, table_index: int) -> Optional[_DataTableCfg]:
+        return next((cfg for cfg in self.data_cfg if cfg.index == table_index), None)
+
+    @staticmethod
+    def _encode_value(value) -> bytes:
+        if isinstance(value, int):
+            return value.to_bytes(max(1, (value.bit_length() + 7) // 8), "little")
+        elif isinstance(value, str):
+            return value.encode("ascii")
+        return bytes(value)
+
+    def _get_data(self, payload: bytes) -> Optional[bytes]:
+        cfg = self._table_cfg(payload[0])
+        if cfg is None:
+            return None
+        field_indexes = list(payload[2 : 2 + payload[1]])
+        fields_by_index = cfg.fields_by_index()
+        field_names = [fields_by_index[i].name for i in field_indexes]
+
+        reply = bytearray([cfg.index, len(field_indexes)] + field_indexes)
+        # A reply is limited to the maximum message size, the session header included
+        max_size = 0xFFFF - 4
+        with self._lock:
+            records = list(self.tables[cfg.name])
+        for record in records:
+            encoded = bytearray()
+            for field_name in field_names:
+                value = self._encode_value(record[field_name])
+                encoded.append(len(value))
+                encoded += value
+            if len(reply) + len(encoded) > max_size:
+                self.log.warning(
+                    "Simulator %s: table %s exceeds the message size, reply truncated",
+                    self.serial_number,
+                    cfg.name,
+                )
+                break
+            reply += encoded
+        return bytes(reply)
+
+    def _delete_data(self, payload: bytes) -> bool:
+        cfg = self._table_cfg(payload[0])
+        if cfg is None:
+            return False
+        conditions = [
+            dict(kv.split("=", 1) for kv in line.split("\t") if "=" in kv)
+            for line in str(payload[1:], encoding="ascii").split("\r\n")
+        ]
+        with self._lock:
+            self.tables[cfg.name] = [
+                record
+                for record in self.tables[cfg.name]
+                if not any(
+                    all(str(record.get(k)) == v for k, v in condition.items())
+                    for condition in conditions
+                )
+            ]
+        return True
+
+    def discovery_reply(self) -> bytes:
+        """The reply to a discovery request."""
+        data = ",".join(
+            [
+                f"MAC={self.mac}",
+                f"IP={self.host}",
+                f"NetMask={self.parameters['NetMask']}",
+                f"GATEIPAddress={self.parameters['GATEIPAddress']}",
+                f"SN={self.serial_number}",
+                f"Device={self.parameters['DeviceName']}",
+                f"Ver={self.parameters['FirmVer']}",
+            ]
+        )
+        return bytes(C3._construct_message(None, None, consts.C3_REPLY_OK, data))
+
+    def handle_request(self, session: _Session, command: int, payload: bytes) -> bytes:
+        """Process a request and return the reply message."""
+        self.requests[command] += 1
+        request_nr = bytes(2)
+        if session.session_id is not None or command == consts.Command.CONNECT_SESSION:
+            # Every request in a session starts with the session id and the request number
+            session_prefix = (session.session_id or 0xFEFE).to_bytes(2, "little")
+            if len(payload) < 4 or payload[:2] != session_prefix:
+                return self._error_reply(_ERROR_COMMAND)
+            request_nr = payload[2:4]
+            payload = payload[4:]
+
+        reply = b""
+        error = None
+        if command == consts.Command.CONNECT_SESSION:
+            if not self.session:
+                error = _ERROR_COMMAND
+            elif self.password and payload != self.password.encode("ascii"):
+                error = _ERROR_PASSWORD
+            else:
+                # A session id that does not resemble text, a table index or the initial session id
+                session.session_id = (random.randint(0x80, 0xFD) << 8) | random.randint(
+                    0x80, 0xFF
+                )
+                reply = request_nr
+        elif command == consts.Command.CONNECT_SESSION_LESS:
+            if self.password and payload != self.password.encode("ascii"):
+                error = _ERROR_PASSWORD
+        elif command == consts.Command.DISCONNECT:
+            session.closed = True
+        elif command == consts.Command.DATETIME:
+            with self._lock:
+                self.parameters.update(C3._parse_kv_from_message(payload))
+        elif command == consts.Command.GETPARAM:
+            names = str(payload, encoding="ascii").split(",")
+            if len(names) > MAX_PARAMS_PER_REQUEST:
+                error = _ERROR_COMMAND
+            else:
+                reply = ",".join(
+                    f"{name}={self.parameters[name]}"
+                    for name in names
+                    if name in self.parameters
+                ).encode("ascii")
+        elif command == consts.Command.DATATABLE_CFG:
+            reply = "\n".join(DATA_TABLE_CFG).encode("ascii")
+        elif command == consts.Command.GETDATA:
+            reply = self._get_data(payload)
+            if reply is None:
+                error = _ERROR_COMMAND
+        elif command == consts.Command.DELETEDATA:
+            if not self._delete_data(payload):
+                error = _ERROR_COMMAND
+        elif command == consts.Command.RTLOG_BINARY:
+            if self.rtlog_binary:
+                reply = self._rtlog_binary()
+            else:
+                # Firmware without binary RT log support replies with a block
+                # that is not a multiple of the record size
+                reply = bytes(360)
+        elif command == consts.Command.RTLOG_KEYVALUE:
+            reply = self._rtlog_keyvalue()
+        elif command == consts.Command.CONTROL:
+            with self._lock:
+                self.controls.append(payload)
+        else:
+            error = _ERROR_COMMAND
+
+        if session.session_id is not None:
+            reply = session.session_id.to_bytes(2, "little") + request_nr + reply
+        if error is not None:
+            return self._error_reply(error)
+        return bytes(C3._construct_message(None, None, consts.C3_REPLY_OK, reply))
+
+    @staticmethod
+    def _error_reply(error: int) -> bytes:
+        return bytes(
+            C3._construct_message(None, None, consts.C3_REPLY_ERROR, [error & 0xFF])
+        )
+
+    def _delay_reply(self, arrival: float):
+        delay = arrival + self.latency - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def _send_reply(self, sock: socket.socket, reply: bytes):
+        try:
+            if self.fragment_size:
+                for offset in range(0, len(reply), self.fragment_size):
+                    sock.sendall(reply[offset : offset + self.fragment_size])
+            else:
+                sock.sendall(reply)
+        except OSError as ex:
+            self.log.debug("Simulator %s: %s", self.serial_number, ex)
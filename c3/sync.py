@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from typing import Iterator, Optional
+
+from c3 import cache
+from c3.core import C3
+
+
+class TransactionSync:
+    """Incremental synchronization of the transaction table of a panel.
+
+    The panel does not support retrieving part of a table, but the position up to which the
+    records were synchronized is kept in a cursor, so only new records are returned.
+    The cursor consists of the highest Time_second value seen and the number of records with
+    that time value, since multiple events can occur in the same second.
+    The cursor is stored per panel serial number (or host when the serial number is unknown)
+    in a JSON state file, which can be shared by the panels of a site.
+
+    Optionally, the synchronized records are deleted from the panel after they are acknowledged.
+    This keeps the transaction table small, which reduces the time to retrieve it.
+    The table has no record index, so a record is deleted with a condition on all its fields.
+    Records logged after the fetch are kept, unless they are identical in every field (including
+    the time) to a fetched record; the panel can not distinguish these.
+    """
+
+    log = logging.getLogger("C3")
+    table_name = "transaction"
+    time_field = "Time_second"
+    # Maximum number of delete conditions (records) per request, to stay within the message size
+    delete_batch_size = 50
+
+    def __init__(self, panel: C3, state_path: str):
+        self._panel = panel
+        self._state_path = state_path
+        self._lock = threading.Lock()
+        self._state: dict[str, dict] = self._load()
+        self._pending: Optional[dict] = None
+        self._pending_records: list[dict] = []
+
+    def _load(self) -> dict:
+        if os.path.exists(self._state_path):
+            try:
+                with open(self._state_path, "r", encoding="utf-8") as state_file:
+                    return json.load(state_file)
+            except (OSError, ValueError) as ex:
+                self.log.error("Loading sync state %s failed: %s", self._state_path, ex)
+        return {}
+
+    def _save(self):
+        # Written while holding the lock, so an older state does not replace a newer one
+        with self._lock:
+            state = {key: dict(cursor) for key, cursor in self._state.items()}
+            try:
+                cache.write_json_atomic(self._state_path, state)
+            except OSError as ex:
+                self.log.error("Saving sync state %s failed: %s", self._state_path, ex)
+
+    @property
+    def _key(self) -> str:
+        return self._panel.serial_number or self._panel.host
+
+    @property
+    def cursor(self) -> dict:
+        """The acknowledged cursor of the panel"""
+        with self._lock:
+            return dict(self._state.get(self._key, {"time_second": -1, "count": 0}))
+
+    def reset(self):
+        """Forget the cursor of the panel, so all records are returned by the next fetch."""
+        with self._lock:
+            self._state.pop(self._key, None)
+        self._pending = None
+        self._pending_records = []
+        self._save()
+
+    def fetch(self) -> Iterator[dict]:
+        """Retrieve the transaction table and yield the records that are newer than the cursor.
+        The cursor is only advanced by ack(), once the records are processed."""
+        cursor = self.cursor
+        last_time, last_count = cursor["time_second"], cursor["count"]
+        seen_count = 0
+        pending = dict(cursor)
+        self._pending = None
+        self._pending_records = []
+
+        for record in self._panel.iter_device_data(self.table_name):
+            time_second = record[self.time_field]
+            if time_second < last_time:
+                continue
+            if time_second == last_time:
+                # Skip the records in the same second that were already returned
+                seen_count += 1
+                if seen_count <= last_count:
+                    continue
+
+            if time_second > pending["time_second"]:
+                pending = {"time_second": time_second, "count": 1}
+            elif time_second == pending["time_second"]:
+                pending["count"] += 1
+            self._pending_records.append(record)
+            self._pending = pending
+            yield record
+
+    def ack(self, delete: bool = False):
+        """Store the cursor of the records returned by the last fetch.
+        When delete is set, the returned records are deleted from the panel.
+        """
+        if self._pending is None:
+            return
+
+        pending = self._pending
+        if delete and self._pending_records:
+            # A condition on all fields matches the fetched record only, not the records logged since
+            conditions = list(
+                {
+                    tuple(record.items()): record for record in self._pending_records
+                }.values()
+            )
+            for i in range(0, len(conditions), self.delete_batch_size):
+                self._panel.delete_device_data(
+                    self.table_name, conditions[i : i + self.delete_batch_size]
+                )
+            # The fetched records of the last second are deleted, the remaining records in that second are new
+            pending = {"time_second": pending["time_second"], "count": 0}
+            self.log.debug(
+                "Deleted %d %s records from %s",
+                len(self._pending_records),
+                self.table_name,
+                self._panel.host,
+            )
+
+        with self._lock:
+            self._state[self._key] = pending
+        self._pending = None
+        self._pending_records = []
+        self._save()
+
+    def sync(self, delete: bool = False) -> Iterator[dict]:
+        """Yield the new records and acknowledge them once all records are consumed."""
+        yield from self.fetch()
+        self.ack(delete)
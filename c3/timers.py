@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+
+class TimerHandle:
+    """A scheduled callback, returned by TimerScheduler.call_later"""
+
+    __slots__ = ("deadline", "callback", "args", "cancelled", "_seq")
+
+    def __init__(self, deadline: float, seq: int, callback: Callable, args: tuple):
+        self.deadline = deadline
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+        self._seq = seq
+
+    def cancel(self):
+        """Cancel the timer, it is removed from the schedule when it expires."""
+        self.cancelled = True
+
+    def __lt__(self, other: TimerHandle) -> bool:
+        return (self.deadline, self._seq) < (other.deadline, other._seq)
+
+
+class TimerScheduler:
+    """Heap based scheduler that runs the callbacks of many timers from a single thread.
+
+    By default, a daemon thread is started when the first timer is scheduled.
+    Alternatively, the timers are run from an asyncio event loop by running the run_async() coroutine.
+    Callbacks must be short, they are executed one after the other; a callback that starts
+    network requests hands these to a worker, like default_worker.
+    """
+
+    log = logging.getLogger("C3")
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._heap: list[TimerHandle] = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_wakeup: Optional[asyncio.Event] = None
+
+    def __len__(self) -> int:
+        with self._condition:
+            return sum(1 for handle in self._heap if not handle.cancelled)
+
+    def call_later(self, delay: float, callback: Callable, *args) -> TimerHandle:
+        """Schedule callback(*args) to run after delay seconds."""
+        handle = TimerHandle(self._clock() + delay, next(self._counter), callback, args)
+        with self._condition:
+            heapq.heappush(self._heap, handle)
+            is_first = self._heap[0] is handle
+            if self._loop is None and self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run_thread, name="C3TimerScheduler", daemon=True
+                )
+                self._thread.start()
+        if is_first:
+            self._wakeup()
+        return handle
+
+    def reschedule(self, handle: TimerHandle, delay: float) -> TimerHandle:
+        """Cancel the timer and schedule its callback again, to run after delay seconds."""
+        handle.cancel()
+        return self.call_later(delay, handle.callback, *handle.args)
+
+    def run_pending(self) -> Optional[float]:
+        """Run the callbacks of all expired timers.
+        Returns the time until the next timer expires, or None when no timer is scheduled.
+        """
+        while True:
+            with self._condition:
+                while self._heap and self._heap[0].cancelled:
+                    heapq.heappop(self._heap)
+                if not self._heap:
+                    return None
+                delay = self._heap[0].deadline - self._clock()
+                if delay > 0:
+                    return delay
+                handle = heapq.heappop(self._heap)
+
+            try:
+                handle.callback(*handle.args)
+            except Exception:  # pylint: disable=broad-except
+                self.log.exception("Timer callback %s failed", handle.callback)
+
+    def _wakeup(self):
+        with self._condition:
+            self._condition.notify()
+            loop, loop_wakeup = self._loop, self._loop_wakeup
+        if loop is not None:
+            loop.call_soon_threadsafe(loop_wakeup.set)
+
+    def _run_thread(self):
+        while True:
+            self.run_pending()
+            with self._condition:
+                if self._loop is not None:
+                    # The timers are handed over to an event loop
+                    self._thread = None
+                    return
+                # The delay is determined while holding the condition, so an earlier timer that
+                # is scheduled after run_pending() is not missed
+                if not self._heap:
+                    self._condition.wait()
+                else:
+                    delay = self._heap[0].deadline - self._clock()
+                    if delay > 0:
+                        self._condition.wait(delay)
+
+    async def run_async(self):
+        """Run the timers from the running event loop, instead of from a separate thread.
+        The scheduler falls back to a thread when this coroutine ends."""
+        with self._condition:
+            self._loop = asyncio.get_running_loop()
+            self._loop_wakeup = asyncio.Event()
+            self._condition.notify()
+
+        try:
+            while True:
+                self._loop_wakeup.clear()
+                delay = self.run_pending()
+                try:
+                    await asyncio.wait_for(self._loop_wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            with self._condition:
+                self._loop = None
+                self._loop_wakeup = None
+                if self._heap and self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run_thread, name="C3TimerScheduler", daemon=True
+                    )
+                    self._thread.start()
+
+
+# The scheduler shared by all panels in the process
+default_scheduler = TimerScheduler()
+
+# Runs the network requests started by timers (heartbeat, reconnect, door settings refresh)
+default_worker = ThreadPoolExecutor(thread_name_prefix="C3Worker")
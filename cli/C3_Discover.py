@@ -4,6 +4,7 @@ import logging
 import sys
 
 from c3 import C3
+from c3.discovery import DiscoveryCache, iter_discover
 
 
 def main():
@@ -11,6 +12,18 @@ def main():
     parser.add_argument(
         "--interface", help="IP address of the interface to look for devices on"
     )
+    parser.add_argument(
+        "--subnet",
+        action="append",
+        help="Subnet to scan by unicast (e.g. 10.1.2.0/24), for segments that broadcasts do not reach",
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=2, help="Seconds to wait for replies"
+    )
+    parser.add_argument(
+        "--cache",
+        help="File with the result of the previous scan, to report the differences only",
+    )
     parser.add_argument(
         "--debug",
         action=argparse.BooleanOptionalAction,
@@ -22,10 +35,21 @@ def main():
         C3.log.addHandler(logging.StreamHandler(sys.stdout))
         C3.log.setLevel(logging.DEBUG)
 
-    devices = C3.discover(args.interface)
-    for device in devices:
-        print(f"Found device ({device.mac or '?'}):")
-        print(repr(device))
+    devices = iter_discover(
+        [args.interface] if args.interface else None, args.subnet, args.timeout
+    )
+    if args.cache:
+        diff = DiscoveryCache(args.cache).update(devices, complete=not args.interface)
+        for device in diff.added:
+            print(f"New device ({device.mac or '?'}): {device.host}")
+        for previous, device in diff.changed:
+            print(f"Changed device ({device.mac or '?'}): {previous} -> {device}")
+        for device in diff.missing:
+            print(f"Missing device ({device.mac or '?'}): {device.host}")
+    else:
+        for device in devices:
+            print(f"Found device ({device.mac or '?'}):")
+            print(repr(C3(device)))
 
 
 if __name__ == "__main__":
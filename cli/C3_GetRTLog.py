@@ -2,15 +2,27 @@
 import argparse
 import logging
 import sys
-import time
 
-from c3 import C3, rtlog
+from c3 import C3
+from c3.polling import PollSchedule, RTLogPoller
 
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("host", help="C3 panel IP address or host name")
     parser.add_argument("--password", help="Password")
+    parser.add_argument(
+        "--min-interval",
+        type=float,
+        default=0.2,
+        help="Minimum seconds between polls, used after activity",
+    )
+    parser.add_argument(
+        "--max-interval",
+        type=float,
+        default=10.0,
+        help="Maximum seconds between polls, reached when idle",
+    )
     parser.add_argument(
         "--debug",
         action=argparse.BooleanOptionalAction,
@@ -26,24 +38,23 @@ def main():
         panel.log.setLevel(logging.DEBUG)
 
     if panel.connect(args.password):
+        poller = RTLogPoller(panel, PollSchedule(args.min_interval, args.max_interval))
         try:
-            while True:
-                last_record_is_status = False
+            while poller.wait():
                 records = []
 
                 if not panel.is_connected():
                     panel.connect(args.password)
+                    poller.schedule.reset()
 
                 try:
-                    records = panel.get_rt_log()
+                    records = poller.poll()
                 except ConnectionError as ex:
                     print(f"Error retrieving RT logs: {ex}")
                     panel.disconnect()
 
                 for record in records:
                     print(repr(record))
-                    if isinstance(record, rtlog.DoorAlarmStatusRecord):
-                        last_record_is_status = True
 
                 print(
                     f"Door status: {[repr(panel.lock_status(i+1)) for i in range(panel.nr_of_locks)]}:"
@@ -52,12 +63,12 @@ def main():
                     f"Aux status: {[repr(panel.aux_out_status(i+1)) for i in range(panel.nr_aux_out)]}:"
                 )
 
-                if last_record_is_status:
-                    time.sleep(9)
-
+                stats = poller.stats
+                print(
+                    f"Next poll in {stats.interval:.1f}s, cadence {stats.cadence:.2f}s, "
+                    f"event latency {stats.mean_event_latency:.2f}s (max {stats.max_event_latency:.2f}s)"
+                )
                 print("-" * 25)
-
-                time.sleep(1)
         except KeyboardInterrupt:
             pass
 
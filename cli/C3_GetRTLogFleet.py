@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+import logging
+import sys
+
+from c3 import C3Fleet
+from c3.core import C3DeviceInfo
+
+
+async def poll(fleet: C3Fleet):
+    async with fleet:
+        async for fleet_record in fleet.records():
+            print(f"Panel {fleet_record.serial_number} ({fleet_record.host}):")
+            print(repr(fleet_record.record))
+            print("-" * 25)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("hosts", nargs="+", help="C3 panel IP addresses or host names")
+    parser.add_argument("--password", help="Password")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=50,
+        help="Maximum number of panels polled at the same moment",
+    )
+    parser.add_argument(
+        "--debug",
+        action=argparse.BooleanOptionalAction,
+        help="Enable verbose debug output",
+    )
+    args = parser.parse_args()
+
+    fleet = C3Fleet(
+        [C3DeviceInfo(host) for host in args.hosts],
+        password=args.password,
+        max_concurrency=args.concurrency,
+    )
+
+    if args.debug:
+        fleet.log.addHandler(logging.StreamHandler(sys.stdout))
+        fleet.log.setLevel(logging.DEBUG)
+
+    try:
+        asyncio.run(poll(fleet))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+import socket
+
+import pytest
+
+
+def _recv_into(sock_mock):
+    """Serve recv_into calls from the data configured as side effect of the recv mock."""
+    pending = bytearray()
+
+    def recv_into(buffer, nbytes=0):
+        if not pending:
+            try:
+                pending.extend(sock_mock.recv(nbytes or len(buffer)))
+            except StopIteration as ex:
+                raise socket.timeout() from ex
+        size = min(len(pending), nbytes or len(buffer))
+        buffer[:size] = pending[:size]
+        del pending[:size]
+        return size
+
+    return recv_into
+
+
+@pytest.fixture
+def recv_into():
+    """Factory of a recv_into side effect for a mocked socket, see _recv_into."""
+    return _recv_into
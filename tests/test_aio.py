@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+
+from c3 import consts, controldevice, rtlog
+from c3.aio import AsyncC3
+from c3.core import ReplyError
+from c3.simulator import PanelSimulator
+
+
+async def _serve_replies(replies: list[bytes]):
+    """Start a TCP server that answers every request with the next reply, split in two segments."""
+
+    async def handle(reader, writer):
+        for reply in replies:
+            request = await reader.read(1024)
+            if not request:
+                break
+            writer.write(reply[:3])
+            await writer.drain()
+            writer.write(reply[3:])
+            await writer.drain()
+        writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+def test_aio_connect_get_rt_log():
+    async def run():
+        server = await _serve_replies(
+            [
+                bytes.fromhex("aa01c80400eb6600005c7f55"),
+                bytes.fromhex(
+                    "aa01c84600eb6601007e53657269616c4e756d6265723d363430343136323130313638392c4c6f636b"
+                    "436f756e743d322c417578496e436f756e743d322c4175784f7574436f756e743d326a2255"
+                ),
+                bytes.fromhex(
+                    "aa01c81400eb66030003000000110000000001ff00f5c1ca2caa1f55"
+                ),
+                bytes.fromhex("aa01c80400eb6602005d1f55"),
+                bytes.fromhex("aa01c80400eb6602005d1f55"),
+            ]
+        )
+        port = server.sockets[0].getsockname()[1]
+
+        panel = AsyncC3("127.0.0.1", port)
+        assert await panel.connect() is True
+        assert panel.serial_number == "6404162101689"
+        assert panel.nr_of_locks == 2
+
+        logs = await panel.get_rt_log()
+        assert len(logs) == 1
+        assert isinstance(logs[0], rtlog.DoorAlarmStatusRecord)
+        assert logs[0].door_sensor_status(1) == consts.InOutStatus.CLOSED
+
+        await panel.control_device(controldevice.ControlDeviceCancelAlarms())
+        await panel.disconnect()
+        assert panel.is_connected() is False
+
+        server.close()
+        await server.wait_closed()
+
+    asyncio.run(run())
+
+
+def test_aio_connect_refused():
+    async def run():
+        server = await _serve_replies([])
+        port = server.sockets[0].getsockname()[1]
+        server.close()
+        await server.wait_closed()
+
+        panel = AsyncC3("127.0.0.1", port)
+        assert await panel.connect() is False
+
+    asyncio.run(run())
+
+
+def test_aio_simulator_errors():
+    async def run():
+        with PanelSimulator(table_sizes={"user": 3}) as simulator:
+            panel = AsyncC3(simulator.device_info)
+            assert await panel.connect() is True
+
+            users = await panel.get_device_data("user", ["Pin"], columnar=True)
+            assert list(users) == ["Pin"]
+            assert len(users["Pin"]) == 3
+
+            # An error reply does not end the connection
+            with pytest.raises(ReplyError):
+                await panel._send_receive(
+                    consts.Command.GETPARAM, ",".join(["LockCount"] * 31)
+                )
+            assert panel.is_connected() is True
+
+            # A closed connection is detected by the next request
+            simulator.drop_connections()
+            with pytest.raises(ConnectionError):
+                await panel.get_rt_log()
+            assert panel.is_connected() is False
+            await panel.disconnect()
+
+    asyncio.run(asyncio.wait_for(run(), 10))
@@ -0,0 +1,188 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from c3 import C3, consts
+from c3.cache import PanelCache, write_json_atomic
+from c3.simulator import PanelSimulator
+
+
+def test_cache_key():
+    assert PanelCache.key("DDG8130016092200401", "AC Ver 4.3.4") == (
+        "DDG8130016092200401/AC Ver 4.3.4"
+    )
+    assert PanelCache.key(None, "AC Ver 4.3.4") is None
+
+
+def test_cache_get_set_invalidate():
+    panel_cache = PanelCache()
+    panel_cache.set("sn/fw", "data_cfg", [{"user": "1"}])
+    panel_cache.set("sn/fw", "other", 1)
+    panel_cache.set(None, "data_cfg", [{"user": "1"}])
+
+    assert panel_cache.get("sn/fw", "data_cfg") == [{"user": "1"}]
+    assert panel_cache.get("sn/fw2", "data_cfg") is None
+    assert panel_cache.get(None, "data_cfg") is None
+
+    panel_cache.invalidate("sn/fw", "data_cfg")
+    assert panel_cache.get("sn/fw", "data_cfg") is None
+    assert panel_cache.get("sn/fw", "other") == 1
+
+    # A panel that is not identified does not invalidate the other panels
+    panel_cache.invalidate(None)
+    assert panel_cache.get("sn/fw", "other") == 1
+
+    panel_cache.clear()
+    assert panel_cache.get("sn/fw", "other") is None
+
+
+def test_cache_invalidate_unidentified_panel():
+    panel_cache = PanelCache()
+    panel_cache.set("SN1/FW", "data_cfg", [{"user": "1"}])
+    C3("10.0.0.9", panel_cache=panel_cache).invalidate_cache()
+    assert panel_cache.get("SN1/FW", "data_cfg") == [{"user": "1"}]
+
+
+def test_cache_ttl():
+    panel_cache = PanelCache(ttl=0.05)
+    panel_cache.set("sn/fw", "data_cfg", "value")
+    assert panel_cache.get("sn/fw", "data_cfg") == "value"
+    time.sleep(0.1)
+    assert panel_cache.get("sn/fw", "data_cfg") is None
+    assert panel_cache.get("sn/fw", "data_cfg", ttl=10) == "value"
+
+
+def test_cache_persistence(tmp_path):
+    path = str(tmp_path / "c3_cache.json")
+    panel_cache = PanelCache(path)
+    panel_cache.set("sn/fw", "data_cfg", [{"user": "1", "UID": "i1"}])
+
+    assert PanelCache(path).get("sn/fw", "data_cfg") == [{"user": "1", "UID": "i1"}]
+
+    with open(path, "w", encoding="utf-8") as cache_file:
+        cache_file.write("{corrupt")
+    assert PanelCache(path).get("sn/fw", "data_cfg") is None
+
+
+def test_cache_capabilities(tmp_path):
+    path = str(tmp_path / "c3_cache.json")
+    with PanelSimulator(session=False, rtlog_binary=False) as simulator:
+        panel = C3(simulator.host, simulator.port, panel_cache=PanelCache(path))
+        assert panel.connect() is True
+        assert panel.get_rt_log() == []
+        panel.get_rt_log()
+        panel.disconnect()
+        assert simulator.requests[consts.Command.CONNECT_SESSION] == 1
+        assert simulator.requests[consts.Command.GETPARAM] == 1
+        assert simulator.requests[consts.Command.RTLOG_BINARY] == 1
+
+        # A new instance connects with the known handshake and RT log format right away
+        panel = C3(simulator.host, simulator.port, panel_cache=PanelCache(path))
+        assert panel.connect() is True
+        assert panel.serial_number == simulator.serial_number
+        assert panel.nr_of_locks == 4
+        panel.get_rt_log()
+        panel.disconnect()
+        assert simulator.requests[consts.Command.CONNECT_SESSION] == 1
+        assert simulator.requests[consts.Command.CONNECT_SESSION_LESS] == 2
+        assert simulator.requests[consts.Command.GETPARAM] == 1
+        assert simulator.requests[consts.Command.RTLOG_BINARY] == 1
+        assert simulator.requests[consts.Command.RTLOG_KEYVALUE] == 2
+
+
+def test_cache_capabilities_connect_failure(tmp_path):
+    path = str(tmp_path / "c3_cache.json")
+    panel_cache = PanelCache(path)
+    panel_cache.set("OTHER/1.0", "data_cfg", [{"user": "1"}])
+    with PanelSimulator(session=False, password="pw") as simulator:
+        panel = C3(simulator.host, simulator.port, panel_cache=panel_cache)
+        assert panel.connect("pw") is True
+        panel.disconnect()
+
+        # A wrong password does not invalidate the cached session mode, nor other entries
+        panel = C3(simulator.host, simulator.port, panel_cache=panel_cache)
+        assert panel.connect("bad") is False
+        assert panel_cache.get("OTHER/1.0", "data_cfg") == [{"user": "1"}]
+        assert PanelCache(path).get("OTHER/1.0", "data_cfg") == [{"user": "1"}]
+        assert panel._panel_cache_key() is not None
+
+        panel = C3(simulator.host, simulator.port, panel_cache=panel_cache)
+        assert panel.connect("pw") is True
+        assert simulator.requests[consts.Command.CONNECT_SESSION] == 1
+        panel.disconnect()
+
+
+def test_cache_device_params():
+    with PanelSimulator() as simulator:
+        panel = C3(simulator.device_info)
+        panel.param_cache_ttl = 0.1
+        assert panel.connect() is True
+        getparam_requests = simulator.requests[consts.Command.GETPARAM]
+        misses = panel.param_cache_stats.misses
+
+        # Static parameters are known from the connect
+        assert panel.get_device_param(["~SerialNumber", "LockCount"]) == {
+            "~SerialNumber": simulator.serial_number,
+            "LockCount": "4",
+        }
+        assert panel.get_device_param(["NetMask"]) == {"NetMask": "255.255.255.0"}
+        assert panel.get_device_param(["NetMask"]) == {"NetMask": "255.255.255.0"}
+        assert simulator.requests[consts.Command.GETPARAM] == getparam_requests + 1
+        assert panel.param_cache_stats.hits == 3
+        assert panel.param_cache_stats.misses == misses + 1
+
+        # Writing a parameter discards its cached value
+        panel.set_device_param({"NetMask": "255.255.0.0"}, validate=True)
+        assert simulator.parameters["NetMask"] == "255.255.0.0"
+        assert panel.get_device_param(["NetMask"]) == {"NetMask": "255.255.0.0"}
+        assert simulator.requests[consts.Command.GETPARAM] == getparam_requests + 2
+
+        # Configuration parameters expire, static parameters do not
+        time.sleep(0.15)
+        panel.get_device_param(["NetMask", "LockCount"])
+        assert simulator.requests[consts.Command.GETPARAM] == getparam_requests + 3
+        assert panel.param_cache_stats.misses == misses + 3
+        panel.get_device_param(["LockCount"], refresh=True)
+        assert simulator.requests[consts.Command.GETPARAM] == getparam_requests + 4
+
+        with pytest.raises(ValueError):
+            panel.set_device_param({"LockCount": "2"}, validate=True)
+        panel.disconnect()
+
+        # By default, only static parameters are cached
+        panel = C3(simulator.device_info)
+        assert panel.connect() is True
+        getparam_requests = simulator.requests[consts.Command.GETPARAM]
+        panel.get_device_param(["NetMask", "LockCount"])
+        panel.get_device_param(["NetMask", "LockCount"])
+        assert simulator.requests[consts.Command.GETPARAM] == getparam_requests + 2
+        assert panel.param_cache_stats.hits == 2
+        panel.disconnect()
+
+
+def test_cache_write_json_atomic(tmp_path):
+    path = str(tmp_path / "state.json")
+    write_json_atomic(path, {"a": [1, 2]})
+    write_json_atomic(path, {"b": 3})
+    with open(path, encoding="utf-8") as json_file:
+        assert json.load(json_file) == {"b": 3}
+    assert [p.name for p in tmp_path.iterdir()] == ["state.json"]
+
+    with pytest.raises(OSError):
+        write_json_atomic(str(tmp_path / "missing" / "state.json"), {})
+
+
+def test_cache_write_json_atomic_concurrent(tmp_path):
+    path = str(tmp_path / "state.json")
+
+    def write(i: int):
+        for _ in range(20):
+            write_json_atomic(path, {"writer": i, "data": list(range(1000))})
+
+    with ThreadPoolExecutor(4) as executor:
+        list(executor.map(write, range(4)))
+    with open(path, encoding="utf-8") as json_file:
+        assert json.load(json_file)["data"] == list(range(1000))
+    assert [p.name for p in tmp_path.iterdir()] == ["state.json"]
@@ -20,3 +20,17 @@ def test_control_operation():
 def test_door_sensor_status():
     assert InOutStatus.UNKNOWN == InOutStatus(0)
     assert InOutStatus.CLOSED == InOutStatus(1)
+
+
+def test_lookup_tables():
+    for table, enum, unknown in (
+        (VerificationModeTable, VerificationMode, VerificationMode.OTHER),
+        (EventTypeTable, EventType, EventType.UNKNOWN_UNSUPPORTED),
+        (InOutDirectionTable, InOutDirection, InOutDirection.UNKNOWN_UNSUPPORTED),
+    ):
+        assert len(table) == 256
+        for value, member in enumerate(table):
+            try:
+                assert member is enum(value)
+            except ValueError:
+                assert member is unknown
@@ -1,3 +1,4 @@
+import socket
 import time
 from datetime import datetime
 from unittest import mock
@@ -5,7 +6,8 @@ from unittest import mock
 import pytest
 
 from c3 import consts, controldevice, rtlog
-from c3.core import C3
+from c3.cache import PanelCache
+from c3.core import C3, C3DeviceInfo, _DataTableCfg
 
 
 @pytest.fixture
@@ -40,7 +42,11 @@ def data_cfg_response_data() -> str:
 
 
 def test_core_init():
-    panel = C3("localhost")
+    with mock.patch("socket.socket") as mock_socket:
+        panel = C3("localhost")
+        # The socket is created on connect
+        mock_socket.assert_not_called()
+        assert panel.is_connected() is False
     assert panel.nr_of_locks == 0
     assert panel.nr_aux_in == 0
     assert panel.nr_aux_out == 0
@@ -49,14 +55,28 @@ def test_core_init():
     assert panel.aux_out_status(2) == consts.InOutStatus.UNKNOWN
 
 
-def test_core_set_device_datetime():
+def test_core_connect_refused():
+    with mock.patch("socket.socket") as mock_socket:
+        panel = C3("localhost")
+        mock_socket.return_value.connect.side_effect = ConnectionRefusedError()
+        assert panel.connect() is False
+        assert panel.connect() is False
+        # The socket of every failed attempt is closed
+        assert mock_socket.return_value.close.call_count == 2
+        assert panel.is_connected() is False
+
+
+def test_core_set_device_datetime(recv_into):
     with mock.patch("socket.socket") as mock_socket:
         panel = C3("localhost")
         mock_socket.return_value.send.return_value = 8
+        mock_socket.return_value.recv_into.side_effect = recv_into(
+            mock_socket.return_value
+        )
         mock_socket.return_value.recv.side_effect = [
             bytes.fromhex("aa01c80400"),
             bytes.fromhex("d18a0000915255"),
-            bytes.fromhex("aa01c80400"),
+            bytes.fromhex("aa01c80200"),
             bytes.fromhex("d18a000055"),
             bytes.fromhex("aa01c80400"),
             bytes.fromhex("d18a0003d15355"),
@@ -72,10 +92,13 @@ def test_core_set_device_datetime():
         )
 
 
-def test_core_get_device_param():
+def test_core_get_device_param(recv_into):
     with mock.patch("socket.socket") as mock_socket:
         panel = C3("localhost")
         mock_socket.return_value.send.return_value = 8
+        mock_socket.return_value.recv_into.side_effect = recv_into(
+            mock_socket.return_value
+        )
         mock_socket.return_value.recv.side_effect = [
             bytes.fromhex("aa01c80400"),
             bytes.fromhex("d18a0000915255"),
@@ -102,10 +125,47 @@ def test_core_get_device_param():
         assert params["AuxOutCount"] == "2"
 
 
-def test_core_get_device_data_cfg(data_cfg_response_data):
+def test_core_get_device_param_short_reads(recv_into):
     with mock.patch("socket.socket") as mock_socket:
         panel = C3("localhost")
         mock_socket.return_value.send.return_value = 8
+        mock_socket.return_value.recv_into.side_effect = recv_into(
+            mock_socket.return_value
+        )
+        mock_socket.return_value.recv.side_effect = [
+            bytes.fromhex("aa01c80400"),
+            bytes.fromhex("d18a0000915255"),
+            bytes.fromhex("aa01c80000"),
+            bytes.fromhex("d18a55"),
+        ]
+
+        assert panel.connect() is True
+
+        # The reply arrives in multiple TCP segments
+        mock_socket.return_value.recv.side_effect = [
+            bytes.fromhex("aa01c8"),
+            bytes.fromhex("4800d18a02007e5a4b465056657273696f6e3d31302c"),
+            bytes.fromhex("4c6f636b436f756e743d322c526561646572436f756e743d342c"),
+            socket.timeout(),
+            bytes.fromhex("417578496e436f756e743d322c4175784f7574436f756e743d32"),
+            bytes.fromhex("783f"),
+            bytes.fromhex("55"),
+        ]
+        params = panel.get_device_param(
+            ["~ZKFPVersion", "LockCount", "ReaderCount", "AuxInCount", "AuxOutCount"]
+        )
+        assert params["~ZKFPVersion"] == "10"
+        assert params["LockCount"] == "2"
+        assert params["AuxOutCount"] == "2"
+
+
+def test_core_get_device_data_cfg(data_cfg_response_data, recv_into):
+    with mock.patch("socket.socket") as mock_socket:
+        panel = C3("localhost")
+        mock_socket.return_value.send.return_value = 8
+        mock_socket.return_value.recv_into.side_effect = recv_into(
+            mock_socket.return_value
+        )
         mock_socket.return_value.recv.side_effect = [
             bytes.fromhex("aa00c80400"),
             bytes.fromhex("4ac70100ee3d55"),
@@ -133,10 +193,13 @@ def test_core_get_device_data_cfg(data_cfg_response_data):
         assert user_cfg.fields[7].index == 8
 
 
-def test_core_get_device_data_user(data_cfg_response_data):
+def test_core_get_device_data_user(data_cfg_response_data, recv_into):
     with mock.patch("socket.socket") as mock_socket:
         panel = C3("localhost")
         mock_socket.return_value.send.return_value = 8
+        mock_socket.return_value.recv_into.side_effect = recv_into(
+            mock_socket.return_value
+        )
         mock_socket.return_value.recv.side_effect = [
             bytes.fromhex("aa00c80400"),
             bytes.fromhex("4ac70100ee3d55"),
@@ -166,10 +229,48 @@ def test_core_get_device_data_user(data_cfg_response_data):
         assert user_data[1]["EndTime"] == 20230303
 
 
-def test_core_connect_response_incomplete():
+def test_core_get_device_data_user_columnar(data_cfg_response_data, recv_into):
+    with mock.patch("socket.socket") as mock_socket:
+        panel = C3("localhost")
+        mock_socket.return_value.send.return_value = 8
+        mock_socket.return_value.recv_into.side_effect = recv_into(
+            mock_socket.return_value
+        )
+        mock_socket.return_value.recv.side_effect = [
+            bytes.fromhex("aa00c80400"),
+            bytes.fromhex("4ac70100ee3d55"),
+            bytes.fromhex("aa01c80200"),
+            bytes.fromhex("4ac797c355"),
+        ]
+
+        assert panel.connect() is True
+        mock_socket.return_value.recv.side_effect = [
+            bytes.fromhex("aa00c8b004"),
+            bytes.fromhex(data_cfg_response_data),
+            bytes.fromhex("aa00c83d00"),
+            bytes.fromhex(
+                "4ac70400"
+                "0109010203040506070809"
+                "01010387D6120376543200010001000100000100"
+                "010203a1a3a303b1b2b3000100042a893401049fb03401000100"
+                "b44b55"
+            ),
+        ]
+
+        user_data = panel.get_device_data(table_name="user", columnar=True)
+        assert len(user_data) == 9
+        assert user_data["UID"] == [1, 2]
+        assert user_data["CardNo"][0] == 1234567
+        assert user_data["EndTime"] == [0, 20230303]
+
+
+def test_core_connect_response_incomplete(recv_into):
     with mock.patch("socket.socket") as mock_socket:
         panel = C3("localhost")
         mock_socket.return_value.send.return_value = 8
+        mock_socket.return_value.recv_into.side_effect = recv_into(
+            mock_socket.return_value
+        )
         mock_socket.return_value.recv.side_effect = [
             bytes.fromhex("aa01c80400"),
             bytes.fromhex("d18a0000915255"),
@@ -187,16 +288,20 @@ def test_core_connect_response_incomplete():
             panel.get_device_param([])
 
 
-def test_core_connect_response_no_data():
+def test_core_connect_response_no_data(recv_into):
     with mock.patch("socket.socket") as mock_socket:
         panel = C3("localhost")
         panel.receive_retries = 1
         mock_socket.return_value.send.return_value = 8
+        mock_socket.return_value.recv_into.side_effect = recv_into(
+            mock_socket.return_value
+        )
         mock_socket.return_value.recv.side_effect = [
             bytes.fromhex("aa01c80400"),
             bytes.fromhex("d18a0000915255"),
-            bytes(),
-            bytes(),
+            # No parameters in the reply to the initialization
+            bytes.fromhex("aa01c80400"),
+            bytes.fromhex("d18a0000915255"),
         ]
 
         assert panel.connect() is True
@@ -205,14 +310,19 @@ def test_core_connect_response_no_data():
             bytes.fromhex("aa01c80800"),
             bytes(),
         ]
-        with pytest.raises(ValueError):
+        # The panel closed the connection in the middle of the reply
+        with pytest.raises(ConnectionError):
             panel.get_device_param([])
+        assert panel.is_connected() is False
 
 
-def test_core_connect_session_less():
+def test_core_connect_session_less(recv_into):
     with mock.patch("socket.socket") as mock_socket:
         panel = C3("localhost")
         mock_socket.return_value.send.return_value = 8
+        mock_socket.return_value.recv_into.side_effect = recv_into(
+            mock_socket.return_value
+        )
         mock_socket.return_value.recv.side_effect = [
             # Reject response to session connect attempt
             bytes.fromhex("aa01c90100"),
@@ -236,10 +346,17 @@ def test_core_connect_session_less():
         assert panel.nr_aux_in == 4
 
 
-def test_core_connect_password():
+def test_core_connect_password(recv_into):
     with mock.patch("socket.socket") as mock_socket:
         panel = C3("localhost")
-        mock_socket.return_value.send.return_value = 12
+        # The frames are sent from a reused buffer, keep a copy
+        sent = []
+        mock_socket.return_value.send.side_effect = lambda data: sent.append(
+            bytes(data)
+        ) or len(data)
+        mock_socket.return_value.recv_into.side_effect = recv_into(
+            mock_socket.return_value
+        )
         mock_socket.return_value.recv.side_effect = [
             bytes.fromhex("aa01c80400"),
             bytes.fromhex("1420fefe4c5e55"),
@@ -248,16 +365,17 @@ def test_core_connect_password():
         ]
 
         assert panel.connect("banana123") is True
-        assert mock_socket.return_value.send.call_count == 2
-        mock_socket.return_value.send.assert_any_call(
-            bytes.fromhex("aa01760d00fefefefe62616E616E61313233961955")
-        )
+        assert len(sent) == 2
+        assert sent[0] == bytes.fromhex("aa01760d00fefefefe62616E616E61313233961955")
 
 
-def test_core_lock_status():
+def test_core_lock_status(recv_into):
     with mock.patch("socket.socket") as mock_socket:
         panel = C3("localhost")
         mock_socket.return_value.send.return_value = 8
+        mock_socket.return_value.recv_into.side_effect = recv_into(
+            mock_socket.return_value
+        )
         mock_socket.return_value.recv.side_effect = [
             bytes.fromhex("aa01c80400"),
             bytes.fromhex("eb6600005c7f55"),
@@ -290,10 +408,13 @@ def test_core_lock_status():
         assert panel.lock_status(4) == consts.InOutStatus.UNKNOWN
 
 
-def test_core_aux_in_status():
+def test_core_aux_in_status(recv_into):
     with mock.patch("socket.socket") as mock_socket:
         panel = C3("localhost")
         mock_socket.return_value.send.return_value = 8
+        mock_socket.return_value.recv_into.side_effect = recv_into(
+            mock_socket.return_value
+        )
         mock_socket.return_value.recv.side_effect = [
             bytes.fromhex("aa01c80400"),
             bytes.fromhex("eb6600005c7f55"),
@@ -334,10 +455,13 @@ def test_core_aux_in_status():
         assert panel.aux_in_status(2) == consts.InOutStatus.OPEN
 
 
-def test_core_aux_out_status():
+def test_core_aux_out_status(recv_into):
     with mock.patch("socket.socket") as mock_socket:
         panel = C3("localhost")
         mock_socket.return_value.send.return_value = 8
+        mock_socket.return_value.recv_into.side_effect = recv_into(
+            mock_socket.return_value
+        )
         mock_socket.return_value.recv.side_effect = [
             bytes.fromhex("aa01c80400"),
             bytes.fromhex("eb6600005c7f55"),
@@ -378,10 +502,13 @@ def test_core_aux_out_status():
         assert panel.aux_out_status(2) == consts.InOutStatus.CLOSED
 
 
-def test_core_aux_out_open_close():
+def test_core_aux_out_open_close(recv_into):
     with mock.patch("socket.socket") as mock_socket:
         panel = C3("localhost")
         mock_socket.return_value.send.return_value = 8
+        mock_socket.return_value.recv_into.side_effect = recv_into(
+            mock_socket.return_value
+        )
         mock_socket.return_value.recv.side_effect = [
             bytes.fromhex("aa01c80400"),
             bytes.fromhex("eb6600005c7f55"),
@@ -421,10 +548,13 @@ def test_core_aux_out_open_close():
         assert panel.aux_out_status(2) == consts.InOutStatus.CLOSED
 
 
-def test_core_door_settings():
+def test_core_door_settings(recv_into):
     with mock.patch("socket.socket") as mock_socket:
         panel = C3("localhost")
         mock_socket.return_value.send.return_value = 8
+        mock_socket.return_value.recv_into.side_effect = recv_into(
+            mock_socket.return_value
+        )
         mock_socket.return_value.recv.side_effect = [
             bytes.fromhex("aa01c80400"),
             bytes.fromhex("4d9cfefe9f2655"),
@@ -439,17 +569,13 @@ def test_core_door_settings():
         assert panel.nr_of_locks == 2
 
         mock_socket.return_value.recv.side_effect = [
-            bytes.fromhex("aa00c83d00"),
+            bytes.fromhex("aa01c87600"),
             bytes.fromhex(
-                "4d9c08ff446f6f723153656e736f72547970653d322c446f"
+                "4d9c00ff446f6f723153656e736f72547970653d322c446f"
                 "6f723144726976657274696d653d312c446f6f7231446574"
-                "6563746f7274696d653d323530b18d55"
-            ),
-            bytes.fromhex("aa00c83c00"),
-            bytes.fromhex(
-                "4d9c09ff446f6f723253656e736f72547970653d302c446f"
-                "6f723244726976657274696d653d352c446f6f7232446574"
-                "6563746f7274696d653d3135158355"
+                "6563746f7274696d653d3235302c446f6f723253656e736f"
+                "72547970653d302c446f6f723244726976657274696d653d"
+                "352c446f6f72324465746563746f7274696d653d3135a3a655"
             ),
         ]
 
@@ -461,10 +587,47 @@ def test_core_door_settings():
         assert panel.door_settings(2).door_alarm_timeout == 15
 
 
-def test_core_update_inout_status_exit_button():
+def test_core_late_reply_discarded(recv_into):
     with mock.patch("socket.socket") as mock_socket:
         panel = C3("localhost")
         mock_socket.return_value.send.return_value = 8
+        mock_socket.return_value.recv_into.side_effect = recv_into(
+            mock_socket.return_value
+        )
+        mock_socket.return_value.recv.side_effect = [
+            bytes.fromhex("aa01c80400"),
+            bytes.fromhex("4d9cfefe9f2655"),
+            bytes.fromhex("aa01c82a00"),
+            bytes.fromhex(
+                "4d9cfffe4c6f636b436f756e743d322c417578496e436f75"
+                "6e743d322c4175784f7574436f756e743d32bb5755"
+            ),
+        ]
+        assert panel.connect() is True
+
+        # The panel returns the request number, a reply to an earlier request is discarded
+        mock_socket.return_value.recv.side_effect = [
+            bytes(
+                C3._construct_message(
+                    None, None, consts.C3_REPLY_OK, b"\x4d\x9c\xff\xfeLockCount=2"
+                )
+            ),
+            bytes(
+                C3._construct_message(
+                    None, None, consts.C3_REPLY_OK, b"\x4d\x9c\x00\xffIPAddress=1.2.3.4"
+                )
+            ),
+        ]
+        assert panel.get_device_param(["IPAddress"]) == {"IPAddress": "1.2.3.4"}
+
+
+def test_core_update_inout_status_exit_button(recv_into):
+    with mock.patch("socket.socket") as mock_socket:
+        panel = C3("localhost")
+        mock_socket.return_value.send.return_value = 8
+        mock_socket.return_value.recv_into.side_effect = recv_into(
+            mock_socket.return_value
+        )
         mock_socket.return_value.recv.side_effect = [
             bytes.fromhex("aa01c80400"),
             bytes.fromhex("4d9cfefe9f2655"),
@@ -482,7 +645,7 @@ def test_core_update_inout_status_exit_button():
 
         mock_socket.return_value.recv.side_effect = [
             bytes.fromhex("aa00c81400"),
-            bytes.fromhex("4d9c06ff03000000111000000001ff0013ecfd2d4ae555"),
+            bytes.fromhex("4d9c00ff03000000111000000001ff0013ecfd2daa6c55"),
         ]
 
         panel.get_rt_log()
@@ -491,18 +654,14 @@ def test_core_update_inout_status_exit_button():
 
         mock_socket.return_value.recv.side_effect = [
             bytes.fromhex("aa00c81400"),
-            bytes.fromhex("4d9c07ff0000000000000000c802ca0215ecfd2d710f55"),
-            bytes.fromhex("aa00c83d00"),
+            bytes.fromhex("4d9c01ff0000000000000000c802ca0215ecfd2d918655"),
+            bytes.fromhex("aa01c87600"),
             bytes.fromhex(
-                "4d9c08ff446f6f723153656e736f72547970653d322c446f"
+                "4d9c02ff446f6f723153656e736f72547970653d322c446f"
                 "6f723144726976657274696d653d312c446f6f7231446574"
-                "6563746f7274696d653d323530b18d55"
-            ),
-            bytes.fromhex("aa00c83c00"),
-            bytes.fromhex(
-                "4d9c09ff446f6f723253656e736f72547970653d302c446f"
-                "6f723244726976657274696d653d312c446f6f7232446574"
-                "6563746f7274696d653d3135507055"
+                "6563746f7274696d653d3235302c446f6f723253656e736f"
+                "72547970653d302c446f6f723244726976657274696d653d"
+                "312c446f6f72324465746563746f7274696d653d313512d255"
             ),
         ]
 
@@ -518,7 +677,7 @@ def test_core_update_inout_status_exit_button():
 
         mock_socket.return_value.recv.side_effect = [
             bytes.fromhex("aa00c81400"),
-            bytes.fromhex("4d9c06ff03000000111000000001ff0013ecfd2d4ae555"),
+            bytes.fromhex("4d9c03ff03000000111000000001ff0013ecfd2d5a2855"),
         ]
 
         # Subsequent DoorAlarmStatus logs with door 2 status 'unknown' are ignored,
@@ -526,3 +685,146 @@ def test_core_update_inout_status_exit_button():
         panel.get_rt_log()
         assert panel.lock_status(1) == consts.InOutStatus.CLOSED
         assert panel.lock_status(2) == consts.InOutStatus.CLOSED
+
+
+def test_core_auto_close_rescheduled():
+    panel = C3("localhost")
+    panel._set_lock_status(1, consts.InOutStatus.OPEN, auto_close=1)
+    with panel._lock:
+        # The timer fires while an open event is processed, the event reschedules it
+        panel._schedule_auto_close(("lock", 1), 0, panel._auto_close_lock, 1)
+        time.sleep(0.1)
+        panel._set_lock_status(1, consts.InOutStatus.OPEN, auto_close=60)
+    time.sleep(0.1)
+    assert panel.lock_status(1) == consts.InOutStatus.OPEN
+    assert ("lock", 1) in panel._auto_close_timers
+
+    panel._set_lock_status(1, consts.InOutStatus.CLOSED)
+    assert not panel._auto_close_timers
+
+
+def test_core_iter_device_data():
+    cfg = _DataTableCfg({"templatev10": "10", "Size": "i1", "Template": "B6"})
+    message = bytes.fromhex("0a020106" "0102" "020400" "03a1a2a3" "0100")
+    records = list(C3._iter_device_data(cfg, memoryview(message)))
+    assert records == [
+        {"Size": 2, "Template": bytes.fromhex("0400")},
+        {"Size": 0xA3A2A1, "Template": b"\x00"},
+    ]
+
+    with pytest.raises(ValueError):
+        list(C3._iter_device_data(cfg, message[:-1]))
+    with pytest.raises(ValueError):
+        list(C3._iter_device_data(cfg, b"\x09" + message[1:]))
+    # Truncated at a field boundary, or in the header
+    with pytest.raises(ValueError):
+        list(C3._iter_device_data(cfg, message[:-2]))
+    with pytest.raises(ValueError):
+        list(C3._iter_device_data(cfg, message[:3]))
+    with pytest.raises(ValueError):
+        list(C3._iter_device_data(cfg, b""))
+
+
+def test_core_parse_device_data_columnar_empty():
+    cfg = _DataTableCfg({"templatev10": "10", "Size": "i1", "Template": "B6"})
+    message = bytes.fromhex("0a020106")
+    assert C3._parse_device_data(cfg, message, columnar=True) == {
+        "Size": [],
+        "Template": [],
+    }
+    assert C3._parse_device_data(cfg, message, columnar=True, field_names=["Size"]) == {
+        "Size": []
+    }
+    assert C3._parse_device_data(cfg, message) == []
+
+
+def test_core_get_device_data_cfg_cached(tmp_path, data_cfg_response_data, recv_into):
+    user_data_response = [
+        bytes.fromhex("aa00c83d00"),
+        bytes.fromhex(
+            "4ac70400"
+            "0109010203040506070809"
+            "01010387D6120376543200010001000100000100"
+            "010203a1a3a303b1b2b3000100042a893401049fb03401000100"
+            "b44b55"
+        ),
+    ]
+    panel_cache = PanelCache(str(tmp_path / "c3_cache.json"))
+    device_info = C3DeviceInfo(
+        host="localhost",
+        serial_number="DDG8130016092200401",
+        firmware_version="AC Ver 4.3.4 Apr 28 2017",
+    )
+
+    with mock.patch("socket.socket") as mock_socket:
+        panel = C3(device_info, panel_cache=panel_cache)
+        mock_socket.return_value.send.return_value = 8
+        mock_socket.return_value.recv_into.side_effect = recv_into(
+            mock_socket.return_value
+        )
+        mock_socket.return_value.recv.side_effect = [
+            bytes.fromhex("aa00c80400"),
+            bytes.fromhex("4ac70100ee3d55"),
+            bytes.fromhex("aa01c80200"),
+            bytes.fromhex("4ac797c355"),
+        ]
+        assert panel.connect() is True
+
+        mock_socket.return_value.recv.side_effect = [
+            bytes.fromhex("aa00c8b004"),
+            bytes.fromhex(data_cfg_response_data),
+        ] + user_data_response
+        assert len(panel.get_device_data(table_name="user")) == 2
+
+        # The second request only retrieves the data
+        mock_socket.return_value.recv.side_effect = list(user_data_response)
+        assert len(panel.get_device_data(table_name="user")) == 2
+
+        # A new client for the same panel uses the configuration of the persisted cache
+        panel = C3(device_info, panel_cache=PanelCache(str(tmp_path / "c3_cache.json")))
+        mock_socket.return_value.recv.side_effect = [
+            bytes.fromhex("aa00c80400"),
+            bytes.fromhex("4ac70100ee3d55"),
+            bytes.fromhex("aa01c80200"),
+            bytes.fromhex("4ac797c355"),
+        ]
+        assert panel.connect() is True
+        mock_socket.return_value.recv.side_effect = list(user_data_response)
+        user_data = panel.get_device_data(table_name="user")
+        assert user_data[1]["EndTime"] == 20230303
+
+        # After invalidation, the configuration is retrieved again
+        panel.invalidate_cache()
+        mock_socket.return_value.recv.side_effect = [
+            bytes.fromhex("aa00c8b004"),
+            bytes.fromhex(data_cfg_response_data),
+        ] + user_data_response
+        assert len(panel.get_device_data(table_name="user")) == 2
+
+
+def test_core_delete_device_data_request():
+    cfg = _DataTableCfg(
+        {"transaction": "5", "Cardno": "i1", "Pin": "i2", "Time_second": "i7"}
+    )
+    assert (
+        C3._get_delete_device_data_request(
+            cfg, [{"Time_second": 1}, {"Pin": 2, "Cardno": 3}]
+        )
+        == b"\x05Time_second=1\r\nPin=2\tCardno=3"
+    )
+    assert C3._get_delete_device_data_request(cfg, [{}]) == b"\x05"
+
+    with pytest.raises(ValueError):
+        C3._get_delete_device_data_request(cfg, [{"UID": 1}])
+
+
+def test_core_chunk_parameters():
+    names = [f"Door{nr % 4 + 1}Drivertime" for nr in range(65)]
+    chunks = C3._chunk_parameters(names)
+    assert [len(chunk) for chunk in chunks] == [30, 30, 5]
+    assert sum(chunks, []) == names
+    assert C3._chunk_parameters([]) == []
+
+    with mock.patch.object(C3, "max_param_request_size", 40):
+        chunks = C3._chunk_parameters(names[:5])
+    assert [len(",".join(chunk)) for chunk in chunks] == [31, 31, 15]
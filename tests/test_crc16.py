@@ -67,3 +67,27 @@ def test_crc_disconnect():
     assert 0x0FDE == crc.crc16([0x01, 0x02, 0x04, 0x00, 0x3A, 0xCF, 0x02, 0x00])
     # Request
     assert 0x6A75 == crc.crc16([0x01, 0xC8, 0x04, 0x00, 0x3E, 0xE3, 0x03, 0x00])
+
+
+def test_crc_table_matches_builder():
+    for value in range(256):
+        builder = crc.Crc16Builder(0x1234)
+        builder.add_byte(value)
+        assert builder.crc == crc.crc16_buffer(bytes([value]), 0x1234)
+
+
+def test_crc_buffer_types():
+    data = bytes.fromhex("01c8140078e5020003000000110000000001ff0000337521")
+    assert 0xCD2C == crc.crc16_buffer(data)
+    assert 0xCD2C == crc.crc16_buffer(bytearray(data))
+    assert 0xCD2C == crc.crc16_buffer(memoryview(data))
+    assert 0xCD2C == crc.crc16(memoryview(data))
+
+
+def test_crc_incremental():
+    data = b"0123456789ABCDEF"
+    engine = crc.Crc16()
+    for i in range(0, len(data), 3):
+        engine.update(memoryview(data)[i : i + 3])
+    assert 0x0F65 == engine.crc
+    assert 0x0F65 == crc.crc16_buffer(data[7:], crc.crc16_buffer(data[:7]))
@@ -0,0 +1,71 @@
+import time
+from unittest import mock
+
+from c3 import C3
+from c3.core import C3DeviceInfo
+from c3.discovery import DiscoveryCache, iter_discover, parse_discovery_reply
+from c3.simulator import PanelSimulator
+
+
+def test_discovery_reply():
+    simulator = PanelSimulator(serial_number="DGD9190019050335134")
+    device = parse_discovery_reply(simulator.discovery_reply())
+    assert device == C3DeviceInfo(
+        host=simulator.host,
+        mac=simulator.mac,
+        serial_number="DGD9190019050335134",
+        device_name=simulator.parameters["DeviceName"],
+        firmware_version=simulator.parameters["FirmVer"],
+    )
+    assert parse_discovery_reply(b"\xaa\x01\xc8") is None
+
+
+def test_discovery_subnet_sweep():
+    with PanelSimulator(discovery_port=0) as simulator:
+        start = time.monotonic()
+        devices = list(
+            iter_discover(
+                [], ["127.0.0.0/30"], timeout=0.3, port=simulator.discovery_port
+            )
+        )
+        assert time.monotonic() - start < 1
+        # The simulator replies on 127.0.0.1 only
+        assert [device.serial_number for device in devices] == [simulator.serial_number]
+
+    assert list(iter_discover([], None, timeout=0.1)) == []
+
+
+def test_discovery_cache(tmp_path):
+    path = str(tmp_path / "discovery.json")
+    panel1 = C3DeviceInfo("10.0.0.1", mac="00:17:61:c8:ec:01", serial_number="1")
+    panel2 = C3DeviceInfo("10.0.0.2", mac="00:17:61:C8:EC:02", serial_number="2")
+
+    cache = DiscoveryCache(path)
+    diff = cache.update([panel1, panel2])
+    assert diff.added == [panel1, panel2]
+    assert not cache.update([panel1, panel2])
+
+    # The IP address of a panel changed, persisted between runs
+    moved = C3DeviceInfo("10.0.0.12", mac="00:17:61:c8:ec:02", serial_number="2")
+    cache = DiscoveryCache(path)
+    assert cache.get("00:17:61:c8:ec:02") == panel2
+    diff = cache.update([panel1, moved])
+    assert diff.changed == [(panel2, moved)]
+    assert not diff.added and not diff.missing
+
+    assert not cache.update([moved], complete=False)
+    diff = cache.update([moved])
+    assert diff.missing == [panel1]
+    assert DiscoveryCache(path).devices == [moved]
+
+
+def test_discovery_c3_discover():
+    device = C3DeviceInfo("10.0.0.1", mac="00:17:61:c8:ec:01")
+    with mock.patch("c3.discovery.discover", return_value=[device]) as discover:
+        assert C3.discover(timeout=1) == [device]
+        discover.assert_called_once_with(None, None, 1)
+
+        panels = C3.discover("10.0.0.254", subnets=["10.1.0.0/24"], wrap=True)
+        discover.assert_called_with(["10.0.0.254"], ["10.1.0.0/24"], 2)
+        assert [panel.host for panel in panels] == ["10.0.0.1"]
+        assert panels[0].is_connected() is False
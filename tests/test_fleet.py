@@ -0,0 +1,122 @@
+import asyncio
+
+from c3 import consts, rtlog
+from c3.core import C3DeviceInfo
+from c3.fleet import C3Fleet
+
+CONNECT_REPLY = bytes.fromhex("aa01c80400eb6600005c7f55")
+INIT_REPLY = bytes.fromhex(
+    "aa01c84600eb6601007e53657269616c4e756d6265723d363430343136323130313638392c4c6f636b"
+    "436f756e743d322c417578496e436f756e743d322c4175784f7574436f756e743d326a2255"
+)
+RTLOG_REPLY = bytes.fromhex("aa01c81400eb66030003000000110000000001ff00f5c1ca2caa1f55")
+
+
+async def _serve_panel():
+    # The reply depends on the command, a reconnected panel is not initialized again
+    replies = {
+        consts.Command.CONNECT_SESSION: CONNECT_REPLY,
+        consts.Command.GETPARAM: INIT_REPLY,
+    }
+
+    async def handle(reader, writer):
+        request = await reader.read(1024)
+        while request:
+            writer.write(replies.get(request[2], RTLOG_REPLY))
+            await writer.drain()
+            request = await reader.read(1024)
+        writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+def test_fleet_merged_records():
+    async def run():
+        server = await _serve_panel()
+        port = server.sockets[0].getsockname()[1]
+        dead_server = await _serve_panel()
+        dead_port = dead_server.sockets[0].getsockname()[1]
+        dead_server.close()
+        await dead_server.wait_closed()
+
+        fleet = C3Fleet(
+            [
+                C3DeviceInfo("127.0.0.1", dead_port),
+                C3DeviceInfo("127.0.0.1", port),
+            ]
+        )
+        fleet.poll_interval = 0.01
+        fleet.reconnect_delay_min = 0.01
+
+        records = []
+        async with fleet:
+            async for record in fleet.records():
+                records.append(record)
+                if len(records) == 3:
+                    break
+        assert not fleet.is_running()
+
+        assert all(r.serial_number == "6404162101689" for r in records)
+        assert all(r.host == "127.0.0.1" for r in records)
+        assert all(isinstance(r.record, rtlog.DoorAlarmStatusRecord) for r in records)
+        assert not fleet.panels[0].is_connected()
+
+        server.close()
+        await server.wait_closed()
+
+    asyncio.run(asyncio.wait_for(run(), 10))
+
+
+def test_fleet_unexpected_error():
+    async def run():
+        server = await _serve_panel()
+        port = server.sockets[0].getsockname()[1]
+
+        fleet = C3Fleet([C3DeviceInfo("127.0.0.1", port)])
+        fleet.poll_interval = 0.01
+        fleet.reconnect_delay_min = 0.01
+        panel = fleet.panels[0]
+        get_rt_log = panel.get_rt_log
+        failures = []
+
+        async def failing_get_rt_log():
+            if not failures:
+                failures.append(True)
+                raise RuntimeError("Unexpected")
+            return await get_rt_log()
+
+        panel.get_rt_log = failing_get_rt_log
+
+        async with fleet:
+            async for record in fleet.records():
+                break
+        assert failures
+        assert fleet.poll_stats["127.0.0.1"].errors == 1
+
+        server.close()
+        await server.wait_closed()
+
+    asyncio.run(asyncio.wait_for(run(), 10))
+
+
+def test_fleet_records_end_on_stop():
+    async def run():
+        dead_server = await _serve_panel()
+        dead_port = dead_server.sockets[0].getsockname()[1]
+        dead_server.close()
+        await dead_server.wait_closed()
+
+        fleet = C3Fleet([C3DeviceInfo("127.0.0.1", dead_port)])
+        fleet.reconnect_delay_min = 0.01
+        fleet.start()
+
+        async def stop():
+            await asyncio.sleep(0.05)
+            await fleet.stop()
+
+        stopping = asyncio.ensure_future(stop())
+        assert [record async for record in fleet.records()] == []
+        await stopping
+        assert not fleet.is_running()
+
+    asyncio.run(asyncio.wait_for(run(), 10))
@@ -0,0 +1,134 @@
+import pytest
+
+from c3 import consts, framing
+
+CONNECT_REPLY = bytes.fromhex("aa01c80400d18a0000915255")
+RTLOG_REPLY = bytes.fromhex("aa01c81400eb66030003000000110000000001ff00f5c1ca2caa1f55")
+
+
+def test_frame_decoder_single_frame():
+    decoder = framing.FrameDecoder()
+    frames = decoder.feed(CONNECT_REPLY)
+    assert len(frames) == 1
+    assert frames[0].command == 0xC8
+    assert frames[0].version == 0x01
+    assert bytes(frames[0].payload) == bytes.fromhex("d18a0000")
+    assert decoder.buffered == 0
+
+
+def test_frame_decoder_fragmented():
+    decoder = framing.FrameDecoder()
+    frames = []
+    for byte in RTLOG_REPLY:
+        assert not frames
+        frames = decoder.feed(bytes([byte]))
+    assert len(frames) == 1
+    assert bytes(frames[0].payload) == RTLOG_REPLY[5:-3]
+
+
+def test_frame_decoder_multiple_frames():
+    decoder = framing.FrameDecoder()
+    stream = CONNECT_REPLY + RTLOG_REPLY + CONNECT_REPLY[:7]
+    frames = decoder.feed(stream)
+    assert len(frames) == 2
+    assert bytes(frames[1].payload) == RTLOG_REPLY[5:-3]
+    assert decoder.bytes_needed() == len(CONNECT_REPLY) - 7
+
+    frames = decoder.feed(CONNECT_REPLY[7:])
+    assert len(frames) == 1
+    assert bytes(frames[0].payload) == bytes.fromhex("d18a0000")
+
+
+def test_frame_decoder_wraps_buffer():
+    decoder = framing.FrameDecoder(buffer_size=len(RTLOG_REPLY) + 4)
+    frames = decoder.feed(CONNECT_REPLY + RTLOG_REPLY)
+    assert len(frames) == 2
+    assert bytes(frames[0].payload) == bytes.fromhex("d18a0000")
+    assert bytes(frames[1].payload) == RTLOG_REPLY[5:-3]
+
+
+def test_frame_decoder_recv_into():
+    decoder = framing.FrameDecoder()
+    stream = RTLOG_REPLY
+    while stream:
+        # Simulate short reads, at most 4 bytes arrive per call
+        buffer = decoder.write_buffer(decoder.bytes_needed())
+        chunk = stream[: min(4, len(buffer))]
+        buffer[: len(chunk)] = chunk
+        decoder.commit(len(chunk))
+        stream = stream[len(chunk) :]
+    assert decoder.bytes_needed() == 0
+    frame = decoder.next_frame()
+    assert bytes(frame.payload) == RTLOG_REPLY[5:-3]
+    assert decoder.next_frame() is None
+
+
+def test_frame_decoder_invalid():
+    decoder = framing.FrameDecoder()
+    with pytest.raises(ValueError):
+        decoder.feed(b"\x01" + CONNECT_REPLY[1:])
+    assert decoder.buffered == 0
+
+    with pytest.raises(ValueError):
+        decoder.feed(CONNECT_REPLY[:-3] + b"\x00\x00\x55")
+    assert decoder.buffered == 0
+
+
+@pytest.mark.parametrize(
+    "session_id, request_nr, command, data, frame",
+    [
+        (0xFEFE, -258, 0x76, None, "aa01760400fefefefe467755"),
+        (
+            0x8A9C,
+            -257,
+            0x04,
+            "~SerialNumber,LockCount",
+            "aa01041b009c8afffe7e53657269616c4e756d6265722c4c6f636b436f756e74131c55",
+        ),
+        (0x8A9C, 5, 0x0B, None, "aa010b04009c8a0500766255"),
+        (None, None, 0x05, bytes.fromhex("0101010300"), "aa010505000101010300f5a355"),
+        (0x8A9C, 300, 0x08, [1, 3, 1, 2, 0], "aa010809009c8a2c0101030102003dec55"),
+        (
+            0x8A9C,
+            300,
+            0x08,
+            memoryview(bytes([1, 3, 1, 2, 0])),
+            "aa010809009c8a2c0101030102003dec55",
+        ),
+    ],
+)
+def test_frame_encoder(session_id, request_nr, command, data, frame):
+    assert framing.encode_frame(session_id, request_nr, command, data) == bytes.fromhex(
+        frame
+    )
+    encoder = framing.FrameEncoder()
+    assert encoder.encode(session_id, request_nr, command, data) == bytes.fromhex(frame)
+    # The decoder accepts the encoded frame
+    decoded = framing.FrameDecoder().feed(bytes.fromhex(frame))
+    assert decoded[0].command == command
+
+
+def test_frame_encoder_reuses_buffer():
+    encoder = framing.FrameEncoder(buffer_size=16)
+    first = encoder.encode(0x8A9C, 5, 0x0B)
+    assert bytes(first) == bytes.fromhex("aa010b04009c8a0500766255")
+    second = encoder.encode(0x8A9C, 6, 0x0B)
+    # The frames are views on the same buffer
+    assert first.obj is second.obj
+    assert bytes(second) == framing.encode_frame(0x8A9C, 6, 0x0B)
+    with pytest.raises(ValueError):
+        encoder.encode(None, None, 0x04, b"x" * 9)
+
+
+def test_frame_buffers_grow():
+    encoder = framing.FrameEncoder()
+    decoder = framing.FrameDecoder()
+    assert len(decoder._buffer) < framing.C3_MAX_FRAME_SIZE
+    data = bytes(range(256)) * 40
+    frame = encoder.encode(None, None, consts.C3_REPLY_OK, data)
+    assert bytes(frame) == framing.encode_frame(None, None, consts.C3_REPLY_OK, data)
+
+    # A pending partial frame is kept when the buffer grows
+    stream = CONNECT_REPLY + bytes(frame)
+    frames = decoder.feed(stream[:20]) + decoder.feed(stream[20:])
+    assert [bytes(f.payload) for f in frames] == [bytes.fromhex("d18a0000"), data]
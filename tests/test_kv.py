@@ -0,0 +1,63 @@
+from c3 import kv
+
+PARAMETERS = bytes.fromhex(
+    "7e53657269616c4e756d6265723d414359543033323335333632372c4c6f636b"
+    "436f756e743d342c417578496e436f756e743d342c4175784f7574436f756e743d34"
+)
+
+RTLOG = bytes.fromhex(
+    "74696d653d323032332d31322d30362032323a33333a31350970696e3d300963617264"
+    "6e6f3d30096576656e74616464723d30096576656e743d32303609696e6f7574737461"
+    "7475733d3209766572696679747970653d32303009696e6465783d380d0a74696d653d"
+    "323032332d31322d30362032323a35373a35340970696e3d3009636172646e6f3d3009"
+    "6576656e74616464723d31096576656e743d3809696e6f75747374617475733d320976"
+    "6572696679747970653d32303009696e6465783d39"
+)
+
+
+def test_parse_kv():
+    assert kv.parse_kv(PARAMETERS) == {
+        "~SerialNumber": "ACYT032353627",
+        "LockCount": "4",
+        "AuxInCount": "4",
+        "AuxOutCount": "4",
+    }
+    assert kv.parse_kv(memoryview(bytearray(PARAMETERS))) == kv.parse_kv(PARAMETERS)
+    assert kv.parse_kv(b"") == {}
+    assert kv.parse_kv(b"A=1,B=,C=3") == {"A": "1", "C": "3"}
+
+
+def test_parse_kv_keys_interned():
+    first = kv.parse_kv(PARAMETERS, intern=True)
+    second = kv.parse_kv_records(bytearray(PARAMETERS), intern=True)[0]
+    for key_first, key_second in zip(first, second):
+        assert key_first is key_second
+
+
+def test_parse_kv_records():
+    records = kv.parse_kv_records(memoryview(RTLOG))
+    assert records == [
+        {
+            "time": "2023-12-06 22:33:15",
+            "pin": "0",
+            "cardno": "0",
+            "eventaddr": "0",
+            "event": "206",
+            "inoutstatus": "2",
+            "verifytype": "200",
+            "index": "8",
+        },
+        {
+            "time": "2023-12-06 22:57:54",
+            "pin": "0",
+            "cardno": "0",
+            "eventaddr": "1",
+            "event": "8",
+            "inoutstatus": "2",
+            "verifytype": "200",
+            "index": "9",
+        },
+    ]
+    # A value does not run into the next record
+    assert kv.parse_kv(RTLOG)["index"] == "9"
+    assert kv.parse_kv_records(b"a=1\n\nb=2\n") == [{"a": "1"}, {"b": "2"}]
@@ -0,0 +1,132 @@
+import threading
+import time
+
+import pytest
+
+from c3 import C3, consts, timers
+from c3.simulator import PanelSimulator
+
+
+def _wait_for(condition, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_liveness_dropped_connection():
+    with PanelSimulator() as simulator:
+        panel = C3(simulator.host, port=simulator.port)
+        panel.liveness_probe_interval = 0
+        assert panel.connect() is True
+        assert panel.is_connected() is True
+
+        simulator.drop_connections()
+        assert _wait_for(lambda: not panel.is_connected())
+
+        # Disconnecting a lost connection does not raise
+        panel.disconnect()
+        assert panel.is_connected() is False
+
+
+def test_liveness_probe_while_busy():
+    with PanelSimulator() as simulator:
+        panel = C3(simulator.host, port=simulator.port)
+        panel.liveness_probe_interval = 0
+        assert panel.connect() is True
+
+        # A connection in use by another thread is not probed
+        with panel._lock:
+            result = []
+            thread = threading.Thread(
+                target=lambda: result.append(panel.is_connected())
+            )
+            thread.start()
+            thread.join()
+        assert result == [True]
+        panel.disconnect()
+
+
+def test_liveness_auto_reconnect():
+    with PanelSimulator(session=False) as simulator:
+        panel = C3(simulator.host, port=simulator.port)
+        panel.liveness_probe_interval = 0
+        panel.auto_reconnect = True
+        assert panel.connect() is True
+        assert panel._session_less is True
+
+        # The lost connection is found by is_connected(), which reconnects in the background
+        simulator.drop_connections()
+        assert _wait_for(panel.is_connected)
+        assert panel.get_device_param(["~SerialNumber"]) == {
+            "~SerialNumber": simulator.serial_number
+        }
+        # The session mode of the first connection is reused
+        assert simulator.requests[consts.Command.CONNECT_SESSION] == 1
+        assert simulator.requests[consts.Command.CONNECT_SESSION_LESS] == 2
+
+        panel.disconnect()
+        assert panel.is_connected() is False
+
+
+def test_liveness_heartbeat():
+    with PanelSimulator() as simulator:
+        panel = C3(simulator.host, port=simulator.port)
+        panel.heartbeat_interval = 0.05
+        panel.auto_reconnect = True
+        assert panel.connect() is True
+        connects = simulator.requests[consts.Command.CONNECT_SESSION]
+
+        assert _wait_for(lambda: simulator.requests[consts.Command.GETPARAM] >= 3)
+
+        # The heartbeat finds the connection lost and connects again
+        simulator.drop_connections()
+        assert _wait_for(
+            lambda: simulator.requests[consts.Command.CONNECT_SESSION] > connects
+        )
+
+        panel.disconnect()
+        requests = sum(simulator.requests.values())
+        time.sleep(0.2)
+        assert sum(simulator.requests.values()) == requests
+
+
+def test_liveness_heartbeat_does_not_delay_timers():
+    with PanelSimulator() as simulator:
+        panel = C3(simulator.host, port=simulator.port)
+        panel.timer_scheduler = timers.TimerScheduler()
+        panel.receive_timeout = 0.5
+        panel.receive_retries = 1
+        panel.heartbeat_interval = 0.05
+        assert panel.connect() is True
+
+        # The heartbeat waits for a reply on the worker, the timers keep running
+        simulator.latency = 1.0
+        assert _wait_for(lambda: simulator.requests[consts.Command.GETPARAM] >= 2)
+        fired = threading.Event()
+        panel.timer_scheduler.call_later(0, fired.set)
+        assert fired.wait(0.2)
+        panel.disconnect()
+
+
+def test_liveness_silent_panel():
+    with PanelSimulator() as simulator:
+        panel = C3(simulator.host, port=simulator.port)
+        panel.receive_timeout = 0.1
+        panel.receive_retries = 1
+        panel.auto_reconnect = True
+        assert panel.connect() is True
+        connects = simulator.requests[consts.Command.CONNECT_SESSION]
+
+        # A panel that stops answering is detected by the receive timeout
+        simulator.latency = 0.5
+        with pytest.raises(ConnectionError):
+            panel.get_rt_log()
+        assert panel._connected is False
+
+        simulator.latency = 0
+        assert _wait_for(panel.is_connected)
+        assert simulator.requests[consts.Command.CONNECT_SESSION] == connects + 1
+        panel.disconnect()
@@ -0,0 +1,176 @@
+import threading
+import time
+
+import pytest
+
+from c3 import C3, consts, controldevice
+from c3.simulator import PanelSimulator
+
+
+def test_pipeline_requests():
+    with PanelSimulator(table_sizes={"user": 3}, latency=0.05) as simulator:
+        panel = C3(simulator.device_info)
+        assert panel.connect() is True
+        panel.get_device_data("user")
+
+        start = time.monotonic()
+        with panel.pipeline() as requests:
+            params = [
+                requests.get_device_param([f"Door{i}Drivertime"]) for i in range(1, 5)
+            ]
+            users = requests.get_device_data("user", ["UID"], columnar=True)
+            control = requests.control_device(
+                controldevice.ControlDeviceOutput(1, 1, 3)
+            )
+            assert requests.in_flight == 6
+        duration = time.monotonic() - start
+
+        assert [p.result() for p in params] == [
+            {f"Door{i}Drivertime": "5"} for i in range(1, 5)
+        ]
+        assert users.result() == {"UID": [1, 2, 3]}
+        assert control.result() == b""
+        assert panel._pipelining is True
+        # All requests are answered within about one round trip, instead of six
+        assert duration < 6 * 0.05
+        panel.disconnect()
+
+
+def test_pipeline_result_receives_replies():
+    with PanelSimulator() as simulator:
+        panel = C3(simulator.device_info)
+        assert panel.connect() is True
+
+        requests = panel.pipeline(max_in_flight=2)
+        first = requests.get_device_param(["LockCount"])
+        second = requests.get_device_param(["AuxInCount"])
+        third = requests.get_device_param(["AuxOutCount"])
+        assert requests.in_flight == 2
+        assert third.result() == {"AuxOutCount": "4"}
+        assert first.done() and second.done()
+        panel.disconnect()
+
+
+def test_pipeline_error_reply():
+    with PanelSimulator() as simulator:
+        panel = C3(simulator.device_info)
+        assert panel.connect() is True
+
+        with panel.pipeline() as requests:
+            unsupported = requests.submit(0x30)
+            params = requests.get_device_param(["LockCount"])
+        with pytest.raises(ConnectionError):
+            unsupported.result()
+        assert params.result() == {"LockCount": "4"}
+
+        # Regular requests flush the pipeline first
+        with panel.pipeline() as requests:
+            params = requests.get_device_param(["LockCount"])
+            assert panel.get_device_param(["AuxInCount"], refresh=True) == {
+                "AuxInCount": "4"
+            }
+            assert params.done()
+        panel.disconnect()
+
+
+def test_pipeline_fallback_to_lock_step():
+    with PanelSimulator(pipelining=False, latency=0.01) as simulator:
+        panel = C3(simulator.device_info)
+        panel.receive_timeout = 0.1
+        panel.receive_retries = 1
+        assert panel.connect() is True
+
+        with panel.pipeline() as requests:
+            params = [
+                requests.get_device_param([f"Door{i}SensorType"]) for i in range(1, 5)
+            ]
+        assert [p.result() for p in params] == [
+            {f"Door{i}SensorType": "2"} for i in range(1, 5)
+        ]
+        assert panel._pipelining is False
+        assert simulator.requests[consts.Command.GETPARAM] >= 5
+
+        # Once detected, requests are sent one at a time
+        with panel.pipeline() as requests:
+            requests.get_device_param(["LockCount"])
+            assert requests.in_flight == 1
+            requests.get_device_param(["LockCount"])
+            assert requests.in_flight == 1
+        panel.disconnect()
+
+
+def test_pipeline_fallback_does_not_repeat_control():
+    with PanelSimulator(pipelining=False, latency=0.01) as simulator:
+        panel = C3(simulator.device_info)
+        panel.receive_timeout = 0.1
+        panel.receive_retries = 1
+        assert panel.connect() is True
+
+        with panel.pipeline() as requests:
+            params = requests.get_device_param(["LockCount"])
+            controls = [
+                requests.control_device(controldevice.ControlDeviceOutput(1, 1, 3))
+                for _ in range(2)
+            ]
+        assert params.result() == {"LockCount": "4"}
+        # The unanswered control commands are not sent again, they may have been executed
+        for control in controls:
+            with pytest.raises(TimeoutError):
+                control.result(timeout=3)
+        assert simulator.controls == []
+        assert panel._pipelining is False
+        assert panel.is_connected()
+        panel.disconnect()
+
+
+def test_pipeline_connection_lost():
+    with PanelSimulator(latency=0.2) as simulator:
+        panel = C3(simulator.device_info)
+        assert panel.connect() is True
+
+        requests = panel.pipeline()
+        params = [requests.get_device_param(["LockCount"]) for _ in range(3)]
+        simulator.drop_connections()
+        # All requests in flight fail, the panel is not assumed to lack pipelining
+        for future in params:
+            with pytest.raises(ConnectionError):
+                future.result(timeout=3)
+        assert requests.in_flight == 0
+        assert panel._pipelining is not False
+        assert not panel.is_connected()
+
+
+def test_pipeline_session_less():
+    with PanelSimulator(session=False) as simulator:
+        panel = C3(simulator.device_info)
+        assert panel.connect() is True
+
+        with panel.pipeline() as requests:
+            params = [requests.get_device_param(["LockCount"]) for _ in range(3)]
+            assert requests.in_flight == 1
+        assert all(p.result() == {"LockCount": "4"} for p in params)
+        panel.disconnect()
+
+
+def test_pipeline_late_replies():
+    with PanelSimulator() as simulator:
+        panel = C3(simulator.device_info)
+        panel.receive_timeout = 0.1
+        panel.receive_retries = 1
+        assert panel.connect() is True
+
+        # The replies to the pipelined requests arrive after the receive timeout
+        simulator.latency = 0.3
+        threading.Timer(0.05, setattr, (simulator, "latency", 0.0)).start()
+        names = ["LockCount", "FirmVer", "NetMask"]
+        with panel.pipeline() as requests:
+            params = [requests.get_device_param([name]) for name in names]
+        assert [p.result() for p in params] == [
+            {name: simulator.parameters[name]} for name in names
+        ]
+
+        # The late replies are not taken for the replies to the next requests
+        for name in ["IPAddress", "DeviceName", "AuxInCount"]:
+            assert panel.get_device_param([name]) == {name: simulator.parameters[name]}
+        assert panel._rtlog_command == consts.Command.RTLOG_BINARY
+        panel.disconnect()
@@ -0,0 +1,79 @@
+import threading
+
+import pytest
+
+from c3 import C3, rtlog
+from c3.polling import PollSchedule, RTLogPoller
+from c3.simulator import PanelSimulator
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_poll_schedule_backoff_and_burst():
+    clock = FakeClock()
+    schedule = PollSchedule(
+        min_interval=0.5, max_interval=4.0, backoff=2.0, burst_duration=2.0, clock=clock
+    )
+    assert schedule.due()
+
+    # Idle polls back off exponentially, up to the maximum interval
+    intervals = []
+    for _ in range(5):
+        intervals.append(schedule.record_poll(0))
+        clock.now += intervals[-1]
+    assert intervals == [1.0, 2.0, 4.0, 4.0, 4.0]
+    assert schedule.delay() == 0
+
+    # Activity polls at the minimum interval for the burst duration
+    assert schedule.record_poll(3) == 0.5
+    assert schedule.delay() == 0.5
+    clock.now += 0.5
+    assert schedule.record_poll(0) == 0.5
+    clock.now += 1.5
+    assert schedule.record_poll(0) == 1.0
+
+    stats = schedule.stats
+    assert stats.polls == 8
+    assert stats.events == 3
+    assert stats.interval == 1.0
+    assert stats.cadence == pytest.approx((1 + 2 + 4 + 4 + 4 + 0.5 + 1.5) / 7)
+    assert stats.max_event_latency == 4.0
+    assert stats.mean_event_latency == 2.0
+
+
+def test_poll_schedule_bounds():
+    with pytest.raises(ValueError):
+        PollSchedule(min_interval=2.0, max_interval=1.0)
+    with pytest.raises(ValueError):
+        PollSchedule(min_interval=0)
+
+
+def test_rtlog_poller():
+    with PanelSimulator() as simulator:
+        panel = C3(simulator.device_info)
+        assert panel.connect() is True
+        poller = RTLogPoller(panel, PollSchedule(min_interval=0.01, max_interval=0.05))
+
+        simulator.add_event(card_no=1234)
+        events = []
+        for record in poller:
+            if isinstance(record, rtlog.EventRecord):
+                events.append(record)
+                threading.Timer(
+                    0.05, simulator.add_event, kwargs={"card_no": 5678}
+                ).start()
+            if len(events) == 2:
+                poller.stop()
+
+        assert [event.card_no for event in events] == [1234, 5678]
+        stats = poller.stats
+        assert stats.events == 2
+        assert stats.polls >= 2
+        assert stats.interval == 0.01
+        panel.disconnect()
@@ -0,0 +1,127 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from c3 import C3, C3Pool, controldevice
+from c3.locks import MeteredLock
+from c3.simulator import PanelSimulator
+
+
+def test_metered_lock():
+    lock = MeteredLock()
+    with lock:
+        with lock:
+            pass
+        thread = threading.Thread(target=lambda: lock.acquire(timeout=0.01))
+        thread.start()
+        thread.join()
+
+    stats = lock.stats
+    assert stats.acquisitions == 2
+    assert stats.contended == 0
+    assert stats.timeouts == 1
+
+    acquired = threading.Event()
+
+    def hold():
+        with lock:
+            acquired.set()
+            threading.Event().wait(0.05)
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    acquired.wait()
+    with lock:
+        pass
+    thread.join()
+    stats = lock.stats
+    assert stats.contended == 1
+    assert stats.max_wait_time > 0
+    assert stats.mean_wait_time == stats.wait_time
+
+
+def test_shared_panel_threads():
+    with PanelSimulator(table_sizes={"user": 10}, latency=0.002) as simulator:
+        panel = C3(simulator.device_info)
+        assert panel.connect() is True
+
+        def request(i: int):
+            if i % 2:
+                return panel.get_device_param([f"Door{i % 4 + 1}Drivertime"])
+            return len(panel.get_device_data("user"))
+
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(request, range(40)))
+
+        for i, result in enumerate(results):
+            assert result == ({f"Door{i % 4 + 1}Drivertime": "5"} if i % 2 else 10)
+        assert panel.lock_stats.contended > 0
+        panel.disconnect()
+
+
+def test_pool_sessions():
+    with PanelSimulator(latency=0.02) as simulator:
+        with C3Pool(simulator.device_info, size=3) as pool:
+            with ThreadPoolExecutor(6) as executor:
+                results = list(
+                    executor.map(
+                        lambda _: pool.get_device_param(["LockCount"]), range(6)
+                    )
+                )
+            assert results == [{"LockCount": "4"}] * 6
+            assert pool.size == 3
+            assert pool.in_use == 0
+            assert pool.stats.acquisitions == 6
+            assert pool.stats.contended >= 3
+
+            pool.control_device(controldevice.ControlDeviceOutput(1, 1, 3))
+            assert simulator.controls
+
+
+def test_pool_session_limit():
+    with PanelSimulator(max_sessions=1, latency=0.01) as simulator:
+        with C3Pool(simulator.device_info, size=3) as pool:
+            with ThreadPoolExecutor(3) as executor:
+                results = list(
+                    executor.map(lambda _: pool.get_device_data("user"), range(3))
+                )
+            assert results == [[]] * 3
+            assert pool.size == 1
+
+
+def test_pool_timeout():
+    with PanelSimulator() as simulator:
+        with C3Pool(simulator.device_info, size=1) as pool:
+            with pool.session():
+                with pytest.raises(TimeoutError):
+                    pool.acquire(timeout=0.01)
+            assert pool.stats.timeouts == 1
+
+
+def test_pool_size_restored():
+    with PanelSimulator(max_sessions=1, latency=0.01) as simulator:
+        with C3Pool(simulator.device_info, size=2) as pool:
+            pool.size_restore_interval = 0.05
+            with pool.session():
+                with pytest.raises(TimeoutError):
+                    pool.acquire(timeout=0.05)
+            assert pool.size == 1
+
+            simulator.max_sessions = None
+            threading.Event().wait(0.06)
+            with pool.session():
+                with pool.session(timeout=1):
+                    assert pool.size == 2
+
+
+def test_pool_failed_connect_keeps_size():
+    with PanelSimulator() as simulator:
+        with C3Pool(simulator.device_info, size=2, password="wrong") as pool:
+            simulator.password = "wrong"
+            with pool.session():
+                simulator.password = "secret"
+                with pytest.raises(ConnectionError):
+                    pool.acquire(timeout=1)
+                assert pool.size == 2
+            assert pool.in_use == 0
@@ -1,8 +1,17 @@
+import pickle
 from unittest import mock
 
-from c3.consts import EventType, InOutStatus, VerificationMode
+import pytest
+
+from c3.consts import EventType, InOutDirection, InOutStatus, VerificationMode
 from c3.core import C3
-from c3.rtlog import DoorAlarmStatusRecord, EventRecord
+from c3.rtlog import (
+    DoorAlarmStatusRecord,
+    EventRecord,
+    decode_batch,
+    decode_kv_batch,
+    factory,
+)
 from c3.utils import C3DateTime
 
 
@@ -136,10 +145,13 @@ def test_c3_rtlog_decode_status2():
 
 
 @mock.patch.object(C3, "_update_inout_status", new_callable=mock.MagicMock)
-def test_rtlog_unknown_verification_mode(_unused_update_inout_status_mock):
+def test_rtlog_unknown_verification_mode(_unused_update_inout_status_mock, recv_into):
     with mock.patch("socket.socket") as mock_socket:
         panel = C3("localhost")
         mock_socket.return_value.send.return_value = 8
+        mock_socket.return_value.recv_into.side_effect = recv_into(
+            mock_socket.return_value
+        )
         mock_socket.return_value.recv.side_effect = [
             bytes.fromhex("aa00c80400"),
             bytes.fromhex("d805fefea30955"),
@@ -168,10 +180,13 @@ def test_rtlog_unknown_verification_mode(_unused_update_inout_status_mock):
 
 
 @mock.patch.object(C3, "_update_inout_status", new_callable=mock.MagicMock)
-def test_rtlog_keyvalue_response(_unused_update_inout_status_mock):
+def test_rtlog_keyvalue_response(_unused_update_inout_status_mock, recv_into):
     with mock.patch("socket.socket") as mock_socket:
         panel = C3("localhost")
         mock_socket.return_value.send.return_value = 8
+        mock_socket.return_value.recv_into.side_effect = recv_into(
+            mock_socket.return_value
+        )
         mock_socket.return_value.recv.side_effect = [
             bytes.fromhex("aa02c90100"),
             bytes.fromhex("f357d955"),
@@ -224,11 +239,16 @@ def test_rtlog_keyvalue_response(_unused_update_inout_status_mock):
         assert len(logs) == 0
 
         logs = panel.get_rt_log()
-        assert len(logs) == 1
+        assert len(logs) == 2
         assert isinstance(logs[0], EventRecord)
-        assert logs[0].port_nr == 1
-        assert logs[0].event_type == EventType.REMOTE_OPENING
-        assert logs[0].verified == VerificationMode.OTHER
+        assert logs[0].port_nr == 0
+        assert logs[0].event_type == EventType.DEVICE_START
+        assert logs[0].time_second == C3DateTime(2023, 12, 6, 22, 33, 15)
+        assert isinstance(logs[1], EventRecord)
+        assert logs[1].port_nr == 1
+        assert logs[1].event_type == EventType.REMOTE_OPENING
+        assert logs[1].verified == VerificationMode.OTHER
+        assert logs[1].time_second == C3DateTime(2023, 12, 6, 22, 57, 54)
 
         logs = panel.get_rt_log()
         assert len(logs) == 1
@@ -245,3 +265,112 @@ def test_rtlog_keyvalue_response(_unused_update_inout_status_mock):
         assert not logs[0].get_alarms(2)
         assert not logs[0].get_alarms(3)
         assert not logs[0].get_alarms(4)
+
+
+def test_rtlog_decode_batch():
+    data = bytes.fromhex(
+        "174f860099929800040100007432af21" "03000000110000000001ff00f231b321"
+    )
+    batch = decode_batch(data)
+    assert len(batch) == 2
+    assert batch.card_no[0] == 0x00864F17
+    assert batch.pin[0] == 9999001
+    assert batch.verified == (4, 0)
+    assert batch.port_nr == (1, 1)
+    assert batch.event_type == (0, 255)
+    assert batch.column("in_out_state") == (0, 0)
+    assert batch.times()[0] == EventRecord.from_bytes(data[:16]).time_second
+    assert batch.to_bytes() == data
+
+    records = batch.records()
+    assert isinstance(records[0], EventRecord)
+    assert records[0].event_type == EventType.NORMAL_PUNCH_OPEN
+    assert isinstance(records[1], DoorAlarmStatusRecord)
+    assert records[1].has_alarm(1)
+
+    assert len(decode_batch(b"")) == 0
+    with pytest.raises(ValueError):
+        decode_batch(data[:15])
+
+
+def test_rtlog_record_wire_format():
+    data = bytes.fromhex(
+        "174f860099929800040100007432af21" "03000000110000000001ff00f231b321"
+    )
+    records = decode_batch(data).records()
+    assert b"".join(record.to_bytes() for record in records) == data
+    assert not hasattr(records[0], "__dict__")
+
+    # Records are pickled in wire format
+    for record in records:
+        copy = pickle.loads(pickle.dumps(record))
+        assert type(copy) is type(record)
+        assert copy == record
+        assert copy.time_second == record.time_second
+
+    # Key/value records are converted to wire format
+    record = factory(
+        {
+            "time": "2023-12-06 22:57:54",
+            "pin": "12",
+            "cardno": "1234",
+            "eventaddr": "1",
+            "event": "1000",
+            "inoutstatus": "2",
+            "verifytype": "4",
+        }
+    )
+    copy = factory(record.to_bytes())
+    assert isinstance(copy, EventRecord)
+    assert copy == record
+    assert (copy.card_no, copy.pin, copy.port_nr) == (1234, 12, 1)
+    assert copy.event_type == EventType.UNKNOWN_UNSUPPORTED
+    assert copy.verified == VerificationMode.CARD
+    assert copy.in_out_state == InOutDirection.NONE
+    assert copy.time_second == C3DateTime(2023, 12, 6, 22, 57, 54)
+
+    with pytest.raises(ValueError):
+        EventRecord(data[:15])
+
+
+def test_rtlog_kv_record_overflow():
+    kv_record = {
+        "time": "2023-12-06 22:57:54",
+        "pin": "12",
+        "cardno": "1234",
+        "eventaddr": "1",
+        "event": "8",
+        "inoutstatus": "2",
+        "verifytype": "4",
+    }
+    # Values that do not fit in the binary record are not truncated
+    for name, value in (
+        ("cardno", "4294967297"),
+        ("pin", "-1"),
+        ("eventaddr", "300"),
+        ("time", "1999-12-31 23:59:59"),
+    ):
+        with pytest.raises(ValueError):
+            factory({**kv_record, name: value})
+    assert factory({**kv_record, "cardno": "4294967295"}).card_no == 4294967295
+
+    # A record that does not fit is skipped, the other records of the reply are kept
+    records = decode_kv_batch(
+        "\r\n".join(
+            "\t".join(f"{name}={value}" for name, value in record.items())
+            for record in ({**kv_record, "cardno": "4294967297"}, kv_record)
+        ).encode("ascii")
+    )
+    assert [record.card_no for record in records] == [1234]
+
+
+def test_rtlog_decode_batch_numpy():
+    pytest.importorskip("numpy")
+    data = bytes.fromhex(
+        "174f860099929800040100007432af21" "03000000110000000001ff00f231b321"
+    )
+    batch = decode_batch(data, use_numpy=True)
+    assert len(batch) == 2
+    assert list(batch.event_type) == [0, 255]
+    assert int(batch.pin[0]) == 9999001
+    assert batch.times() == decode_batch(data).times()
@@ -0,0 +1,220 @@
+import asyncio
+import socket
+import threading
+import time
+
+import pytest
+
+from c3 import C3, consts, controldevice, rtlog
+from c3.aio import AsyncC3
+from c3.fleet import C3Fleet
+from c3.simulator import PanelSimulator
+from c3.sync import TransactionSync
+
+
+def test_simulator_session():
+    with PanelSimulator(table_sizes={"user": 25}, fragment_size=3) as simulator:
+        panel = C3(simulator.device_info)
+        assert panel.connect() is True
+        assert panel.serial_number == simulator.serial_number
+        assert panel.nr_of_locks == 4
+
+        users = panel.get_device_data("user", ["UID", "Name"])
+        assert len(users) == 25
+        assert users[24] == {"UID": 25, "Name": "Name25"}
+
+        panel.control_device(controldevice.ControlDeviceOutput(1, 1, 3))
+        assert simulator.controls == [bytes.fromhex("0101010300")]
+
+        # A request with another session id is rejected
+        session_id = panel._session_id
+        panel._session_id = session_id ^ 0x0101
+        with pytest.raises(ConnectionError):
+            panel.get_device_data("user")
+        panel._session_id = session_id
+
+        panel.disconnect()
+        assert simulator.requests[consts.Command.CONNECT_SESSION] == 1
+        assert simulator.requests[consts.Command.DISCONNECT] == 1
+
+
+def test_simulator_password():
+    with PanelSimulator(password="secret") as simulator:
+        assert C3(simulator.device_info).connect("wrong") is False
+        panel = C3(simulator.device_info)
+        assert panel.connect("secret") is True
+        panel.disconnect()
+
+
+def test_simulator_rtlog():
+    with PanelSimulator() as simulator:
+        panel = C3(simulator.device_info)
+        assert panel.connect() is True
+
+        logs = panel.get_rt_log()
+        assert len(logs) == 1
+        assert isinstance(logs[0], rtlog.DoorAlarmStatusRecord)
+
+        simulator.add_event(card_no=1234, pin=5, port_nr=2)
+        simulator.add_event(card_no=1235, pin=6, port_nr=3)
+        logs = panel.get_rt_log()
+        assert [(log.card_no, log.pin, log.port_nr) for log in logs] == [
+            (1234, 5, 2),
+            (1235, 6, 3),
+        ]
+        panel.disconnect()
+
+
+def test_simulator_rtlog_keyvalue():
+    with PanelSimulator(session=False, rtlog_binary=False) as simulator:
+        panel = C3(simulator.device_info)
+        assert panel.connect() is True
+
+        # The first request transitions to the key/value mode
+        assert panel.get_rt_log() == []
+        simulator.add_event(card_no=1234, pin=5)
+        logs = panel.get_rt_log()
+        assert len(logs) == 1
+        assert logs[0].card_no == 1234
+        assert simulator.requests[consts.Command.RTLOG_KEYVALUE] == 1
+
+        # Multiple events are returned in one reply
+        for card_no in range(1, 6):
+            simulator.add_event(card_no=card_no)
+        logs = panel.get_rt_log()
+        assert [log.card_no for log in logs] == [1, 2, 3, 4, 5]
+        assert simulator.requests[consts.Command.RTLOG_KEYVALUE] == 2
+        panel.disconnect()
+
+
+def test_simulator_event_rate():
+    with PanelSimulator(event_rate=1000) as simulator:
+        panel = C3(simulator.device_info)
+        assert panel.connect() is True
+        time.sleep(0.05)
+        logs = panel.get_rt_log()
+        assert len(logs) > 1
+        assert all(log.is_event() for log in logs)
+        panel.disconnect()
+
+
+def test_simulator_transaction_sync(tmp_path):
+    with PanelSimulator(table_sizes={"transaction": 30}) as simulator:
+        panel = C3(simulator.device_info)
+        assert panel.connect() is True
+
+        sync = TransactionSync(panel, str(tmp_path / "state.json"))
+        assert len(list(sync.sync(delete=True))) == 30
+        assert simulator.tables["transaction"] == []
+        assert list(sync.sync()) == []
+        panel.disconnect()
+
+
+def test_simulator_discovery():
+    with PanelSimulator(discovery_port=0) as simulator:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.settimeout(2)
+        sock.sendto(
+            C3._construct_message(
+                None, None, consts.Command.DISCOVER, consts.C3_DISCOVERY_MESSAGE
+            ),
+            (simulator.host, simulator.discovery_port),
+        )
+        reply = sock.recv(1024)
+        sock.close()
+
+        data = C3._parse_kv_from_message(C3._get_message(reply))
+        assert data["SN"] == simulator.serial_number
+        assert data["IP"] == simulator.host
+        assert data["MAC"] == simulator.mac
+
+
+def test_simulator_async_fleet():
+    simulators = PanelSimulator.start_many(5, event_rate=200, latency=0.001)
+
+    async def run():
+        panel = AsyncC3(simulators[0].device_info)
+        assert await panel.connect() is True
+        assert len(await panel.get_device_data("user")) == 0
+        await panel.disconnect()
+
+        fleet = C3Fleet([simulator.device_info for simulator in simulators])
+        fleet.poll_interval = 0.01
+        serial_numbers = set()
+        async with fleet:
+            async for record in fleet.records():
+                serial_numbers.add(record.serial_number)
+                if len(serial_numbers) == len(simulators):
+                    break
+
+    try:
+        asyncio.run(asyncio.wait_for(run(), 10))
+    finally:
+        for simulator in simulators:
+            simulator.stop()
+
+
+def test_simulator_get_device_param_chunks():
+    with PanelSimulator(latency=0.01) as simulator:
+        panel = C3(simulator.device_info)
+        assert panel.connect() is True
+        getparam_requests = simulator.requests[consts.Command.GETPARAM]
+
+        names = [
+            f"Door{door_nr}{name}"
+            for door_nr in range(1, 5)
+            for name in ["SensorType", "Drivertime", "Detectortime"]
+        ] * 3 + ["~SerialNumber", "LockCount"]
+        params = panel.get_device_param(names, validate=True, refresh=True)
+        assert len(params) == 14
+        assert params["Door4Detectortime"] == "15"
+        assert params["LockCount"] == "4"
+        assert simulator.requests[consts.Command.GETPARAM] == getparam_requests + 2
+
+        with pytest.raises(ValueError):
+            panel.get_device_param(["LockCount", "Reboot"], validate=True)
+        with pytest.raises(ValueError):
+            panel.get_device_param(["NoSuchParameter"], validate=True)
+        assert simulator.requests[consts.Command.GETPARAM] == getparam_requests + 2
+        panel.disconnect()
+
+
+def test_simulator_door_settings():
+    with PanelSimulator() as simulator:
+        panel = C3(simulator.device_info)
+        assert panel.connect() is True
+        getparam_requests = simulator.requests[consts.Command.GETPARAM]
+
+        # The door settings are retrieved with the identification
+        assert panel.door_settings(4).lock_drive_time == 5
+        assert panel.door_settings(4).door_alarm_timeout == 15
+        assert simulator.requests[consts.Command.GETPARAM] == getparam_requests
+
+        # A restart of the panel refreshes the settings in the background
+        simulator.parameters["Door4Drivertime"] = "9"
+        simulator.add_event(port_nr=0, event_type=consts.EventType.DEVICE_START)
+        panel.get_rt_log()
+        deadline = time.monotonic() + 2
+        while panel.door_settings(4).lock_drive_time != 9:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+
+        # Multiple restart events refresh the settings once
+        getparam_requests = simulator.requests[consts.Command.GETPARAM]
+        with panel._lock:
+            for _ in range(3):
+                simulator.add_event(port_nr=0, event_type=consts.EventType.DEVICE_START)
+            assert len(panel.get_rt_log()) == 3
+            assert panel._door_settings_refresh is not None
+            # The refresh waits for the lock on the worker, not on the timer scheduler
+            fired = threading.Event()
+            panel.timer_scheduler.call_later(0, fired.set)
+            assert fired.wait(1)
+        deadline = time.monotonic() + 2
+        while panel._door_settings_refresh is not None:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        with panel._lock:
+            # The refresh holds the lock until it is done
+            assert simulator.requests[consts.Command.GETPARAM] == getparam_requests + 1
+        panel.disconnect()
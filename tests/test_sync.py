@@ -0,0 +1,86 @@
+import json
+
+from c3.sync import TransactionSync
+
+
+class FakePanel:
+    host = "localhost"
+    serial_number = "DDG8130016092200401"
+
+    def __init__(self, times: list[int]):
+        self.records = [{"Pin": i, "Time_second": t} for i, t in enumerate(times)]
+        self.deleted = []
+
+    def iter_device_data(self, table_name):
+        assert table_name == "transaction"
+        yield from list(self.records)
+
+    def delete_device_data(self, table_name, conditions):
+        assert table_name == "transaction"
+        self.deleted.extend(conditions)
+        self.records = [
+            r
+            for r in self.records
+            if not any(all(r[k] == v for k, v in c.items()) for c in conditions)
+        ]
+
+
+def test_sync_fetch_ack(tmp_path):
+    state_path = str(tmp_path / "state.json")
+    panel = FakePanel([10, 20, 20])
+    sync = TransactionSync(panel, state_path)
+
+    assert [r["Pin"] for r in sync.fetch()] == [0, 1, 2]
+    # Without acknowledgement, the records are returned again
+    assert [r["Pin"] for r in sync.fetch()] == [0, 1, 2]
+    sync.ack()
+    assert sync.cursor == {"time_second": 20, "count": 2}
+
+    panel.records += [
+        {"Pin": 3, "Time_second": 20},
+        {"Pin": 4, "Time_second": 30},
+    ]
+    assert [r["Pin"] for r in sync.sync()] == [3, 4]
+    assert list(sync.sync()) == []
+
+    with open(state_path, encoding="utf-8") as state_file:
+        assert json.load(state_file) == {
+            "DDG8130016092200401": {"time_second": 30, "count": 1}
+        }
+
+    # The cursor is restored from the state file
+    sync = TransactionSync(panel, state_path)
+    assert sync.cursor == {"time_second": 30, "count": 1}
+    sync.reset()
+    assert len(list(sync.fetch())) == 5
+
+
+def test_sync_delete_after_ack(tmp_path):
+    panel = FakePanel([10, 20, 20])
+    sync = TransactionSync(panel, str(tmp_path / "state.json"))
+
+    assert len(list(sync.sync(delete=True))) == 3
+    assert panel.deleted == [
+        {"Pin": 0, "Time_second": 10},
+        {"Pin": 1, "Time_second": 20},
+        {"Pin": 2, "Time_second": 20},
+    ]
+    assert panel.records == []
+    assert sync.cursor == {"time_second": 20, "count": 0}
+
+    panel.records = [{"Pin": 5, "Time_second": 20}, {"Pin": 6, "Time_second": 21}]
+    assert [r["Pin"] for r in sync.sync(delete=True)] == [5, 6]
+
+
+def test_sync_delete_keeps_new_records(tmp_path):
+    panel = FakePanel([10, 20])
+    sync = TransactionSync(panel, str(tmp_path / "state.json"))
+
+    assert [r["Pin"] for r in sync.fetch()] == [0, 1]
+    # Events logged in the same second, after the fetch
+    panel.records += [{"Pin": 7, "Time_second": 20}, {"Pin": 8, "Time_second": 20}]
+    sync.ack(delete=True)
+    assert [r["Pin"] for r in panel.records] == [7, 8]
+
+    assert [r["Pin"] for r in sync.sync(delete=True)] == [7, 8]
+    assert panel.records == []
@@ -0,0 +1,83 @@
+import asyncio
+import threading
+import time
+
+from c3.timers import TimerScheduler
+
+
+def test_timers_call_later_order():
+    scheduler = TimerScheduler()
+    fired = []
+    done = threading.Event()
+
+    scheduler.call_later(0.06, fired.append, 3)
+    scheduler.call_later(0.02, fired.append, 1)
+    scheduler.call_later(0.04, fired.append, 2)
+    scheduler.call_later(0.08, done.set)
+
+    assert done.wait(2)
+    assert fired == [1, 2, 3]
+    assert len(scheduler) == 0
+
+
+def test_timers_single_thread():
+    scheduler = TimerScheduler()
+    fired = []
+    threads_before = threading.active_count()
+
+    for i in range(200):
+        scheduler.call_later(0.01, fired.append, i)
+
+    assert threading.active_count() <= threads_before + 1
+    time.sleep(0.2)
+    assert len(fired) == 200
+
+
+def test_timers_earlier_timer_while_running():
+    done = threading.Event()
+
+    class RacingScheduler(TimerScheduler):
+        injected = False
+
+        def run_pending(self):
+            delay = super().run_pending()
+            if not self.injected:
+                # An earlier timer arrives after the delay is determined, before the thread waits
+                self.injected = True
+                self.call_later(0.01, done.set)
+            return delay
+
+    scheduler = RacingScheduler()
+    scheduler.call_later(10, done.set)
+    assert done.wait(1)
+
+
+def test_timers_cancel_reschedule():
+    scheduler = TimerScheduler()
+    fired = []
+
+    cancelled = scheduler.call_later(0.02, fired.append, "cancelled")
+    cancelled.cancel()
+    handle = scheduler.call_later(0.02, fired.append, "rescheduled")
+    handle = scheduler.reschedule(handle, 0.1)
+    assert len(scheduler) == 1
+
+    time.sleep(0.06)
+    assert fired == []
+    time.sleep(0.1)
+    assert fired == ["rescheduled"]
+
+
+def test_timers_run_async():
+    scheduler = TimerScheduler()
+    fired = []
+
+    async def run():
+        runner = asyncio.ensure_future(scheduler.run_async())
+        await asyncio.sleep(0)
+        scheduler.call_later(0.02, lambda: fired.append(threading.current_thread()))
+        await asyncio.sleep(0.1)
+        runner.cancel()
+
+    asyncio.run(run())
+    assert fired == [threading.main_thread()]